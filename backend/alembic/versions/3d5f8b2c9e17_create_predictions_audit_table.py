@@ -0,0 +1,72 @@
+"""Create predictions audit table
+
+Revision ID: 3d5f8b2c9e17
+Revises: 7c3e9a1f2b64
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3d5f8b2c9e17"
+down_revision: Union[str, Sequence[str], None] = "7c3e9a1f2b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "predictions",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("input_hash", sa.String(length=64), nullable=False),
+        sa.Column(
+            "diagnosis_prediction",
+            postgresql.ENUM(
+                "positivo",
+                "negativo",
+                name="diagnosisresult",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("confidence", sa.Float(), nullable=False),
+        sa.Column("probability", sa.Float(), nullable=False),
+        sa.Column("model_version", sa.String(), nullable=False),
+        sa.Column("latency_ms", sa.Float(), nullable=True),
+        sa.Column("user_id", sa.UUID(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_predictions_created_at"),
+        "predictions",
+        ["created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_predictions_user_id"),
+        "predictions",
+        ["user_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_predictions_user_id"), table_name="predictions")
+    op.drop_index(op.f("ix_predictions_created_at"), table_name="predictions")
+    op.drop_table("predictions")
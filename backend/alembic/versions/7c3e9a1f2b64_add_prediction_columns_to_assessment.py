@@ -0,0 +1,51 @@
+"""Add prediction columns to assessments
+
+Revision ID: 7c3e9a1f2b64
+Revises: b2466947b8b8
+Create Date: 2026-10-18 15:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3e9a1f2b64"
+down_revision: Union[str, Sequence[str], None] = "b2466947b8b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "assessments",
+        sa.Column(
+            "predicted_diagnosis",
+            postgresql.ENUM(
+                "positivo",
+                "negativo",
+                name="diagnosisresult",
+                create_type=False,
+            ),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "assessments",
+        sa.Column("prediction_confidence", sa.Float(), nullable=True),
+    )
+    op.add_column(
+        "assessments",
+        sa.Column("model_version", sa.String(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("assessments", "model_version")
+    op.drop_column("assessments", "prediction_confidence")
+    op.drop_column("assessments", "predicted_diagnosis")
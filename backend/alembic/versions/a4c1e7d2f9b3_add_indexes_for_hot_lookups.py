@@ -0,0 +1,60 @@
+"""Add indexes for hot lookups
+
+Revision ID: a4c1e7d2f9b3
+Revises: 3d5f8b2c9e17
+Create Date: 2026-10-18 19:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c1e7d2f9b3"
+down_revision: Union[str, Sequence[str], None] = "3d5f8b2c9e17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns)
+INDEXES = [
+    # Foreign keys: relationship loads and the checks before deletes
+    ("ix_assessments_animal_id", "assessments", ["animal_id"]),
+    ("ix_assessments_user_id", "assessments", ["user_id"]),
+    ("ix_animals_owner_id", "animals", ["owner_id"]),
+    ("ix_animals_breed_id", "animals", ["breed_id"]),
+    # Sort keys of the list endpoints (ORDER BY and cursor pages). Users
+    # and breeds are sorted by their unique email and name, already
+    # served by ix_users_email and ix_breeds_name.
+    ("ix_assessments_created_at_id", "assessments", ["created_at", "id"]),
+    ("ix_animals_name_id", "animals", ["name", "id"]),
+    ("ix_owners_name_id", "owners", ["name", "id"]),
+    # Case-insensitive lookups by name
+    ("ix_owners_lower_name", "owners", [sa.text("lower(name)")]),
+    ("ix_breeds_lower_name", "breeds", [sa.text("lower(name)")]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY does not block writes to the table, but
+    # cannot run inside a transaction. If a build fails it leaves an
+    # INVALID index behind: drop it before running the migration again.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
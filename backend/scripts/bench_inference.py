@@ -0,0 +1,357 @@
+"""
+Inference micro-benchmarks with a regression gate against stored baselines.
+
+Measures, in-process and without network:
+
+* ``predict.single``         PredictionService.predict, cache disabled
+* ``predict.single_cached``  PredictionService.predict, cache hit
+* ``predict_many.<n>``       batch scoring of 1/10/100/10k rows
+* ``encoder.*``              one-hot encoding cost on its own
+* ``route.*``                /predict and /predict/batch through the ASGI
+                             app (authentication stubbed out); /predict
+                             repeats one payload, so it measures the HTTP
+                             and validation overhead around a cache hit
+
+Each case is run for a fixed number of iterations after a warm-up, and
+its p50/p99 are compared with ``benchmarks/inference_baseline.json``. The
+run fails (exit code 1) when a p50 or a p99 is slower than the baseline by
+more than the tolerance: ``--tolerance`` (BENCH_TOLERANCE, default 0.3 =
+30%) for p50 and ``--p99-tolerance`` (BENCH_P99_TOLERANCE, default 1.0)
+for p99.
+
+    python scripts/bench_inference.py                  # compare
+    python scripts/bench_inference.py --save-baseline  # record
+    python scripts/bench_inference.py --only predict_many --tolerance 0.5
+
+Baselines are only meaningful on the machine that recorded them; record
+a new one when the benchmark host changes.
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+# Path Configuration
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.ml.cache import PredictionCache
+from src.ml.prediction_service import PredictionService
+from src.schemas.prediction import PredictionInput
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+# The ASGI client logs every request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+BASELINE_PATH = Path(project_root) / "benchmarks" / "inference_baseline.json"
+DEFAULT_TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "0.3"))
+# Tails are noisier than medians, so p99 gets a wider band by default
+DEFAULT_P99_TOLERANCE = float(os.getenv("BENCH_P99_TOLERANCE", "1.0"))
+MIN_DELTA_MS = 0.05
+BATCH_SIZES = (1, 10, 100, 10_000)
+
+
+def make_inputs(service: PredictionService, n: int, seed: int = 0) -> list:
+    """Random but reproducible inputs using categories the model knows."""
+    rng = random.Random(seed)
+    vocabulary = service.encoder.vocabulary
+    inputs = []
+    for _ in range(n):
+        values = {}
+        for field in service.encoder.fields:
+            categories = list(vocabulary.get(field, {})) + [None]
+            values[field] = rng.choice(categories)
+        inputs.append(PredictionInput(**values))
+    return inputs
+
+
+def summarize(samples: list[float], rows: int = 1) -> dict:
+    """p50/p99/mean in milliseconds (exact percentiles of the samples)."""
+    values = np.asarray(samples)
+    p50, p99 = np.percentile(values, [50, 99])
+    result = {
+        "iterations": len(samples),
+        "p50_ms": float(p50) * 1000,
+        "p99_ms": float(p99) * 1000,
+        "mean_ms": float(values.mean()) * 1000,
+    }
+    if rows > 1:
+        result["rows_per_s"] = rows / float(p50)
+    return result
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int) -> list:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def service_cases(scale: float) -> dict[str, Callable[[], dict]]:
+    """Benchmarks of the service and the encoder, keyed by case name."""
+    service = PredictionService()
+    service.load()
+    uncached = PredictionService()
+    uncached.load()
+    uncached.cache = PredictionCache(0)
+
+    pool = make_inputs(service, 1000)
+    cycle = itertools.count()
+
+    def iterations(n: int) -> int:
+        return max(5, int(n * scale))
+
+    def next_input() -> PredictionInput:
+        return pool[next(cycle) % len(pool)]
+
+    cases = {
+        "predict.single": lambda: summarize(
+            measure(
+                lambda: uncached.predict(next_input()),
+                iterations(5000),
+                warmup=200,
+            )
+        ),
+        "predict.single_cached": lambda: summarize(
+            measure(
+                lambda: service.predict(pool[0]), iterations(5000), warmup=200
+            )
+        ),
+        "encoder.active_indices": lambda: summarize(
+            measure(
+                lambda: service.encoder.active_indices(next_input()),
+                iterations(5000),
+                warmup=200,
+            )
+        ),
+        "encoder.encode.100": lambda: summarize(
+            measure(
+                lambda: service.encoder.encode(pool[:100]),
+                iterations(500),
+                warmup=20,
+            ),
+            rows=100,
+        ),
+    }
+
+    batches = {
+        size: make_inputs(service, size, seed=size) for size in BATCH_SIZES
+    }
+    for size in BATCH_SIZES:
+        runs = 50 if size == 10_000 else 1000
+
+        def run_batch(size=size, runs=runs) -> dict:
+            batch = batches[size]
+            return summarize(
+                measure(
+                    lambda: uncached.predict_many(batch),
+                    iterations(runs),
+                    warmup=5,
+                ),
+                rows=size,
+            )
+
+        cases[f"predict_many.{size}"] = run_batch
+    return cases
+
+
+def route_cases(scale: float) -> dict[str, Callable[[], dict]]:
+    """End-to-end route latency through the ASGI app, without a socket."""
+    import httpx
+
+    from src.api.v1.dependencies import get_current_user
+    from src.core.config import settings
+    from src.main import app
+    from src.ml.prediction_service import prediction_service as service
+
+    service.load()
+    payload = make_inputs(service, 1)[0].model_dump()
+    batch_payload = {
+        "items": [item.model_dump() for item in make_inputs(service, 100)]
+    }
+
+    async def run(path: str, body: dict, iterations: int) -> list[float]:
+        # Authentication and the audit log need the database; they are
+        # not what is measured
+        app.dependency_overrides[get_current_user] = lambda: None
+        audit_enabled = settings.PREDICTION_AUDIT_ENABLED
+        settings.PREDICTION_AUDIT_ENABLED = False
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                for _ in range(20):
+                    response = await client.post(path, json=body)
+                    response.raise_for_status()
+                samples = []
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    await client.post(path, json=body)
+                    samples.append(time.perf_counter() - start)
+                return samples
+        finally:
+            app.dependency_overrides.pop(get_current_user, None)
+            settings.PREDICTION_AUDIT_ENABLED = audit_enabled
+
+    return {
+        "route.predict": lambda: summarize(
+            asyncio.run(run("/predict/", payload, max(5, int(2000 * scale))))
+        ),
+        "route.predict_batch.100": lambda: summarize(
+            asyncio.run(
+                run("/predict/batch", batch_payload, max(5, int(300 * scale)))
+            ),
+            rows=100,
+        ),
+    }
+
+
+def run_benchmarks(
+    only: str | None = None, scale: float = 1.0, routes: bool = True
+) -> dict[str, dict]:
+    cases = service_cases(scale)
+    if routes:
+        cases.update(route_cases(scale))
+    results = {}
+    for name, case in cases.items():
+        if only and only not in name:
+            continue
+        # Garbage left by the previous case is not this case's cost
+        gc.collect()
+        results[name] = case()
+    return results
+
+
+def compare(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    tolerance: float,
+    p99_tolerance: float | None = None,
+    min_delta_ms: float = MIN_DELTA_MS,
+) -> list[str]:
+    """
+    Returns one message per p50/p99 that is slower than its baseline by
+    more than the tolerance (0.3 = 30%) and by more than ``min_delta_ms``,
+    so microsecond jitter on tiny cases does not fail the run. Cases
+    without a baseline pass.
+    """
+    tolerances = {
+        "p50_ms": tolerance,
+        "p99_ms": tolerance if p99_tolerance is None else p99_tolerance,
+    }
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for stat, stat_tolerance in tolerances.items():
+            limit = max(
+                reference[stat] * (1 + stat_tolerance),
+                reference[stat] + min_delta_ms,
+            )
+            if result[stat] > limit:
+                regressions.append(
+                    f"{name} {stat}: {result[stat]:.4f} ms > "
+                    f"{limit:.4f} ms (baseline {reference[stat]:.4f} ms "
+                    f"+{stat_tolerance:.0%})"
+                )
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--p99-tolerance", type=float, default=DEFAULT_P99_TOLERANCE
+    )
+    parser.add_argument("--only", help="run cases whose name contains this")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplier for the number of iterations",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(only=args.only, scale=args.scale)
+    for name, result in results.items():
+        throughput = result.get("rows_per_s")
+        logger.info(
+            "%-26s p50 %9.4f ms  p99 %9.4f ms%s",
+            name,
+            result["p50_ms"],
+            result["p99_ms"],
+            f"  {throughput:,.0f} rows/s" if throughput else "",
+        )
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {"environment": environment(), "results": results},
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        logger.info("Baseline written to %s", args.baseline)
+        return
+
+    if not args.baseline.is_file():
+        logger.warning("No baseline at %s, nothing to compare", args.baseline)
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("environment") != environment():
+        logger.warning(
+            "Baseline was recorded on %s, this is %s",
+            baseline.get("environment"),
+            environment(),
+        )
+
+    regressions = compare(
+        results, baseline["results"], args.tolerance, args.p99_tolerance
+    )
+    if regressions:
+        for message in regressions:
+            logger.error("Regression: %s", message)
+        sys.exit(1)
+    logger.info(
+        "No regression beyond %.0f%% (p50) / %.0f%% (p99)",
+        args.tolerance * 100,
+        args.p99_tolerance * 100,
+    )
+
+
+if __name__ == "__main__":
+    main()
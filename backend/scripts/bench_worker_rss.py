@@ -0,0 +1,187 @@
+"""
+Measures how much resident memory each worker process pays for the model
+artifacts, with plain joblib loading and with memory-mapped arrays
+(MODEL_MMAP_MODE="r").
+
+Every worker loads a manifest version through ``ModelRegistry`` (the same
+``load_artifacts`` path as the API), touches the arrays of the model, the
+scaler and the compiled scorer, and then waits for the others, so pages
+that can be shared are shared when /proc/self/smaps_rollup is read.
+Linux only.
+
+Besides the versions of ml_models/manifest.json, a random forest of
+``--trees`` trees is trained on the v2 columns and registered as the
+``bench-trees`` version of a temporary copy of the manifest, to stand in
+for heavier tree models such as the EasyEnsemble champion.
+
+    python scripts/bench_worker_rss.py --workers 4
+    python scripts/bench_worker_rss.py --workers 4 --trees 500
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+# Path Configuration
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.ml.registry import (
+    MODEL_PATH,
+    ModelRegistry,
+    file_sha256,
+)
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+TREE_VERSION = "bench-trees"
+TREE_FILE = "leish_model_bench_trees.joblib"
+
+
+def read_memory_kb() -> dict[str, int]:
+    """Rss, Pss, shared and private memory of the current process."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "shared": values["Shared_Clean"] + values["Shared_Dirty"],
+        "private": values["Private_Clean"] + values["Private_Dirty"],
+    }
+
+
+def touch_arrays(obj) -> float:
+    """Reads every array held by an object so its pages are resident."""
+    total = 0.0
+    for value in vars(obj).values() if obj is not None else ():
+        if isinstance(value, np.ndarray) and value.dtype.kind in "fiu":
+            total += float(value.sum())
+    return total
+
+
+def add_tree_version(model_path: Path, n_trees: int) -> None:
+    """
+    Trains a random forest on random one-hot rows labelled by the active
+    model and registers it, without a scaler, in the manifest.
+    """
+    registry = ModelRegistry(model_path)
+    manifest = registry.read_manifest(resolve_active=False)
+    reference = registry.get(manifest["active"])
+    active_files = manifest["versions"][manifest["active"]]["files"]
+
+    rng = np.random.default_rng(0)
+    n_features = len(reference.training_columns)
+    encoded = rng.integers(0, 2, size=(20_000, n_features)).astype(np.float64)
+    labels = reference.scorer.predict_proba(encoded).argmax(axis=1)
+    # Some label noise, so the trees grow to a realistic size
+    flip = rng.random(labels.shape[0]) < 0.1
+    labels[flip] = 1 - labels[flip]
+    model = RandomForestClassifier(n_estimators=n_trees, random_state=0)
+    model.fit(encoded, labels)
+    joblib.dump(model, model_path / TREE_FILE)
+
+    files = {
+        "model": TREE_FILE,
+        "training_columns": active_files["training_columns"],
+    }
+    manifest["versions"][TREE_VERSION] = {
+        "files": files,
+        "sha256": {
+            role: file_sha256(model_path / name)
+            for role, name in files.items()
+        },
+    }
+    registry.write_manifest(manifest)
+
+
+def worker(model_path, version, mmap_mode, barrier, results) -> None:
+    before = read_memory_kb()
+
+    registry = ModelRegistry(Path(model_path), mmap_mode=mmap_mode)
+    loaded = registry.get(version)
+    touch_arrays(loaded.model)
+    touch_arrays(loaded.scaler)
+    touch_arrays(loaded.scorer)
+
+    # Every worker holds the artifacts at the same time
+    barrier.wait()
+    after = read_memory_kb()
+    barrier.wait()
+
+    results.put({key: after[key] - before[key] for key in after})
+
+
+def run(model_path: Path, version: str, workers: int, mmap_mode) -> list:
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(
+            target=worker,
+            args=(str(model_path), version, mmap_mode, barrier, results),
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    deltas = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return deltas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--trees", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A copy, so the compiled tree arrays are not left in ml_models
+        model_path = Path(tmp)
+        shutil.copytree(MODEL_PATH, model_path, dirs_exist_ok=True)
+        add_tree_version(model_path, args.trees)
+
+        for version in ModelRegistry(model_path).read_manifest()["versions"]:
+            for mmap_mode in (None, "r"):
+                if mmap_mode is not None:
+                    # Saves the compiled tree arrays once, like the first
+                    # worker to start does, so all of them map the file
+                    ModelRegistry(model_path, mmap_mode=mmap_mode).get(version)
+                deltas = run(model_path, version, args.workers, mmap_mode)
+                mean = {
+                    key: sum(d[key] for d in deltas) / len(deltas) / 1024
+                    for key in deltas[0]
+                }
+                logger.info(
+                    "%-11s mmap_mode=%-4s workers=%d | per worker: "
+                    "rss %.1f MB, private %.1f MB, shared %.1f MB, "
+                    "pss %.1f MB",
+                    version,
+                    mmap_mode,
+                    args.workers,
+                    mean["rss"],
+                    mean["private"],
+                    mean["shared"],
+                    mean["pss"],
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Exports a joblib artifact set listed in ml_models/manifest.json to the
+NumPy-only ``.npz`` format and registers it as a new manifest version.
+
+The exported file is checked against the sklearn estimators before the
+manifest is touched: predictions must be bit-identical on every
+single-category row and on a batch of random one-hot rows.
+
+    python scripts/export_npz_model.py
+    python scripts/export_npz_model.py --version v2 --activate
+
+The new version is named ``<version>-npz``; ``--activate`` also makes it
+the active one (in ml_models/active.json, as the admin endpoint does),
+which is picked up by running workers on their next artifact check.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+# Path Configuration
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.ml.encoder import scale_encoded
+from src.ml.npz_model import export_npz, load_npz
+from src.ml.registry import (
+    MODEL_PATH,
+    ModelRegistry,
+    file_sha256,
+)
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def parity_rows(n_features: int) -> np.ndarray:
+    """All-zero row, one row per column and random one-hot rows."""
+    rng = np.random.default_rng(0)
+    return np.vstack([
+        np.zeros((1, n_features)),
+        np.eye(n_features),
+        rng.integers(0, 2, size=(1000, n_features)).astype(np.float64),
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--version", help="version to export (default: the active one)"
+    )
+    parser.add_argument("--activate", action="store_true")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(MODEL_PATH)
+    manifest = registry.read_manifest(resolve_active=False)
+    version = args.version or registry.read_manifest()["active"]
+    loaded = registry.get(version)
+    if "npz" in manifest["versions"][version]["files"]:
+        parser.error(f"{version} is already a .npz artifact")
+
+    npz_version = f"{version}-npz"
+    npz_file = f"leish_model_{version}.npz"
+    npz_path = MODEL_PATH / npz_file
+    export_npz(
+        npz_path,
+        loaded.model,
+        loaded.scaler,
+        loaded.training_columns,
+        model_version=version,
+    )
+
+    start = time.perf_counter()
+    model, scaler, columns = load_npz(npz_path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    # 1. Confere que o .npz reproduz o sklearn bit a bit
+    if columns != loaded.training_columns:
+        sys.exit("Exported columns differ from the training columns")
+    encoded = parity_rows(len(columns))
+    expected = loaded.model.predict_proba(
+        scale_encoded(loaded.scaler, encoded)
+    )
+    actual = model.predict_proba(scaler.transform(encoded))
+    if not np.array_equal(actual, expected):
+        npz_path.unlink()
+        sys.exit("Exported model is not bit-identical to sklearn")
+
+    # 2. Registra a nova versão no manifest
+    manifest["versions"][npz_version] = {
+        "files": {"npz": npz_file},
+        "sha256": {"npz": file_sha256(npz_path)},
+    }
+    registry.write_manifest(manifest)
+    if args.activate:
+        registry.write_active(npz_version)
+
+    logger.info(
+        "Exported %s to %s (%d bytes, loads in %.2f ms), active: %s",
+        version,
+        npz_file,
+        npz_path.stat().st_size,
+        load_ms,
+        registry.read_manifest()["active"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Re-scores stored assessments with the active model version.
+
+Assessments are streamed with a server-side cursor (``yield_per``) in
+primary key order, scored one chunk at a time with a single vectorized
+``predict_many`` call, and written back with one bulk UPDATE per chunk.
+Only a bounded number of chunks is in memory at any time, however large
+the table is.
+
+After every committed chunk the last assessment id is written to a
+checkpoint file; an interrupted run started again with the same
+arguments resumes after it. The checkpoint is removed when a run
+finishes.
+
+    python scripts/rescore_assessments.py                # stale or unscored
+    python scripts/rescore_assessments.py --all          # every assessment
+    python scripts/rescore_assessments.py --workers 4 --chunk-size 5000
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import select, update
+
+# Path Configuration
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.db import models
+from src.db.database import SessionLocal
+from src.db.models import enums
+from src.ml.features import (
+    CLINICAL_FIELDS,
+    prediction_input_from_row,
+)
+from src.ml.prediction_service import prediction_service
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT = Path("rescore_checkpoint.json")
+
+
+def build_query(model_version: str, rescore_all: bool, after_id=None):
+    """Assessments to score, with the features the model needs."""
+    query = (
+        select(
+            models.Assessment.id,
+            *(getattr(models.Assessment, field) for field in CLINICAL_FIELDS),
+            models.Animal.sex.label("animal_sex"),
+            models.Breed.name.label("breed_name"),
+        )
+        .join(models.Assessment.animal)
+        .outerjoin(models.Animal.breed)
+        .order_by(models.Assessment.id)
+    )
+    if not rescore_all:
+        query = query.where(
+            models.Assessment.model_version.is_distinct_from(model_version)
+        )
+    if after_id is not None:
+        query = query.where(models.Assessment.id > after_id)
+    return query
+
+
+def score_rows(rows: list[dict]) -> list[dict]:
+    """
+    Scores one chunk. Runs in the pool workers too, each of which loads
+    its own copy of the model on first use.
+    """
+    results = prediction_service.predict_many([
+        prediction_input_from_row(row) for row in rows
+    ])
+    return [
+        {
+            "id": row["id"],
+            "predicted_diagnosis": enums.DiagnosisResult(result["prediction"]),
+            "prediction_confidence": result["confidence"],
+            "model_version": result["model_version"],
+        }
+        for row, result in zip(rows, results)
+    ]
+
+
+def read_checkpoint(path: Path, run_key: dict):
+    """Last committed id of an interrupted run with the same settings."""
+    if not path.is_file():
+        return None, 0
+    with open(path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("run") != run_key:
+        logger.warning("Ignoring checkpoint of a different run: %s", path)
+        return None, 0
+    return uuid.UUID(checkpoint["last_id"]), checkpoint["processed"]
+
+
+def write_checkpoint(
+    path: Path, run_key: dict, last_id, processed: int
+) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"run": run_key, "last_id": str(last_id), "processed": processed},
+            f,
+        )
+    os.replace(tmp_path, path)
+
+
+def rescore(
+    chunk_size: int = 1000,
+    workers: int = 1,
+    rescore_all: bool = False,
+    checkpoint_path: Path = DEFAULT_CHECKPOINT,
+    session_factory=SessionLocal,
+) -> int:
+    """
+    Re-scores the assessments and returns how many were updated in this
+    run (resumed runs do not count the chunks committed before).
+    """
+    model_version = prediction_service.model_version
+    run_key = {"model_version": model_version, "all": rescore_all}
+    after_id, processed = read_checkpoint(checkpoint_path, run_key)
+    if after_id is not None:
+        logger.info("Resuming after %s (%d already done)", after_id, processed)
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    # Chunks being scored; bounded so memory does not grow with the table
+    in_flight: deque[tuple[Future | list, object]] = deque()
+    updated = 0
+    start = time.perf_counter()
+
+    def commit_oldest(write_session) -> None:
+        nonlocal updated, processed
+        pending, last_id = in_flight.popleft()
+        values = pending.result() if isinstance(pending, Future) else pending
+        write_session.execute(update(models.Assessment), values)
+        write_session.commit()
+        updated += len(values)
+        processed += len(values)
+        write_checkpoint(checkpoint_path, run_key, last_id, processed)
+        logger.info(
+            "%d assessments re-scored (%.0f/s)",
+            processed,
+            updated / (time.perf_counter() - start),
+        )
+
+    try:
+        with (
+            session_factory() as read_session,
+            session_factory() as write_session,
+        ):
+            # 1. Cursor do lado do servidor: lê um bloco por vez
+            result = read_session.execute(
+                build_query(model_version, rescore_all, after_id),
+                execution_options={"yield_per": chunk_size},
+            )
+            for partition in result.mappings().partitions():
+                rows = [dict(row) for row in partition]
+                last_id = rows[-1]["id"]
+
+                # 2. Pontua o bloco (no pool, se houver)
+                if pool is not None:
+                    in_flight.append((pool.submit(score_rows, rows), last_id))
+                else:
+                    in_flight.append((score_rows(rows), last_id))
+
+                # 3. Grava em ordem, mantendo no máximo 2 blocos por worker
+                while len(in_flight) > max(workers, 1) * 2 - 1:
+                    commit_oldest(write_session)
+            while in_flight:
+                commit_oldest(write_session)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    checkpoint_path.unlink(missing_ok=True)
+    return updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="re-score every assessment, not only stale or unscored ones",
+    )
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT)
+    args = parser.parse_args()
+
+    updated = rescore(
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        rescore_all=args.all,
+        checkpoint_path=args.checkpoint,
+    )
+    logger.info(
+        "Done: %d assessments now scored with %s",
+        updated,
+        prediction_service.model_version,
+    )
+
+
+if __name__ == "__main__":
+    main()
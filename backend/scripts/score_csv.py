@@ -0,0 +1,189 @@
+"""
+Scores a field campaign spreadsheet without importing it into Postgres.
+
+The input is the semicolon-separated, latin-1 layout read by
+``scripts/seeds/seed_from_csv.py``; its clinical columns go through the
+same ``map_clinical_data`` mapping and enum validation as the seed, so a
+row gets the prediction it would get once imported. The file is read
+and scored in chunks (one vectorized ``predict_many`` call per chunk) and
+results are streamed to the output as they are ready, so memory stays
+flat for multi-million-row files.
+
+    python scripts/score_csv.py campaign.csv predictions.csv
+    python scripts/score_csv.py campaign.csv predictions.csv --workers 8
+
+Output columns: row (1-based data row), id_db_original,
+diagnosis_prediction, confidence_score, model_version and error (rows
+that fail validation are reported there instead of being scored).
+"""
+
+import argparse
+import csv
+import itertools
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+from pydantic import ValidationError
+
+# Path Configuration
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scripts.seeds.seed_from_csv import map_clinical_data
+from src.db.crud.crud_breed import DEFAULT_BREED_NAME
+from src.ml.features import prediction_input_from_row
+from src.ml.prediction_service import prediction_service
+from src.schemas.assessment import AssessmentBase
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+OUTPUT_COLUMNS = [
+    "row",
+    "id_db_original",
+    "diagnosis_prediction",
+    "confidence_score",
+    "model_version",
+    "error",
+]
+
+
+def read_chunks(
+    path: Path, chunk_size: int, encoding: str, delimiter: str
+) -> Iterator[list[tuple[int, dict]]]:
+    """Yields (row number, row) lists without loading the whole file."""
+    with open(path, newline="", encoding=encoding) as f:
+        reader = enumerate(csv.DictReader(f, delimiter=delimiter), start=1)
+        while chunk := list(itertools.islice(reader, chunk_size)):
+            yield chunk
+
+
+def score_chunk(chunk: list[tuple[int, dict]]) -> list[dict]:
+    """
+    Maps, validates and scores one chunk. Runs in the pool workers too,
+    each of which loads its own copy of the model on first use.
+    """
+    outputs, inputs = [], []
+    for number, row in chunk:
+        output = {"row": number, "id_db_original": row.get("id_db_original")}
+        outputs.append(output)
+        try:
+            # Same mapping and enum validation as the CSV seed
+            assessment = AssessmentBase(**map_clinical_data(row))
+        except ValidationError as e:
+            output["error"] = "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            )
+            continue
+        features = dict(assessment)
+        features["animal_sex"] = row.get("sexo") or None
+        features["breed_name"] = row.get("raca") or DEFAULT_BREED_NAME
+        inputs.append((output, prediction_input_from_row(features)))
+
+    results = prediction_service.predict_many([item for _, item in inputs])
+    for (output, _), result in zip(inputs, results):
+        output["diagnosis_prediction"] = result["prediction"]
+        output["confidence_score"] = result["confidence"]
+        output["model_version"] = result["model_version"]
+    return outputs
+
+
+def score_csv(
+    input_path: Path,
+    output_path: Path,
+    chunk_size: int = 10_000,
+    workers: int = 1,
+    encoding: str = "latin-1",
+    delimiter: str = ";",
+) -> int:
+    """Scores ``input_path`` into ``output_path``; returns the row count."""
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    # Chunks being scored; bounded so memory does not grow with the file
+    in_flight: deque[Future | list] = deque()
+    rows = 0
+    start = time.perf_counter()
+
+    try:
+        with open(output_path, "w", newline="", encoding="utf-8") as out:
+            writer = csv.DictWriter(
+                out, fieldnames=OUTPUT_COLUMNS, delimiter=delimiter
+            )
+            writer.writeheader()
+
+            def write_oldest() -> None:
+                nonlocal rows
+                pending = in_flight.popleft()
+                outputs = (
+                    pending.result()
+                    if isinstance(pending, Future)
+                    else pending
+                )
+                writer.writerows(outputs)
+                rows += len(outputs)
+                logger.info(
+                    "%d rows scored (%.0f/s)",
+                    rows,
+                    rows / (time.perf_counter() - start),
+                )
+
+            for chunk in read_chunks(
+                input_path, chunk_size, encoding, delimiter
+            ):
+                if pool is not None:
+                    in_flight.append(pool.submit(score_chunk, chunk))
+                else:
+                    in_flight.append(score_chunk(chunk))
+                # Results are written in input order
+                while len(in_flight) > max(workers, 1) * 2 - 1:
+                    write_oldest()
+            while in_flight:
+                write_oldest()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", type=Path)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes scoring chunks in parallel (e.g. the CPU count)",
+    )
+    parser.add_argument("--encoding", default="latin-1")
+    parser.add_argument("--delimiter", default=";")
+    args = parser.parse_args()
+
+    rows = score_csv(
+        args.input,
+        args.output,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        encoding=args.encoding,
+        delimiter=args.delimiter,
+    )
+    logger.info("Done: %d rows written to %s", rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
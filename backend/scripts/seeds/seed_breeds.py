@@ -6,7 +6,7 @@ from src.schemas.breed import BreedCreate
 logger = logging.getLogger(__name__)
 
 INITIAL_BREEDS = [
-    "SRD (Sem Raça Definida)",
+    crud_breed.DEFAULT_BREED_NAME,
     "Poodle",
     "Pastor Alemão",
     "Rottweiler",
@@ -135,7 +135,7 @@ def seed_from_csv(db: Session) -> None:
                     owner = default_owner
 
                 # Logic of Race
-                breed_name = row.get("raca") or "SRD (Sem Raça Definida)"
+                breed_name = row.get("raca") or crud_breed.DEFAULT_BREED_NAME
                 breed = crud_breed.get_breed_by_name(db, name=breed_name)
                 if not breed:
                     breed_in = breed_schema.BreedCreate(name=breed_name)
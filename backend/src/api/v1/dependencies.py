@@ -1,12 +1,13 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 
+from src.core import metrics
 from src.core.config import settings
 from src.db import models
 from src.db.crud import crud_user
-from src.db.database import SessionLocal
+from src.db.database import AsyncSessionLocal, SessionLocal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
@@ -19,14 +20,23 @@ def get_db():
         db.close()
 
 
-async def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> models.User:
+async def get_async_db():
+    """
+    AsyncSession for async routes: queries are awaited on the event loop
+    instead of blocking it (or taking a threadpool thread).
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def user_from_token(db: AsyncSession, token: str | None) -> models.User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if not token:
+        raise credentials_exception
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -36,12 +46,40 @@ async def get_current_user(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = crud_user.get_user_by_email(db, email=email)
+    with metrics.timed("auth.user_lookup"):
+        # The role is loaded with the user: the admin check and /users/me
+        # read it after the session is gone
+        user = await crud_user.get_user_by_email_async(
+            db, email=email, options=crud_user.PUBLIC_LOADERS
+        )
     if user is None:
         raise credentials_exception
     return user
 
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+) -> models.User:
+    """
+    Loads the user of the access token. The session is closed as soon
+    as the user is loaded, so the asyncpg connection is not held for the
+    rest of the request (sync routes check out their own psycopg2 one).
+    """
+    async with AsyncSessionLocal() as db:
+        return await user_from_token(db, token)
+
+
+async def get_user_for_websocket(token: str | None) -> models.User:
+    """
+    Authenticates a WebSocket handshake. Browsers cannot set headers on
+    a WebSocket, so the access token comes in the query string; the
+    database session is closed right away instead of living as long as
+    the connection.
+    """
+    async with AsyncSessionLocal() as db:
+        return await user_from_token(db, token)
+
+
 def get_current_admin_user(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
@@ -0,0 +1,41 @@
+from typing import Sequence
+
+from fastapi import Query, Request, Response
+
+from src.core.config import settings
+from src.db.pagination import Keyset
+
+
+class Page:
+    """
+    Pagination parameters of the list endpoints.
+
+    ``?cursor=`` (keyset) is the recommended way to walk a list: the
+    ``Link: <...>; rel="next"`` and ``X-Next-Cursor`` headers of a full
+    page point to the next one. ``?skip=`` (OFFSET) is still accepted
+    for compatibility, but deep offsets get slower as the table grows.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+        cursor: str | None = None,
+    ):
+        self.request = request
+        self.skip = skip
+        self.limit = limit
+        self.cursor = cursor
+
+    def link_next(
+        self, response: Response, keyset: Keyset, rows: Sequence
+    ) -> None:
+        """Sets the next-page headers, unless ``rows`` is the last page."""
+        if len(rows) < self.limit:
+            return
+        cursor = keyset.cursor_for(rows[-1])
+        url = self.request.url.remove_query_params("skip")
+        url = url.include_query_params(cursor=cursor)
+        response.headers["Link"] = f'<{url}>; rel="next"'
+        response.headers["X-Next-Cursor"] = cursor
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
 from fastapi import Response
 
 from src.db.crud import crud_animal
 from src.schemas import animal as animal_schema
-from .dependencies import get_current_user, get_db
+from .dependencies import get_async_db, get_current_user, get_db
+from .pagination import Page
 from typing import List
 
 router = APIRouter(prefix="/animals", tags=["Animals"])
@@ -31,13 +33,22 @@ def create_new_animal(
     response_model=List[animal_schema.AnimalPublic],
     dependencies=[Depends(get_current_user)],
 )
-def read_animals(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+async def read_animals(
+    response: Response,
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Returns a list of animals.
+    Returns a list of animals, by name.
     """
-    animals = crud_animal.get_animals(db, skip=skip, limit=limit)
+    animals = await crud_animal.get_animals_async(
+        db,
+        skip=page.skip,
+        limit=page.limit,
+        cursor=page.cursor,
+        options=crud_animal.PUBLIC_LOADERS,
+    )
+    page.link_next(response, crud_animal.PAGE_ORDER, animals)
     return animals
 
 
@@ -46,11 +57,15 @@ def read_animals(
     response_model=animal_schema.AnimalPublic,
     dependencies=[Depends(get_current_user)],
 )
-def read_animal_by_id(animal_id: UUID, db: Session = Depends(get_db)):
+async def read_animal_by_id(
+    animal_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """
     Search for a single animal by its ID.
     """
-    db_animal = crud_animal.get_animal_by_id(db, animal_id=animal_id)
+    db_animal = await crud_animal.get_animal_by_id_async(
+        db, animal_id=animal_id, options=crud_animal.PUBLIC_LOADERS
+    )
     if db_animal is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
@@ -7,7 +8,8 @@ from fastapi import Response
 from src.db.crud import crud_assessment
 from src.schemas import assessment as assessment_schema
 from src.db import models
-from .dependencies import get_current_user, get_db
+from .dependencies import get_async_db, get_current_user, get_db
+from .pagination import Page
 
 router = APIRouter(prefix="/assessments", tags=["Assessments"])
 
@@ -19,6 +21,7 @@ router = APIRouter(prefix="/assessments", tags=["Assessments"])
 )
 def create_new_assessment(
     assessment: assessment_schema.AssessmentCreate,
+    score: bool = False,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(
         get_current_user
@@ -27,9 +30,10 @@ def create_new_assessment(
     """
     Creates a new appointment (clinical evaluation) for an animal.
     The appointment is associated with the user (veterinarian) making the request.
+    With ``?score=true`` the model prediction is computed and stored too.
     """
     return crud_assessment.create_assessment(
-        db=db, assessment=assessment, user_id=current_user.id
+        db=db, assessment=assessment, user_id=current_user.id, score=score
     )
 
 
@@ -38,13 +42,22 @@ def create_new_assessment(
     response_model=List[assessment_schema.AssessmentPublic],
     dependencies=[Depends(get_current_user)],
 )
-def read_assessments(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+async def read_assessments(
+    response: Response,
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Returns a list of appointments.
+    Returns a list of appointments, newest first.
     """
-    assessments = crud_assessment.get_assessments(db, skip=skip, limit=limit)
+    assessments = await crud_assessment.get_assessments_async(
+        db,
+        skip=page.skip,
+        limit=page.limit,
+        cursor=page.cursor,
+        options=crud_assessment.PUBLIC_LOADERS,
+    )
+    page.link_next(response, crud_assessment.PAGE_ORDER, assessments)
     return assessments
 
 
@@ -53,12 +66,16 @@ def read_assessments(
     response_model=assessment_schema.AssessmentPublic,
     dependencies=[Depends(get_current_user)],
 )
-def read_assessment_by_id(assessment_id: UUID, db: Session = Depends(get_db)):
+async def read_assessment_by_id(
+    assessment_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """
     Search for a single service using your ID.
     """
-    db_assessment = crud_assessment.get_assessment_by_id(
-        db, assessment_id=assessment_id
+    db_assessment = await crud_assessment.get_assessment_by_id_async(
+        db,
+        assessment_id=assessment_id,
+        options=crud_assessment.PUBLIC_LOADERS,
     )
     if db_assessment is None:
         raise HTTPException(
@@ -76,13 +93,18 @@ def read_assessment_by_id(assessment_id: UUID, db: Session = Depends(get_db)):
 def update_existing_assessment(
     assessment_id: UUID,
     assessment_update: assessment_schema.AssessmentUpdate,
+    score: bool = False,
     db: Session = Depends(get_db),
 ):
     """
     Updates the data of an existing service.
+    With ``?score=true`` the stored model prediction is refreshed.
     """
     db_assessment = crud_assessment.update_assessment(
-        db=db, assessment_id=assessment_id, assessment_update=assessment_update
+        db=db,
+        assessment_id=assessment_id,
+        assessment_update=assessment_update,
+        score=score,
     )
     if db_assessment is None:
         raise HTTPException(
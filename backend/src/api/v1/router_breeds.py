@@ -1,12 +1,14 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
 from fastapi import Response
 
 from src.db.crud import crud_breed
 from src.schemas import breed as breed_schema
-from .dependencies import get_current_user, get_db
+from .dependencies import get_async_db, get_current_user, get_db
+from .pagination import Page
 from .router_roles import (
     get_current_admin_user,
 )
@@ -41,14 +43,19 @@ def create_new_breed(
     response_model=List[breed_schema.BreedPublic],
     dependencies=[Depends(get_current_user)],
 )
-def read_breeds(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+async def read_breeds(
+    response: Response,
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Returns a list of breeds.
+    Returns a list of breeds, by name.
     Accessible to any logged-in user.
     """
-    breeds = crud_breed.get_breeds(db, skip=skip, limit=limit)
+    breeds = await crud_breed.get_breeds_async(
+        db, skip=page.skip, limit=page.limit, cursor=page.cursor
+    )
+    page.link_next(response, crud_breed.PAGE_ORDER, breeds)
     return breeds
 
 
@@ -57,11 +64,13 @@ def read_breeds(
     response_model=breed_schema.BreedPublic,
     dependencies=[Depends(get_current_user)],
 )
-def read_breed_by_id(breed_id: UUID, db: Session = Depends(get_db)):
+async def read_breed_by_id(
+    breed_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """
     Search for a single breed by its ID.
     """
-    db_breed = crud_breed.get_breed_by_id(db, breed_id=breed_id)
+    db_breed = await crud_breed.get_breed_by_id_async(db, breed_id=breed_id)
     if db_breed is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,49 @@
+import logging
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import DBAPIError
+
+from src.core.lifespan import warm_up_async_database, warm_up_database
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live")
+def read_liveness():
+    """The process is up and serving HTTP."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def read_readiness(request: Request):
+    """
+    Returns 200 only after the model, the database pool and the prediction
+    cache were warmed up by the application lifespan; 503 otherwise, with
+    the last database error when the database is still unreachable.
+    """
+    readiness = getattr(
+        request.app.state,
+        "readiness",
+        {"model": False, "database": False, "cache": False},
+    )
+
+    detail = {"status": "starting", "checks": readiness}
+    if readiness["model"] and not readiness["database"]:
+        try:
+            await run_in_threadpool(warm_up_database)
+            await warm_up_async_database()
+            readiness["database"] = True
+        # asyncpg reports a refused connection as a plain OSError
+        except (DBAPIError, OSError) as e:
+            logger.warning("Database still unreachable: %s", e)
+            detail["error"] = f"{type(e).__name__}: {e}".splitlines()[0]
+
+    if not all(readiness.values()):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+        )
+    return {"status": "ready", "checks": readiness}
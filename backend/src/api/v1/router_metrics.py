@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, status
+
+from src.core import metrics
+from src.db.database import async_pool_stats, pool_stats
+from src.schemas import metrics as metrics_schema
+from .dependencies import get_current_admin_user
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+
+
+@router.get(
+    "/timings",
+    response_model=dict[str, metrics_schema.StageTiming],
+)
+def read_timings():
+    """
+    Returns the latency histograms of every recorded stage (encoding,
+    scoring, auth lookup, ...) and of every route (admins only).
+    """
+    return metrics.summaries()
+
+
+@router.get("/pool", response_model=metrics_schema.PoolStats)
+def read_pool():
+    """
+    Returns the connection pool usage and how long checkouts waited for
+    a connection (admins only).
+    """
+    return {
+        **pool_stats(),
+        "wait": metrics.get_histogram("db.pool_wait").summary(),
+    }
+
+
+@router.get("/pool/async", response_model=metrics_schema.PoolStats)
+def read_async_pool():
+    """Same as /metrics/pool, for the asyncpg pool (admins only)."""
+    return {
+        **async_pool_stats(),
+        "wait": metrics.get_histogram("db.async_pool_wait").summary(),
+    }
+
+
+@router.delete("/timings", status_code=status.HTTP_204_NO_CONTENT)
+def reset_timings():
+    """Clears all histograms, e.g. before comparing two model versions."""
+    metrics.reset()
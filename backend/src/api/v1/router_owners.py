@@ -1,12 +1,14 @@
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import Response
 
 from src.db.crud import crud_owner
 from src.schemas import owner as owner_schema
-from .dependencies import get_current_user, get_db
+from .dependencies import get_async_db, get_current_user, get_db
+from .pagination import Page
 
 router = APIRouter(prefix="/owners", tags=["Owners"])
 
@@ -28,10 +30,16 @@ def create_new_owner(
     response_model=List[owner_schema.OwnerPublic],
     dependencies=[Depends(get_current_user)],
 )
-def read_owners(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+async def read_owners(
+    response: Response,
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return crud_owner.get_owners(db, skip=skip, limit=limit)
+    owners = await crud_owner.get_owners_async(
+        db, skip=page.skip, limit=page.limit, cursor=page.cursor
+    )
+    page.link_next(response, crud_owner.PAGE_ORDER, owners)
+    return owners
 
 
 @router.get(
@@ -39,8 +47,10 @@ def read_owners(
     response_model=owner_schema.OwnerPublic,
     dependencies=[Depends(get_current_user)],
 )
-def read_owner_by_id(owner_id: UUID, db: Session = Depends(get_db)):
-    db_owner = crud_owner.get_owner_by_id(db, owner_id=owner_id)
+async def read_owner_by_id(
+    owner_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
+    db_owner = await crud_owner.get_owner_by_id_async(db, owner_id=owner_id)
     if db_owner is None:
         raise HTTPException(status_code=404, detail="Owner not found")
     return db_owner
@@ -1,27 +1,344 @@
 # src/api/v1/router_prediction.py
 
-from fastapi import APIRouter, Depends
+import json
+from datetime import datetime, timezone
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from src.core import metrics
+from src.core.audit import prediction_audit_log
+from src.core.config import settings
+from src.db import models
+from src.db.models import enums
 from src.schemas import prediction as prediction_schema
+from src.ml.batcher import prediction_batcher
 from src.ml.prediction_service import prediction_service
-from .dependencies import get_current_user
+from src.ml.registry import ArtifactError
+from .dependencies import (
+    get_current_admin_user,
+    get_current_user,
+    get_user_for_websocket,
+)
 
 router = APIRouter(prefix="/predict", tags=["Prediction"])
 
 
-@router.post(
-    "/",
-    response_model=prediction_schema.PredictionOutput,
-    dependencies=[Depends(get_current_user)],
-)
-def make_diagnosis_prediction(input_data: prediction_schema.PredictionInput):
+def _format_errors(error: ValidationError) -> str:
+    """Flattens a pydantic validation error into a single line."""
+    messages = []
+    for err in error.errors():
+        location = ".".join(str(part) for part in err["loc"]) or "item"
+        messages.append(f"{location}: {err['msg']}")
+    return "; ".join(messages)
+
+
+@router.post("/", response_model=prediction_schema.PredictionOutput)
+async def make_diagnosis_prediction(
+    input_data: prediction_schema.PredictionInput,
+    explain: bool = False,
+    current_user: models.User = Depends(get_current_user),
+):
     """
     Receives clinical and animal data and returns a diagnosis prediction
     with a confidence score.
+    With ``?explain=true`` it also returns the fields that contributed
+    most to the prediction.
     """
-    result = prediction_service.predict(input_data)
+    metrics.record_since_request_start("request.before_handler")
+    try:
+        if settings.PREDICTION_MICROBATCH_ENABLED and not explain:
+            # Concurrent requests are scored together in one vectorized call
+            result = await prediction_batcher.submit(input_data)
+        else:
+            result = await run_in_threadpool(
+                prediction_service.predict, input_data, explain
+            )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+
+    if settings.PREDICTION_AUDIT_ENABLED:
+        # Only queued here; written in bulk by the audit thread
+        await prediction_audit_log.submit(
+            _audit_record(input_data, result, current_user)
+        )
 
     # --- UPDATED RETURN ---
     return {
         "diagnosis_prediction": result["prediction"],
         "confidence_score": result["confidence"],
+        "model_version": result["model_version"],
+        "explanation": result.get("explanation"),
+    }
+
+
+def _audit_record(
+    input_data: prediction_schema.PredictionInput,
+    result: dict,
+    user: models.User | None,
+) -> dict:
+    elapsed = metrics.request_elapsed()
+    positive = result["prediction"] == enums.DiagnosisResult.positivo.value
+    return {
+        "input": input_data,
+        "diagnosis_prediction": enums.DiagnosisResult(result["prediction"]),
+        "confidence": result["confidence"],
+        "probability": (
+            result["confidence"] if positive else 1.0 - result["confidence"]
+        ),
+        "model_version": result["model_version"],
+        "user_id": user.id if user is not None else None,
+        "latency_ms": elapsed * 1000 if elapsed is not None else None,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+@router.post(
+    "/batch",
+    response_model=prediction_schema.BatchPredictionOutput,
+)
+def make_batch_diagnosis_prediction(
+    batch: prediction_schema.BatchPredictionInput,
+    explain: bool = False,
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Scores a list of clinical inputs in a single model call.
+    Results keep the order of the request; items that fail validation are
+    returned with an error instead of a prediction. ``?explain=true``
+    adds the top contributing fields to each result. Every scored item
+    is audited like a /predict call.
+    """
+    metrics.record_since_request_start("request.before_handler")
+    if len(batch.items) > settings.PREDICTION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=(
+                "Batch too large: at most "
+                f"{settings.PREDICTION_BATCH_MAX_ITEMS} items are allowed"
+            ),
+        )
+
+    results: list[dict] = []
+    valid_indexes: list[int] = []
+    valid_inputs: list[prediction_schema.PredictionInput] = []
+    with metrics.timed("batch.validate"):
+        for index, item in enumerate(batch.items):
+            try:
+                valid_inputs.append(
+                    prediction_schema.PredictionInput.model_validate(item)
+                )
+            except ValidationError as e:
+                results.append({"index": index, "error": _format_errors(e)})
+                continue
+            valid_indexes.append(index)
+            results.append({"index": index})
+
+    model_version = prediction_service.model_version
+    try:
+        predictions = prediction_service.predict_many(valid_inputs, explain)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    for index, prediction in zip(valid_indexes, predictions):
+        results[index]["diagnosis_prediction"] = prediction["prediction"]
+        results[index]["confidence_score"] = prediction["confidence"]
+        results[index]["explanation"] = prediction.get("explanation")
+        model_version = prediction["model_version"]
+
+    if settings.PREDICTION_AUDIT_ENABLED:
+        prediction_audit_log.submit_many([
+            _audit_record(input_data, prediction, current_user)
+            for input_data, prediction in zip(valid_inputs, predictions)
+        ])
+
+    return {"results": results, "model_version": model_version}
+
+
+@router.post(
+    "/what-if",
+    response_model=prediction_schema.WhatIfOutput,
+    dependencies=[Depends(get_current_user)],
+)
+def make_what_if_sweep(sweep: prediction_schema.WhatIfInput):
+    """
+    Returns the positive-class probability of the input with each field
+    switched, one at a time, to every category the model knows (or left
+    empty). Every alternative is scored in a single model call. The
+    sweep is not audited: its alternatives are counterfactuals, not
+    diagnoses.
+    """
+    metrics.record_since_request_start("request.before_handler")
+    try:
+        result = prediction_service.what_if(sweep.input, sweep.fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    return {
+        "model_version": result["model_version"],
+        "probability": result["probability"],
+        "diagnosis_prediction": result["prediction"],
+        "fields": [
+            {
+                "field": item["field"],
+                "alternatives": [
+                    {
+                        "value": alternative["value"],
+                        "probability": alternative["probability"],
+                        "diagnosis_prediction": alternative["prediction"],
+                        "current": alternative["current"],
+                    }
+                    for alternative in item["alternatives"]
+                ],
+            }
+            for item in result["fields"]
+        ],
+    }
+
+
+@router.post(
+    "/next-questions",
+    response_model=prediction_schema.NextQuestionsOutput,
+    dependencies=[Depends(get_current_user)],
+)
+def rank_next_questions(
+    input_data: prediction_schema.PredictionInput,
+    top_k: int | None = Query(None, ge=1),
+):
+    """
+    Ranks the fields left empty in a partial form by how much answering
+    them is expected to move the positive-class probability, so the
+    most informative findings can be checked first.
+    """
+    metrics.record_since_request_start("request.before_handler")
+    result = prediction_service.next_questions(input_data, top_k)
+    return {
+        "model_version": result["model_version"],
+        "probability": result["probability"],
+        "diagnosis_prediction": result["prediction"],
+        "questions": result["questions"],
     }
+
+
+@router.websocket("/live")
+async def live_prediction(websocket: WebSocket, token: str | None = None):
+    """
+    Live prediction while a form is being filled in. Authenticate with
+    ``?token=<access token>``, then send only the fields that changed,
+    e.g. ``{"coat": "leves_moderadas"}`` (``null`` clears a field). Each
+    message is answered with the prediction for the whole form so far
+    (``LivePredictionOutput``) or with ``{"error": "..."}``. Updates
+    are not audited, since the form is still being filled in; the final
+    form goes through /predict.
+    """
+    try:
+        await get_user_for_websocket(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+
+    session = await run_in_threadpool(prediction_service.start_live_session)
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                changes = json.loads(message)
+                if not isinstance(changes, dict):
+                    raise TypeError("Expected an object of field changes")
+                # The update itself is O(1), but it may reload changed
+                # artifacts (hashing, joblib), so not on the event loop
+                session, result = await run_in_threadpool(
+                    prediction_service.update_live_session, session, changes
+                )
+            # JSONDecodeError is a ValueError
+            except (TypeError, ValueError) as e:
+                await websocket.send_json({"error": str(e)})
+                continue
+            output = prediction_schema.LivePredictionOutput(
+                diagnosis_prediction=result["prediction"],
+                confidence_score=result["confidence"],
+                probability=result["probability"],
+                model_version=result["model_version"],
+            )
+            await websocket.send_json(output.model_dump())
+    except WebSocketDisconnect:
+        pass
+
+
+@router.get(
+    "/stats",
+    response_model=prediction_schema.PredictionStats,
+    dependencies=[Depends(get_current_admin_user)],
+)
+def read_prediction_stats():
+    """
+    Returns the serving model version, the prediction cache counters and
+    the audit log counters (admins only).
+    """
+    return {
+        "model_version": prediction_service.model_version,
+        "cache": prediction_service.cache.stats(),
+        "unknown_categories": prediction_service.encoder.unknown_counts(),
+        "audit": prediction_audit_log.stats(),
+    }
+
+
+def _registry_state() -> dict:
+    return {
+        "active_version": prediction_service.model_version,
+        "versions": prediction_service.registry.versions(),
+    }
+
+
+@router.get(
+    "/models",
+    response_model=prediction_schema.ModelRegistryOutput,
+    dependencies=[Depends(get_current_admin_user)],
+)
+def read_model_versions():
+    """
+    Lists the model versions in the manifest and the one being served
+    (admins only).
+    """
+    return _registry_state()
+
+
+@router.post(
+    "/models/reload",
+    response_model=prediction_schema.ModelRegistryOutput,
+    dependencies=[Depends(get_current_admin_user)],
+)
+def reload_model(
+    reload_input: prediction_schema.ModelReloadInput | None = None,
+):
+    """
+    Re-reads the manifest and atomically switches to its active version,
+    or to the requested one, which is persisted in ml_models/active.json
+    so every worker follows. In-flight predictions finish on the version
+    they started with (admins only).
+    """
+    try:
+        prediction_service.load()
+        if reload_input is not None and reload_input.version is not None:
+            prediction_service.activate(reload_input.version)
+        else:
+            prediction_service.reload()
+    except (ArtifactError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return _registry_state()
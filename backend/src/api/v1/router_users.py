@@ -6,6 +6,7 @@ from fastapi import (
     Request,
     Response,
 )
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
@@ -14,7 +15,13 @@ from src.core.limiter import limiter
 from src.db.crud import crud_user
 from src.schemas import user as user_schema
 from src.db import models
-from .dependencies import get_current_user, get_db, get_current_admin_user
+from .dependencies import (
+    get_async_db,
+    get_current_user,
+    get_db,
+    get_current_admin_user,
+)
+from .pagination import Page
 from src.core.config import settings
 from src.core import security
 from src.services.email import send_user_activation_email
@@ -73,9 +80,20 @@ async def read_users_me(current_user: models.User = Depends(get_current_user)):
     response_model=List[user_schema.UserPublic],
     dependencies=[Depends(get_current_admin_user)],
 )
-def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Returns a list of all users (admins only)."""
-    users = crud_user.get_users(db, skip=skip, limit=limit)
+async def read_users(
+    response: Response,
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Returns a list of all users (admins only), by email."""
+    users = await crud_user.get_users_async(
+        db,
+        skip=page.skip,
+        limit=page.limit,
+        cursor=page.cursor,
+        options=crud_user.PUBLIC_LOADERS,
+    )
+    page.link_next(response, crud_user.PAGE_ORDER, users)
     return users
 
 
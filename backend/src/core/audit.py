@@ -0,0 +1,209 @@
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Sequence
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
+
+from src.core.config import settings
+from src.db import models
+from src.db.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+def input_hash(input_data) -> str:
+    """SHA-256 of the input as canonical JSON (sorted keys, no spaces)."""
+    payload = json.dumps(
+        input_data.model_dump(), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class PredictionAuditLog:
+    """
+    Writes one ``predictions`` row per input scored by /predict and
+    /predict/batch without a database round trip on the request path.
+    The what-if sweep and the live WebSocket are not audited: they score
+    counterfactuals and partial forms, not diagnoses.
+
+    Requests only put a record on a bounded in-memory queue. A writer
+    thread takes records off it and inserts them in bulk (one multi-row
+    INSERT) every ``batch_size`` records or ``flush_ms`` after the first
+    record of a batch, whichever comes first. When the queue is full the
+    request waits, off the event loop, up to ``block_ms`` for room
+    (backpressure); after that the record is dropped and counted.
+    ``close()`` writes everything still queued.
+    """
+
+    def __init__(
+        self,
+        bind=engine,
+        batch_size: int = 500,
+        flush_ms: float = 200.0,
+        queue_size: int = 10_000,
+        block_ms: float = 50.0,
+    ):
+        self.bind = bind
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.block_timeout = block_ms / 1000
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.failed = 0
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="prediction-audit", daemon=True
+            )
+            self._thread.start()
+
+    async def submit(self, record: dict) -> None:
+        """
+        Queues one record: ``input`` (a PredictionInput),
+        ``diagnosis_prediction``, ``confidence``, ``probability``,
+        ``model_version``, ``user_id``, ``latency_ms`` and ``created_at``.
+        """
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        # Backpressure: the writer is behind, so wait for room
+        try:
+            await run_in_threadpool(
+                self._queue.put, record, True, self.block_timeout
+            )
+        except queue.Full:
+            self._drop(1)
+
+    def submit_many(self, records: Sequence[dict]) -> None:
+        """
+        Queues several records from a worker thread (sync routes). They
+        share a single ``block_ms`` wait for room; whatever does not fit
+        by then is dropped.
+        """
+        if self._thread is None:
+            self.start()
+        deadline = time.monotonic() + self.block_timeout
+        for queued, record in enumerate(records):
+            try:
+                self._queue.put(
+                    record, True, max(0.0, deadline - time.monotonic())
+                )
+            except queue.Full:
+                self._drop(len(records) - queued)
+                return
+
+    def _drop(self, count: int) -> None:
+        with self._dropped_lock:
+            self.dropped += count
+        logger.warning(
+            "Prediction audit queue full, %d record(s) dropped", count
+        )
+
+    def flush(self) -> None:
+        """Blocks until every queued record has been written (or failed)."""
+        self._queue.join()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Writes what is still queued and stops the writer thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+
+            # 1. Junta registros até completar o lote ou vencer o prazo
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                # On shutdown, drain without waiting
+                remaining = (
+                    0.0 if self._stop.is_set() else deadline - time.monotonic()
+                )
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # 2. Grava o lote inteiro em um único INSERT
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: list[dict]) -> None:
+        rows = [
+            {
+                "input_hash": input_hash(record["input"]),
+                "diagnosis_prediction": record["diagnosis_prediction"],
+                "confidence": record["confidence"],
+                "probability": record["probability"],
+                "model_version": record["model_version"],
+                "user_id": record["user_id"],
+                "latency_ms": record["latency_ms"],
+                "created_at": record["created_at"],
+            }
+            for record in batch
+        ]
+        start = time.perf_counter()
+        try:
+            with self.bind.begin() as connection:
+                connection.execute(insert(models.Prediction), rows)
+        except Exception:
+            self.failed += len(rows)
+            logger.exception("Could not write %d audit records", len(rows))
+            return
+        self.written += len(rows)
+        self.batches += 1
+        logger.debug(
+            "%d audit records written in %.1f ms",
+            len(rows),
+            (time.perf_counter() - start) * 1000,
+        )
+
+
+prediction_audit_log = PredictionAuditLog(
+    batch_size=settings.PREDICTION_AUDIT_BATCH_SIZE,
+    flush_ms=settings.PREDICTION_AUDIT_FLUSH_MS,
+    queue_size=settings.PREDICTION_AUDIT_QUEUE_SIZE,
+    block_ms=settings.PREDICTION_AUDIT_BLOCK_MS,
+)
@@ -10,6 +10,22 @@ class Settings(BaseSettings):
     postgres_host: str = "localhost"
     postgres_port: int = 5432
 
+    # Connection pool. Sync routes run in a threadpool of 40 threads, so
+    # SIZE + MAX_OVERFLOW = 40 lets each of them hold a connection
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 30
+    # Seconds a checkout waits for a free connection before failing
+    DB_POOL_TIMEOUT: float = 30.0
+    # Seconds before a connection is replaced (-1: never)
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Per-connection statement_timeout (0: server default)
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000
+    # Pool of the asyncpg engine (auth and read routes, on the event
+    # loop); timeout, recycle, pre-ping and statement_timeout are shared
+    DB_ASYNC_POOL_SIZE: int = 10
+    DB_ASYNC_MAX_OVERFLOW: int = 10
+
     # JWT Settings
     SECRET_KEY: str
     ALGORITHM: str
@@ -30,6 +46,44 @@ class Settings(BaseSettings):
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 60
     ADMIN_NOTIFICATION_EMAIL: str | None = None
 
+    # Largest page (?limit=) accepted by the list endpoints
+    PAGINATION_MAX_LIMIT: int = 1000
+
+    # Prediction Settings
+    PREDICTION_BATCH_MAX_ITEMS: int = 10_000
+    PREDICTION_CACHE_SIZE: int = 4096
+    PREDICTION_ARTIFACT_CHECK_SECONDS: float = 5.0
+    PREDICTION_MICROBATCH_ENABLED: bool = False
+    PREDICTION_MICROBATCH_MAX_SIZE: int = 64
+    PREDICTION_MICROBATCH_MAX_WAIT_MS: float = 2.0
+    # Audit log of /predict calls, written in bulk by a background thread:
+    # every BATCH_SIZE records or FLUSH_MS, with a bounded queue
+    PREDICTION_AUDIT_ENABLED: bool = True
+    PREDICTION_AUDIT_BATCH_SIZE: int = 500
+    PREDICTION_AUDIT_FLUSH_MS: float = 200.0
+    PREDICTION_AUDIT_QUEUE_SIZE: int = 10_000
+    # How long a request waits for room in a full queue before dropping
+    PREDICTION_AUDIT_BLOCK_MS: float = 50.0
+    # Fields returned by explain=true, largest contribution first
+    PREDICTION_EXPLAIN_TOP_K: int = 5
+    # "r" memory-maps the NumPy arrays of the artifacts (and the compiled
+    # tree arrays, saved next to the model on first load), so every worker
+    # process shares the same page-cache copy of the model weights
+    MODEL_MMAP_MODE: str | None = None
+    # Threads scoring the members of a tree ensemble model in parallel
+    PREDICTION_TREE_WORKERS: int = 1
+    # Inputs scored at startup, before the worker reports itself as ready
+    PREDICTION_WARMUP_INPUTS: list[dict[str, str | None]] = [
+        {},
+        {"animal_sex": "M", "breed_name": "SRD"},
+        {"animal_sex": "F", "breed_name": "SRD"},
+    ]
+
+    # Metrics Settings
+    # Adds a Server-Timing header with the per-stage durations of each
+    # request (visible in the browser dev tools)
+    METRICS_SERVER_TIMING: bool = False
+
     TESTING: bool = False
 
     model_config = SettingsConfigDict(
@@ -44,5 +98,13 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        password_encoded = quote_plus(self.postgres_password)
+        return (
+            f"postgresql+asyncpg://{self.postgres_user}:{password_encoded}"
+            f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+        )
+
 
 settings = Settings()
@@ -0,0 +1,69 @@
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from src.core.audit import prediction_audit_log
+from src.core.config import settings
+from src.db.database import async_engine, engine
+from src.ml.prediction_service import prediction_service
+from src.schemas.prediction import PredictionInput
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_database() -> None:
+    """Opens a pooled connection and runs a trivial query."""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def warm_up_async_database() -> None:
+    """Same as warm_up_database, for the asyncpg pool."""
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+def warm_up_model() -> None:
+    """Runs the configured warm-up inputs through the prediction paths."""
+    inputs = [
+        PredictionInput.model_validate(item)
+        for item in settings.PREDICTION_WARMUP_INPUTS
+    ]
+    prediction_service.warm_up(inputs)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads and warms up everything a request needs before the worker is
+    reported as ready by /health/ready.
+    """
+    readiness = {"model": False, "database": False, "cache": False}
+    app.state.readiness = readiness
+
+    await run_in_threadpool(prediction_service.load)
+    readiness["model"] = True
+
+    try:
+        await run_in_threadpool(warm_up_database)
+        await warm_up_async_database()
+        readiness["database"] = True
+    except Exception:
+        # /health/ready keeps retrying until the database answers
+        logger.exception("Database warm-up failed")
+
+    await run_in_threadpool(warm_up_model)
+    readiness["cache"] = True
+
+    if settings.PREDICTION_AUDIT_ENABLED:
+        prediction_audit_log.start()
+
+    yield
+
+    # Records still queued are written before the worker exits
+    await run_in_threadpool(prediction_audit_log.close)
+    # asyncpg connections belong to this event loop
+    await async_engine.dispose()
@@ -0,0 +1,174 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from src.core.config import settings
+
+# Upper bounds (in seconds) of the histogram buckets: 1µs doubling up to
+# ~67s, which covers everything from a cache hit to a stuck DB query.
+BUCKET_BOUNDS = [1e-6 * 2**i for i in range(27)]
+
+# Stage timings of the current request, used for the Server-Timing header
+_request_timings: ContextVar[dict[str, float] | None] = ContextVar(
+    "request_timings", default=None
+)
+_request_start: ContextVar[float | None] = ContextVar(
+    "request_start", default=None
+)
+
+
+class Histogram:
+    """Fixed log-scale buckets; observing is a bisect and an increment."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th observation."""
+        with self._lock:
+            counts, count = list(self.counts), self.count
+        if count == 0:
+            return None
+        rank = q * count
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                if index < len(BUCKET_BOUNDS):
+                    return BUCKET_BOUNDS[index]
+                return float("inf")
+        return float("inf")
+
+    def summary(self) -> dict:
+        with self._lock:
+            count, total = self.count, self.total
+        return {
+            "count": count,
+            "sum_ms": total * 1000,
+            "mean_ms": total / count * 1000 if count else None,
+            "p50_ms": _to_ms(self.quantile(0.5)),
+            "p90_ms": _to_ms(self.quantile(0.9)),
+            "p99_ms": _to_ms(self.quantile(0.99)),
+        }
+
+
+def _to_ms(seconds: float | None) -> float | None:
+    return None if seconds is None else seconds * 1000
+
+
+_histograms: dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def get_histogram(stage: str) -> Histogram:
+    histogram = _histograms.get(stage)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(stage, Histogram())
+    return histogram
+
+
+def record(stage: str, seconds: float) -> None:
+    """Adds a stage duration to its histogram and to the current request."""
+    get_histogram(stage).observe(seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def record_since_request_start(stage: str) -> None:
+    """
+    Records the time elapsed since the request reached the middleware.
+    Called first thing in a route, it measures body parsing, validation
+    and the dependencies that ran before the handler.
+    """
+    start = _request_start.get()
+    if start is not None:
+        record(stage, time.perf_counter() - start)
+
+
+def request_elapsed() -> float | None:
+    """Seconds since the current request reached the middleware."""
+    start = _request_start.get()
+    return None if start is None else time.perf_counter() - start
+
+
+@contextmanager
+def timed(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def summaries() -> dict[str, dict]:
+    return {
+        stage: histogram.summary()
+        for stage, histogram in sorted(_histograms.items())
+    }
+
+
+def reset() -> None:
+    with _histograms_lock:
+        _histograms.clear()
+
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware that times every HTTP request per route and,
+    when METRICS_SERVER_TIMING is enabled, reports the stages recorded
+    while handling it in a ``Server-Timing`` response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        timings_token = _request_timings.set(timings)
+        start_token = _request_start.set(start)
+
+        async def send_with_timing(message):
+            if (
+                message["type"] == "http.response.start"
+                and settings.METRICS_SERVER_TIMING
+            ):
+                elapsed = time.perf_counter() - start
+                entries = [
+                    f"{stage};dur={seconds * 1000:.3f}"
+                    for stage, seconds in timings.items()
+                ]
+                entries.append(f"total;dur={elapsed * 1000:.3f}")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", ", ".join(entries).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(timings_token)
+            _request_start.reset(start_token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            get_histogram(f"http {scope['method']} {path}").observe(
+                time.perf_counter() - start
+            )
@@ -1,9 +1,21 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.interfaces import ORMOption
 from src.db import models
+from src.db.pagination import Keyset
 from src.schemas import animal as animal_schema
-from typing import List
+from typing import List, Sequence
 from uuid import UUID
 
+# Relationships serialized by AnimalPublic, for the read endpoints
+# (many-to-one: one SELECT per page)
+PUBLIC_LOADERS = (
+    joinedload(models.Animal.owner, innerjoin=True),
+    joinedload(models.Animal.breed, innerjoin=True),
+)
+PAGE_ORDER = Keyset(models.Animal.name, models.Animal.id)
+
 
 def create_animal(
     db: Session, animal: animal_schema.AnimalCreate
@@ -21,12 +33,32 @@ def create_animal(
 
 
 def get_animals(
-    db: Session, skip: int = 0, limit: int = 100
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    options: Sequence[ORMOption] = (),
+    cursor: str | None = None,
 ) -> List[models.Animal]:
     """
-    Search for a list of animals with pagination.
+    Search for a list of animals with pagination, by name.
+    ``cursor`` (see ``PAGE_ORDER``) starts after the previous page;
+    ``options`` are loader options (e.g. ``PUBLIC_LOADERS``).
     """
-    return db.query(models.Animal).offset(skip).limit(limit).all()
+    query = db.query(models.Animal).options(*options)
+    return PAGE_ORDER.apply(query, cursor).offset(skip).limit(limit).all()
+
+
+async def get_animals_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    options: Sequence[ORMOption] = (),
+    cursor: str | None = None,
+) -> List[models.Animal]:
+    """get_animals on an AsyncSession (same query)."""
+    statement = select(models.Animal).options(*options)
+    statement = PAGE_ORDER.apply(statement, cursor).offset(skip).limit(limit)
+    return list(await db.scalars(statement))
 
 
 def get_animal_by_original_id(
@@ -42,15 +74,26 @@ def get_animal_by_original_id(
     )
 
 
-def get_animal_by_id(db: Session, animal_id: UUID) -> models.Animal | None:
+def get_animal_by_id(
+    db: Session, animal_id: UUID, options: Sequence[ORMOption] = ()
+) -> models.Animal | None:
     """
     Search for an animal by its ID.
     """
     return (
-        db.query(models.Animal).filter(models.Animal.id == animal_id).first()
+        db.query(models.Animal)
+        .options(*options)
+        .filter(models.Animal.id == animal_id)
+        .first()
     )
 
 
+async def get_animal_by_id_async(
+    db: AsyncSession, animal_id: UUID, options: Sequence[ORMOption] = ()
+) -> models.Animal | None:
+    return await db.get(models.Animal, animal_id, options=options)
+
+
 def update_animal(
     db: Session, animal_id: UUID, animal_update: animal_schema.AnimalUpdate
 ) -> models.Animal | None:
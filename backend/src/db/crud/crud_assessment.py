@@ -1,15 +1,68 @@
 from uuid import UUID
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Sequence
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.interfaces import ORMOption
 from src.db import models
+from src.db.models import enums
+from src.db.pagination import Keyset
+from src.ml.features import CLINICAL_FIELDS, prediction_input_from_assessment
+from src.ml.prediction_service import prediction_service
 from src.schemas import assessment as assessment_schema
 
 
+# Relationships serialized by AssessmentPublic, for the read endpoints.
+# All of them are many-to-one, so joining them never multiplies rows and
+# a page of any size is a single SELECT.
+PUBLIC_LOADERS = (
+    joinedload(models.Assessment.animal, innerjoin=True).joinedload(
+        models.Animal.owner, innerjoin=True
+    ),
+    joinedload(models.Assessment.animal, innerjoin=True).joinedload(
+        models.Animal.breed, innerjoin=True
+    ),
+    joinedload(models.Assessment.user, innerjoin=True).joinedload(
+        models.User.role
+    ),
+)
+
+# Newest first; the id breaks ties between equal timestamps
+PAGE_ORDER = Keyset(
+    models.Assessment.created_at, models.Assessment.id, descending=True
+)
+
+
+def _apply_prediction(db_assessment: models.Assessment) -> None:
+    """
+    Scores the clinical fields of the assessment and stores the result
+    on it, so reads never need to run the model again.
+    """
+    result = prediction_service.predict(
+        prediction_input_from_assessment(db_assessment)
+    )
+    db_assessment.predicted_diagnosis = enums.DiagnosisResult(
+        result["prediction"]
+    )
+    db_assessment.prediction_confidence = result["confidence"]
+    db_assessment.model_version = result["model_version"]
+
+
+def _clear_prediction(db_assessment: models.Assessment) -> None:
+    db_assessment.predicted_diagnosis = None
+    db_assessment.prediction_confidence = None
+    db_assessment.model_version = None
+
+
 def create_assessment(
-    db: Session, assessment: assessment_schema.AssessmentCreate, user_id: UUID
+    db: Session,
+    assessment: assessment_schema.AssessmentCreate,
+    user_id: UUID,
+    score: bool = False,
 ) -> models.Assessment:
     """
     Creates a new service in the database.
+    With ``score=True`` the model prediction is stored along with it.
     """
     # model_dump() converte o schema Pydantic para um dicionário
     db_assessment = models.Assessment(
@@ -17,46 +70,75 @@ def create_assessment(
         user_id=user_id,  # Adds the logged in user ID
     )
     db.add(db_assessment)
+    if score:
+        # Flush first so the animal (sex and breed) can be loaded
+        db.flush()
+        _apply_prediction(db_assessment)
     db.commit()
     db.refresh(db_assessment)
     return db_assessment
 
 
 def get_assessments(
-    db: Session, skip: int = 0, limit: int = 100
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    options: Sequence[ORMOption] = (),
+    cursor: str | None = None,
 ) -> List[models.Assessment]:
     """
-    Search for a list of services with pagination.
+    Search for a list of services with pagination, newest first.
+    ``cursor`` (see ``PAGE_ORDER``) starts after the previous page;
+    ``options`` are loader options (e.g. ``PUBLIC_LOADERS``).
     """
-    return (
-        db.query(models.Assessment)
-        .order_by(models.Assessment.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    query = db.query(models.Assessment).options(*options)
+    return PAGE_ORDER.apply(query, cursor).offset(skip).limit(limit).all()
+
+
+async def get_assessments_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    options: Sequence[ORMOption] = (),
+    cursor: str | None = None,
+) -> List[models.Assessment]:
+    """get_assessments on an AsyncSession (same query)."""
+    statement = select(models.Assessment).options(*options)
+    statement = PAGE_ORDER.apply(statement, cursor).offset(skip).limit(limit)
+    return list(await db.scalars(statement))
 
 
 def get_assessment_by_id(
-    db: Session, assessment_id: UUID
+    db: Session, assessment_id: UUID, options: Sequence[ORMOption] = ()
 ) -> models.Assessment | None:
     """
     Search for assistance using your ID.
     """
     return (
         db.query(models.Assessment)
+        .options(*options)
         .filter(models.Assessment.id == assessment_id)
         .first()
     )
 
 
+async def get_assessment_by_id_async(
+    db: AsyncSession, assessment_id: UUID, options: Sequence[ORMOption] = ()
+) -> models.Assessment | None:
+    return await db.get(models.Assessment, assessment_id, options=options)
+
+
 def update_assessment(
     db: Session,
     assessment_id: UUID,
     assessment_update: assessment_schema.AssessmentUpdate,
+    score: bool = False,
 ) -> models.Assessment | None:
     """
     Updates the data of an existing service.
+    With ``score=True`` the assessment is scored again; otherwise a
+    stored prediction is dropped when a clinical field changes, since it
+    no longer describes the assessment.
     """
     db_assessment = get_assessment_by_id(db, assessment_id=assessment_id)
     if not db_assessment:
@@ -66,9 +148,17 @@ def update_assessment(
     update_data = assessment_update.model_dump(exclude_unset=True)
 
     # Iterates over the data and updates the fields of the SQLAlchemy object
+    clinical_changed = False
     for key, value in update_data.items():
+        if key in CLINICAL_FIELDS and getattr(db_assessment, key) != value:
+            clinical_changed = True
         setattr(db_assessment, key, value)
 
+    if score:
+        _apply_prediction(db_assessment)
+    elif clinical_changed:
+        _clear_prediction(db_assessment)
+
     db.add(db_assessment)
     db.commit()
     db.refresh(db_assessment)
@@ -1,15 +1,29 @@
 from typing import List
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.db import models
+from src.db.pagination import Keyset
 from src.schemas import breed as breed_schema
 from uuid import UUID
 
+# name is unique, so it identifies a row on its own (ix_breeds_name)
+PAGE_ORDER = Keyset(models.Breed.name)
+
+# Breed given to animals without one; seeded and never deleted
+DEFAULT_BREED_NAME = "SRD (Sem Raça Definida)"
+
 
 def get_breed_by_name(db: Session, name: str) -> models.Breed | None:
     """
-    Search for a breed by name. The search is case-insensitive.
+    Search for a breed by name. The search is case-insensitive
+    (lower() = lower(), served by the ix_breeds_lower_name index).
     """
-    return db.query(models.Breed).filter(models.Breed.name.ilike(name)).first()
+    return (
+        db.query(models.Breed)
+        .filter(func.lower(models.Breed.name) == func.lower(name))
+        .first()
+    )
 
 
 def create_breed(db: Session, breed: breed_schema.BreedCreate) -> models.Breed:
@@ -24,12 +38,25 @@ def create_breed(db: Session, breed: breed_schema.BreedCreate) -> models.Breed:
 
 
 def get_breeds(
-    db: Session, skip: int = 0, limit: int = 100
+    db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None
 ) -> List[models.Breed]:
     """
-    Search for a list of breeds with pagination.
+    Search for a list of breeds with pagination, by name.
+    ``cursor`` (see ``PAGE_ORDER``) starts after the previous page.
     """
-    return db.query(models.Breed).offset(skip).limit(limit).all()
+    query = PAGE_ORDER.apply(db.query(models.Breed), cursor)
+    return query.offset(skip).limit(limit).all()
+
+
+async def get_breeds_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> List[models.Breed]:
+    """get_breeds on an AsyncSession (same query)."""
+    statement = PAGE_ORDER.apply(select(models.Breed), cursor)
+    return list(await db.scalars(statement.offset(skip).limit(limit)))
 
 
 def get_breed_by_id(db: Session, breed_id: UUID) -> models.Breed | None:
@@ -39,6 +66,12 @@ def get_breed_by_id(db: Session, breed_id: UUID) -> models.Breed | None:
     return db.query(models.Breed).filter(models.Breed.id == breed_id).first()
 
 
+async def get_breed_by_id_async(
+    db: AsyncSession, breed_id: UUID
+) -> models.Breed | None:
+    return await db.get(models.Breed, breed_id)
+
+
 def update_breed(
     db: Session, breed_id: UUID, breed_update: breed_schema.BreedCreate
 ) -> models.Breed | None:
@@ -71,7 +104,7 @@ def delete_breed(db: Session, breed_id: UUID) -> models.Breed | None:
         return None
 
     # We added a check to not delete the "SRD (No Defined Breed)" breed
-    if db_breed.name == "SRD (Sem Raça Definida)":
+    if db_breed.name == DEFAULT_BREED_NAME:
         return None  # Or raise an exception, depending on the business rule
 
     db.delete(db_breed)
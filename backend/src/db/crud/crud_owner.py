@@ -1,14 +1,25 @@
 from typing import List
 from uuid import UUID
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.db import models
+from src.db.pagination import Keyset
 from src.schemas import owner as owner_schema
 
+PAGE_ORDER = Keyset(models.Owner.name, models.Owner.id)
+
 
 def get_owner_by_id(db: Session, owner_id: UUID) -> models.Owner | None:
     return db.query(models.Owner).filter(models.Owner.id == owner_id).first()
 
 
+async def get_owner_by_id_async(
+    db: AsyncSession, owner_id: UUID
+) -> models.Owner | None:
+    return await db.get(models.Owner, owner_id)
+
+
 def create_owner(db: Session, owner: owner_schema.OwnerCreate) -> models.Owner:
     db_owner = models.Owner(**owner.model_dump())
     db.add(db_owner)
@@ -18,16 +29,33 @@ def create_owner(db: Session, owner: owner_schema.OwnerCreate) -> models.Owner:
 
 
 def get_owners(
-    db: Session, skip: int = 0, limit: int = 100
+    db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None
+) -> List[models.Owner]:
+    query = PAGE_ORDER.apply(db.query(models.Owner), cursor)
+    return query.offset(skip).limit(limit).all()
+
+
+async def get_owners_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
 ) -> List[models.Owner]:
-    return db.query(models.Owner).offset(skip).limit(limit).all()
+    statement = PAGE_ORDER.apply(select(models.Owner), cursor)
+    return list(await db.scalars(statement.offset(skip).limit(limit)))
 
 
 def get_owner_by_name(db: Session, name: str) -> models.Owner | None:
     """
     Search for an owner by their name (case-insensitive).
+    lower() = lower() uses the ix_owners_lower_name index; ILIKE cannot,
+    and would also treat % and _ in the name as wildcards.
     """
-    return db.query(models.Owner).filter(models.Owner.name.ilike(name)).first()
+    return (
+        db.query(models.Owner)
+        .filter(func.lower(models.Owner.name) == func.lower(name))
+        .first()
+    )
 
 
 def update_owner(
@@ -1,17 +1,39 @@
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.interfaces import ORMOption
+from typing import List, Sequence
 from uuid import UUID
 
 from src.db import models
+from src.db.pagination import Keyset
 from src.schemas import user as user_schema, role as role_schema
 from src.core.security import get_password_hash, verify_password
 from . import crud_role
 
+# Relationships serialized by UserPublic, for the read endpoints
+PUBLIC_LOADERS = (joinedload(models.User.role),)
+# email is unique, so it identifies a row on its own (ix_users_email)
+PAGE_ORDER = Keyset(models.User.email)
+
 
 def get_user_by_email(db: Session, email: str) -> models.User | None:
     return db.query(models.User).filter(models.User.email == email).first()
 
 
+async def get_user_by_email_async(
+    db: AsyncSession, email: str, options: Sequence[ORMOption] = ()
+) -> models.User | None:
+    """
+    get_user_by_email on an AsyncSession. Relationships cannot be lazy
+    loaded there, so pass the ones the caller needs in ``options``.
+    """
+    statement = (
+        select(models.User).options(*options).where(models.User.email == email)
+    )
+    return (await db.scalars(statement)).first()
+
+
 def get_user_by_id(db: Session, user_id: UUID) -> models.User | None:
     """Search for a user by their ID."""
     return db.query(models.User).filter(models.User.id == user_id).first()
@@ -73,9 +95,26 @@ def authenticate_user(
 
 
 def get_users(
-    db: Session, skip: int = 0, limit: int = 100
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    options: Sequence[ORMOption] = (),
+    cursor: str | None = None,
+) -> List[models.User]:
+    query = db.query(models.User).options(*options)
+    return PAGE_ORDER.apply(query, cursor).offset(skip).limit(limit).all()
+
+
+async def get_users_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    options: Sequence[ORMOption] = (),
+    cursor: str | None = None,
 ) -> List[models.User]:
-    return db.query(models.User).offset(skip).limit(limit).all()
+    statement = select(models.User).options(*options)
+    statement = PAGE_ORDER.apply(statement, cursor).offset(skip).limit(limit)
+    return list(await db.scalars(statement))
 
 
 def deactivate_user(db: Session, user_id: UUID) -> models.User | None:
@@ -1,7 +1,169 @@
+import threading
+import time
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.core import metrics
 from src.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+
+class _InstrumentedPool:
+    """
+    Records how long each checkout waited for a connection (stage
+    ``wait_stage``, also reported in Server-Timing) and counts the
+    checkouts that gave up after ``pool_timeout``.
+    """
+
+    wait_stage = "db.pool_wait"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self._stats_lock = threading.Lock()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            metrics.record(self.wait_stage, time.perf_counter() - start)
+        checked_out = self.checkedout()
+        if checked_out > self.peak_checked_out:
+            with self._stats_lock:
+                self.peak_checked_out = max(self.peak_checked_out, checked_out)
+        return connection
+
+    def stats(self) -> dict:
+        capacity = self.size() + self._max_overflow
+        checked_out = self.checkedout()
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": checked_out,
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            # Share of all possible connections in use; at 1.0 new
+            # checkouts wait up to pool_timeout
+            "saturation": checked_out / capacity if capacity > 0 else 0.0,
+            "peak_checked_out": self.peak_checked_out,
+            "timeouts": self.timeouts,
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    """Pool of the psycopg2 engine (sync routes, scripts)."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    """Pool of the asyncpg engine (auth and read routes)."""
+
+    wait_stage = "db.async_pool_wait"
+
+
+def _pick(value, default):
+    return default if value is None else value
+
+
+def _pool_arguments(
+    pool_timeout: float | None,
+    pool_recycle: int | None,
+    pool_pre_ping: bool | None,
+) -> dict:
+    """Pool settings shared by the sync and the async engine."""
+    return {
+        "pool_timeout": _pick(pool_timeout, settings.DB_POOL_TIMEOUT),
+        "pool_recycle": _pick(pool_recycle, settings.DB_POOL_RECYCLE),
+        "pool_pre_ping": _pick(pool_pre_ping, settings.DB_POOL_PRE_PING),
+    }
+
+
+def make_engine(
+    url: str | None = None,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_timeout: float | None = None,
+    pool_recycle: int | None = None,
+    pool_pre_ping: bool | None = None,
+    statement_timeout_ms: int | None = None,
+):
+    """Engine configured from the DB_* settings (arguments override)."""
+    statement_timeout_ms = _pick(
+        statement_timeout_ms, settings.DB_STATEMENT_TIMEOUT_MS
+    )
+    connect_args = {}
+    if statement_timeout_ms > 0:
+        # Set on every new connection; 0 leaves the server default
+        connect_args["options"] = (
+            f"-c statement_timeout={statement_timeout_ms}"
+        )
+
+    return create_engine(
+        url or settings.DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=_pick(pool_size, settings.DB_POOL_SIZE),
+        max_overflow=_pick(max_overflow, settings.DB_MAX_OVERFLOW),
+        connect_args=connect_args,
+        **_pool_arguments(pool_timeout, pool_recycle, pool_pre_ping),
+    )
+
+
+def make_async_engine(
+    url: str | None = None,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_timeout: float | None = None,
+    pool_recycle: int | None = None,
+    pool_pre_ping: bool | None = None,
+    statement_timeout_ms: int | None = None,
+):
+    """asyncpg engine configured from the DB_* settings."""
+    statement_timeout_ms = _pick(
+        statement_timeout_ms, settings.DB_STATEMENT_TIMEOUT_MS
+    )
+    connect_args = {}
+    if statement_timeout_ms > 0:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(statement_timeout_ms)
+        }
+
+    return create_async_engine(
+        url or settings.ASYNC_DATABASE_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=_pick(pool_size, settings.DB_ASYNC_POOL_SIZE),
+        max_overflow=_pick(max_overflow, settings.DB_ASYNC_MAX_OVERFLOW),
+        connect_args=connect_args,
+        **_pool_arguments(pool_timeout, pool_recycle, pool_pre_ping),
+    )
+
+
+engine = make_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async stack, used where a blocking DB round trip would stall the event
+# loop (get_current_user and the read routes). Nothing is expired on
+# commit, so the loaded objects stay usable after the session closes.
+async_engine = make_async_engine()
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def pool_stats() -> dict:
+    """Checkout counters and saturation of the application pool."""
+    return engine.pool.stats()
+
+
+def async_pool_stats() -> dict:
+    """Checkout counters and saturation of the asyncpg pool."""
+    return async_engine.pool.stats()
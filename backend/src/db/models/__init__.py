@@ -5,3 +5,4 @@ from .owner import Owner as Owner
 from .animal import Animal as Animal
 from .assessment import Assessment as Assessment
 from .breed import Breed as Breed
+from .prediction import Prediction as Prediction
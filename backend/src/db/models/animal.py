@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -8,6 +8,8 @@ from .base import Base
 
 class Animal(Base):
     __tablename__ = "animals"
+    # Sort key of the list and its cursor pages
+    __table_args__ = (Index("ix_animals_name_id", "name", "id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     original_id = Column(String, unique=True, index=True, nullable=True)
@@ -15,10 +17,16 @@ class Animal(Base):
     sex = Column(String(1), nullable=True)
 
     breed_id = Column(
-        UUID(as_uuid=True), ForeignKey("breeds.id"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("breeds.id"),
+        nullable=False,
+        index=True,
     )
     owner_id = Column(
-        UUID(as_uuid=True), ForeignKey("owners.id"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("owners.id"),
+        nullable=False,
+        index=True,
     )
 
     breed = relationship("Breed", back_populates="animals")
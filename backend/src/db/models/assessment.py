@@ -1,5 +1,13 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey, Enum, DateTime
+from sqlalchemy import (
+    Column,
+    String,
+    ForeignKey,
+    Enum,
+    DateTime,
+    Float,
+    Index,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -10,6 +18,10 @@ from . import enums
 
 class Assessment(Base):
     __tablename__ = "assessments"
+    __table_args__ = (
+        # Sort key of the list (newest first) and its cursor pages
+        Index("ix_assessments_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     original_id = Column(String, nullable=True)
@@ -37,12 +49,23 @@ class Assessment(Base):
     slide = Column(Enum(enums.DiagnosisResult), nullable=True)
     diagnosis = Column(Enum(enums.DiagnosisResult), nullable=True)
 
+    # Model prediction stored when the assessment is scored on write
+    predicted_diagnosis = Column(Enum(enums.DiagnosisResult), nullable=True)
+    prediction_confidence = Column(Float, nullable=True)
+    model_version = Column(String, nullable=True)
+
     # Foreign keys
     animal_id = Column(
-        UUID(as_uuid=True), ForeignKey("animals.id"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("animals.id"),
+        nullable=False,
+        index=True,
     )
     user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("users.id"),
+        nullable=False,
+        index=True,
     )
 
     # Relationships
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -14,3 +14,7 @@ class Breed(Base):
 
     # Relationship: A breed can have several animals
     animals = relationship("Animal", back_populates="breed")
+
+
+# Case-insensitive lookup by name (crud_breed.get_breed_by_name)
+Index("ix_breeds_lower_name", func.lower(Breed.name))
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -8,6 +8,8 @@ from .base import Base
 
 class Owner(Base):
     __tablename__ = "owners"
+    # Sort key of the list and its cursor pages
+    __table_args__ = (Index("ix_owners_name_id", "name", "id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, index=True, nullable=False)
@@ -20,3 +22,7 @@ class Owner(Base):
     # Relationship: An owner can have multiple animals.
     # 'animals' will be a list of Animal objects.
     animals = relationship("Animal", back_populates="owner")
+
+
+# Case-insensitive lookup by name (crud_owner.get_owner_by_name)
+Index("ix_owners_lower_name", func.lower(Owner.name))
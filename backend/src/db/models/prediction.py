@@ -0,0 +1,38 @@
+import uuid
+from sqlalchemy import Column, String, ForeignKey, Enum, DateTime, Float
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from .base import Base
+from . import enums
+
+
+class Prediction(Base):
+    """Audit record of one /predict call, written in bulk off-request."""
+
+    __tablename__ = "predictions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # SHA-256 of the canonical JSON of the input
+    input_hash = Column(String(64), nullable=False)
+    diagnosis_prediction = Column(Enum(enums.DiagnosisResult), nullable=False)
+    confidence = Column(Float, nullable=False)
+    # Positive-class probability
+    probability = Column(Float, nullable=False)
+    model_version = Column(String, nullable=False)
+    latency_ms = Column(Float, nullable=True)
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+
+    # When the prediction was made (not when the batch was written)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
@@ -0,0 +1,91 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Query
+
+
+class InvalidCursor(ValueError):
+    """The pagination cursor is malformed or belongs to another list."""
+
+
+class Keyset:
+    """
+    Sort key of a list endpoint, used for keyset (cursor) pagination.
+
+    The columns must identify a row: end them with the primary key, or
+    use a single unique column. A page starts right after the last row
+    of the previous one, with ``WHERE (col_1, ..., id) > (last_1, ...,
+    last_id)`` (``<`` when descending) instead of an OFFSET, so with an
+    index on the columns page N costs the same as page 1. The cursor is
+    the key of that last row, JSON-encoded in URL-safe base64; clients
+    treat it as opaque.
+    """
+
+    def __init__(self, *columns, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def apply(
+        self, query: Query | Select, cursor: str | None = None
+    ) -> Query | Select:
+        """
+        Orders ``query`` (a legacy Query or a ``select()``) by the key
+        and, with a cursor, skips past it.
+        """
+        if cursor is not None:
+            key = tuple_(*self.columns)
+            values = tuple_(*self.decode(cursor))
+            query = query.filter(
+                key < values if self.descending else key > values
+            )
+        return query.order_by(
+            *(
+                column.desc() if self.descending else column.asc()
+                for column in self.columns
+            )
+        )
+
+    def cursor_for(self, row) -> str:
+        """Cursor of the page that starts after ``row``."""
+        values = [_dump(getattr(row, column.key)) for column in self.columns]
+        payload = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> list:
+        try:
+            payload = base64.urlsafe_b64decode(
+                cursor + "=" * (-len(cursor) % 4)
+            )
+            values = json.loads(payload)
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise InvalidCursor("Invalid cursor") from e
+        if not isinstance(values, list) or len(values) != len(self.columns):
+            raise InvalidCursor("Invalid cursor")
+        try:
+            return [
+                _load(column, value)
+                for column, value in zip(self.columns, values)
+            ]
+        except (TypeError, ValueError) as e:
+            raise InvalidCursor("Invalid cursor") from e
+
+
+def _dump(value) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _load(column, value: str):
+    if not isinstance(value, str):
+        raise TypeError(f"{column.key}: expected a string")
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return python_type(value)
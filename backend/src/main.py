@@ -1,10 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi.errors import RateLimitExceeded
 from slowapi import _rate_limit_exceeded_handler
 
 from src.core.config import settings
+from src.core.lifespan import lifespan
 from src.core.limiter import limiter
+from src.core.metrics import TimingMiddleware
+from src.db.pagination import InvalidCursor
 
 from src.api.v1 import (
     router_animals,
@@ -15,12 +19,15 @@ from src.api.v1 import (
     router_roles,
     router_users,  # Mantendo a sua estrutura atual
     router_prediction,
+    router_health,
+    router_metrics,
 )
 
 app = FastAPI(
     title="LeishAI API",
     version="0.1.0",
     description="API for the LeishAI project",
+    lifespan=lifespan,
 )
 
 # Enable Limiter in the application
@@ -30,6 +37,14 @@ if not settings.TESTING:
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": str(exc)},
+    )
+
+
 origins = [
     "http://localhost",
     "http://localhost:3000",
@@ -42,7 +57,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the frontend read the per-stage durations and the next page
+    expose_headers=["Server-Timing", "Link", "X-Next-Cursor"],
 )
+app.add_middleware(TimingMiddleware)
 
 # Inclusion of Routers (mantendo a sua estrutura atual)
 app.include_router(router_auth.router)
@@ -53,6 +71,8 @@ app.include_router(router_owners.router)
 app.include_router(router_animals.router)
 app.include_router(router_assessments.router)
 app.include_router(router_prediction.router)
+app.include_router(router_health.router)
+app.include_router(router_metrics.router)
 
 
 @app.get("/", tags=["Root"])
@@ -0,0 +1,118 @@
+# src/ml/batcher.py
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Any, Callable, Sequence
+
+from src.core import metrics
+from src.core.config import settings
+from src.ml.prediction_service import prediction_service
+from src.ml.registry import ArtifactError
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Groups concurrent requests into a single vectorized call.
+
+    The first item submitted opens a window of ``max_wait_ms``; everything
+    that arrives before it closes (or until ``max_batch_size`` items are
+    waiting) is scored by one ``score_many`` call in a worker thread, and
+    each caller's future is resolved with its own result.
+    """
+
+    def __init__(
+        self,
+        score_many: Callable[[Sequence[Any]], list[Any]],
+        max_batch_size: int,
+        max_wait_ms: float,
+    ):
+        self.score_many = score_many
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.items = 0
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Strong references, so running batches are not garbage collected
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # State belongs to one event loop (one per worker in practice)
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        start = time.perf_counter()
+        try:
+            return await future
+        finally:
+            # Window wait plus the batched scoring, as seen by this caller
+            metrics.record("predict.microbatch", time.perf_counter() - start)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        # Fresh context: the batch is not part of whichever request
+        # happened to open the window (its Server-Timing, for instance)
+        task = asyncio.get_running_loop().create_task(
+            self._run(batch), context=contextvars.Context()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await asyncio.to_thread(
+                self.score_many, [item for item, _ in batch]
+            )
+        except (ArtifactError, ValueError) as e:
+            # Invalid input or unusable artifacts: every caller gets it
+            logger.warning("Batch of %d items failed: %s", len(batch), e)
+            self._fail(batch, e)
+            return
+        except Exception as e:
+            logger.exception("Unexpected error in a batch of %d", len(batch))
+            # Callers must not hang on a bug, but it is not swallowed
+            self._fail(batch, e)
+            raise
+
+        for (_, future), result in zip(batch, results):
+            # The caller may have gone away (client disconnect)
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(
+        batch: list[tuple[Any, asyncio.Future]], error: BaseException
+    ) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+
+# Singleton used by the /predict route when micro-batching is enabled
+prediction_batcher = MicroBatcher(
+    prediction_service.predict_many,
+    max_batch_size=settings.PREDICTION_MICROBATCH_MAX_SIZE,
+    max_wait_ms=settings.PREDICTION_MICROBATCH_MAX_WAIT_MS,
+)
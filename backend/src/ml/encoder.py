@@ -0,0 +1,117 @@
+# src/ml/encoder.py
+import threading
+import warnings
+from collections import Counter
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from src.schemas.prediction import PredictionInput
+
+
+def scale_encoded(scaler, encoded: np.ndarray) -> np.ndarray:
+    """
+    ``scaler.transform`` for a matrix built by ``OneHotEncoder``.
+
+    The scaler was fitted on a DataFrame, but inference feeds it a plain
+    NumPy matrix. The column order is checked at load time, so the
+    missing feature names warning is only noise here; it is silenced for
+    this call alone.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore",
+            message="X does not have valid feature names",
+            category=UserWarning,
+        )
+        return scaler.transform(encoded)
+
+
+class OneHotEncoder:
+    """
+    One-hot encoder compiled once from the training columns.
+
+    Each training column is named ``<field>_<category>`` (the layout
+    produced by ``pd.get_dummies``), so at load time every
+    ``(field, category)`` pair is mapped straight to its column index.
+    Encoding an input is then just a few dictionary lookups that set ones
+    in a preallocated NumPy row, with the same result as
+    ``get_dummies`` + ``reindex``.
+    """
+
+    def __init__(
+        self,
+        training_columns: Sequence[str],
+        fields: Iterable[str] = PredictionInput.model_fields,
+    ):
+        self.columns = list(training_columns)
+        self.fields = list(fields)
+        self.n_columns = len(self.columns)
+
+        # Longest field first, so a field that is a prefix of another one
+        # never steals its columns.
+        by_length = sorted(self.fields, key=len, reverse=True)
+        self.vocabulary: dict[str, dict[str, int]] = {
+            field: {} for field in self.fields
+        }
+        for index, column in enumerate(self.columns):
+            for field in by_length:
+                if column.startswith(f"{field}_"):
+                    category = column[len(field) + 1 :]
+                    self.vocabulary[field][category] = index
+                    break
+
+        # Metric: how many values did not match any training column,
+        # per field. These end up as an all-zero block for that field.
+        # Updated from the threadpool workers, so always under the lock.
+        self.unknown_categories: Counter[str] = Counter()
+        self._unknown_lock = threading.Lock()
+
+    def count_unknown(self, inputs: Iterable[PredictionInput]) -> None:
+        """
+        Adds the values of ``inputs`` that match no training column to
+        ``unknown_categories``. Encoding does not count them, so the
+        service calls this once per request, before the cache lookup.
+        """
+        unknown = [
+            field
+            for input_data in inputs
+            for field in self.fields
+            if (value := getattr(input_data, field)) is not None
+            and value not in self.vocabulary[field]
+        ]
+        if unknown:
+            self.record_unknown(*unknown)
+
+    def record_unknown(self, *fields: str) -> None:
+        with self._unknown_lock:
+            self.unknown_categories.update(fields)
+
+    def unknown_counts(self) -> dict[str, int]:
+        """Snapshot of ``unknown_categories``."""
+        with self._unknown_lock:
+            return dict(self.unknown_categories)
+
+    def active_indices(self, input_data: PredictionInput) -> list[int]:
+        """
+        Returns the column indices set to one for a single input.
+        Unknown values are skipped.
+        """
+        indices = []
+        for field in self.fields:
+            value = getattr(input_data, field)
+            if value is None:
+                continue
+            index = self.vocabulary[field].get(value)
+            if index is not None:
+                indices.append(index)
+        return indices
+
+    def encode(self, inputs: Sequence[PredictionInput]) -> np.ndarray:
+        """
+        Encodes the inputs into a ``(len(inputs), n_columns)`` matrix.
+        """
+        matrix = np.zeros((len(inputs), self.n_columns), dtype=np.float64)
+        for row, input_data in enumerate(inputs):
+            matrix[row, self.active_indices(input_data)] = 1.0
+        return matrix
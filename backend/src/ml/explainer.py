@@ -0,0 +1,67 @@
+# src/ml/explainer.py
+import numpy as np
+
+from src.ml.encoder import OneHotEncoder
+from src.ml.linear_scorer import scaler_moments
+from src.schemas.prediction import PredictionInput
+
+
+class LinearExplainer:
+    """
+    Exact per-field contributions to the logit of a StandardScaler +
+    binary LogisticRegression model.
+
+    On the scaled inputs the logit is ``b + sum_j(w_j * z_j)`` with
+    ``z_j = (x_j - mean_j) / scale_j``, so column ``j`` contributes
+    ``w_j * z_j`` (0 for a column at its training mean). For a one-hot
+    column that is one of two constants, depending on whether it is
+    active, so the contribution of every ``(field, category)`` pair is
+    computed once at load time and explaining an input is one lookup per
+    field. The contributions plus the intercept add up to the logit.
+    """
+
+    def __init__(self, encoder: OneHotEncoder, model, scaler):
+        coef = np.asarray(model.coef_[0], dtype=np.float64)
+        mean, scale = scaler_moments(scaler, coef.shape[0])
+        weights = coef / scale
+        # Contribution of each column when it is 0 (inactive)
+        inactive = -weights * mean
+
+        self.intercept = float(model.intercept_[0])
+        self.fields = encoder.fields
+        self.vocabulary = encoder.vocabulary
+        # Field with no active column (missing or unknown value)
+        self.baseline: dict[str, float] = {}
+        # Field with the given category active
+        self.contributions: dict[str, dict[str, float]] = {}
+        for field in self.fields:
+            columns = list(self.vocabulary[field].values())
+            baseline = float(inactive[columns].sum())
+            self.baseline[field] = baseline
+            self.contributions[field] = {
+                category: baseline + float(weights[index])
+                for category, index in self.vocabulary[field].items()
+            }
+
+    def explain(
+        self, input_data: PredictionInput, top_k: int | None = None
+    ) -> list[dict]:
+        """
+        Contributions of each field to the logit (positive pushes towards
+        "Positivo"), largest in absolute value first.
+        """
+        explanation = []
+        for field in self.fields:
+            value = getattr(input_data, field)
+            contribution = self.contributions[field].get(
+                value, self.baseline[field]
+            )
+            explanation.append({
+                "field": field,
+                "value": value,
+                "contribution": contribution,
+            })
+        explanation.sort(
+            key=lambda item: abs(item["contribution"]), reverse=True
+        )
+        return explanation[:top_k] if top_k is not None else explanation
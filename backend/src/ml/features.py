@@ -0,0 +1,46 @@
+# src/ml/features.py
+import enum
+
+from src.schemas.prediction import PredictionInput
+
+# Assessment columns that are model features (all but sex and breed,
+# which come from the animal)
+CLINICAL_FIELDS = tuple(
+    field
+    for field in PredictionInput.model_fields
+    if field not in ("animal_sex", "breed_name")
+)
+
+
+def _feature_value(value) -> str | None:
+    # Enum columns are stored by member name ("bom", "leves_moderadas"),
+    # which is also how they appear in the training columns.
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
+
+
+def prediction_input_from_assessment(assessment) -> PredictionInput:
+    """
+    Builds the model input from a stored Assessment and its animal, in
+    the same representation as the data the model was trained on.
+    """
+    animal = assessment.animal
+    breed = animal.breed if animal is not None else None
+    return prediction_input_from_row({
+        **{field: getattr(assessment, field) for field in CLINICAL_FIELDS},
+        "animal_sex": animal.sex if animal is not None else None,
+        "breed_name": breed.name if breed is not None else None,
+    })
+
+
+def prediction_input_from_row(row) -> PredictionInput:
+    """
+    Same as ``prediction_input_from_assessment`` for a plain mapping of
+    the clinical columns plus ``animal_sex`` and ``breed_name`` (e.g. a
+    row selected with those labels).
+    """
+    return PredictionInput(**{
+        field: _feature_value(row[field])
+        for field in PredictionInput.model_fields
+    })
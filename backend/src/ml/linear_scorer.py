@@ -0,0 +1,108 @@
+# src/ml/linear_scorer.py
+import math
+from typing import Sequence
+
+import numpy as np
+
+from src.ml.npz_model import NpzLogisticRegression, NpzStandardScaler
+
+
+class FusedLinearScorer:
+    """
+    StandardScaler + binary LogisticRegression folded into one linear model.
+
+    Scaling is linear, so at load time it can be pushed into the
+    coefficients::
+
+        w'_j = w_j / scale_j
+        b'   = b - sum_j(w_j * mean_j / scale_j)
+
+    For a one-hot row the logit is then ``b'`` plus the sum of ``w'`` over
+    the active column indices, and the probability is its sigmoid. No
+    scaler or sklearn call is needed at request time.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        # Python floats make the single-row path cheaper than NumPy scalars
+        self._weights_list = self.weights.tolist()
+
+    @staticmethod
+    def supports(model, scaler) -> bool:
+        """Checks whether the model/scaler pair can be fused."""
+        if isinstance(model, NpzLogisticRegression) and isinstance(
+            scaler, NpzStandardScaler
+        ):
+            return True
+
+        # Imported here so NumPy-only artifacts never pull in sklearn
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import StandardScaler
+
+        return (
+            isinstance(model, LogisticRegression)
+            and isinstance(scaler, StandardScaler)
+            and model.coef_.shape[0] == 1
+            and len(model.classes_) == 2
+        )
+
+    @classmethod
+    def from_sklearn(cls, model, scaler) -> "FusedLinearScorer":
+        """Folds the fitted scaler into the model coefficients."""
+        coef = model.coef_[0].astype(np.float64)
+        mean, scale = scaler_moments(scaler, coef.shape[0])
+        weights = coef / scale
+        bias = float(model.intercept_[0]) - float(np.dot(weights, mean))
+        return cls(weights, bias)
+
+    def score_indices(self, active_indices: Sequence[int]) -> float:
+        """
+        Positive-class probability for a single one-hot row, given only
+        the indices of its active columns.
+        """
+        weights = self._weights_list
+        logit = self.bias
+        for index in active_indices:
+            logit += weights[index]
+        return _sigmoid(logit)
+
+    @staticmethod
+    def probability(logit: float) -> float:
+        """Positive-class probability for a logit computed elsewhere."""
+        return _sigmoid(logit)
+
+    def predict_proba(self, encoded: np.ndarray) -> np.ndarray:
+        """
+        Same contract as ``LogisticRegression.predict_proba`` for an
+        already encoded (unscaled) matrix: one ``[neg, pos]`` row per
+        input.
+        """
+        logits = encoded @ self.weights + self.bias
+        # Same formula as scipy's expit; a huge negative logit overflows
+        # exp() to inf, which correctly gives a probability of 0.
+        with np.errstate(over="ignore"):
+            positive = 1.0 / (1.0 + np.exp(-logits))
+        return np.column_stack((1.0 - positive, positive))
+
+
+def scaler_moments(scaler, n_features: int) -> tuple[np.ndarray, np.ndarray]:
+    """Mean and scale the scaler actually applies (0/1 when disabled)."""
+    mean = (
+        scaler.mean_
+        if scaler.with_mean and scaler.mean_ is not None
+        else np.zeros(n_features)
+    )
+    scale = (
+        scaler.scale_
+        if scaler.with_std and scaler.scale_ is not None
+        else np.ones(n_features)
+    )
+    return mean, scale
+
+
+def _sigmoid(logit: float) -> float:
+    try:
+        return 1.0 / (1.0 + math.exp(-logit))
+    except OverflowError:
+        return 0.0
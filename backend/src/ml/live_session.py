@@ -0,0 +1,99 @@
+# src/ml/live_session.py
+from typing import Mapping
+
+import numpy as np
+
+from src.ml.encoder import scale_encoded
+from src.ml.linear_scorer import FusedLinearScorer
+from src.ml.registry import LoadedModel
+
+
+class LiveSession:
+    """
+    Prediction state of a form being filled in (one WebSocket
+    connection): the current value and active one-hot column of each
+    field and, for the fused linear model, the running logit.
+
+    A change of one field moves at most two columns, so the logit is
+    updated by subtracting the weight of the old column and adding the
+    weight of the new one, without encoding or scoring the whole form
+    again. Other models rescore the active columns on every change.
+
+    A session is bound to one ``LoadedModel``; after a model switch the
+    service starts a new one from the same values. Those values were
+    already counted as unknown (or not) when they were sent, so
+    replaying them does not count them again.
+    """
+
+    def __init__(
+        self,
+        loaded: LoadedModel,
+        values: Mapping[str, str | None] | None = None,
+    ):
+        self.loaded = loaded
+        encoder = loaded.encoder
+        self.values: dict[str, str | None] = dict.fromkeys(encoder.fields)
+        self.columns: dict[str, int | None] = dict.fromkeys(encoder.fields)
+
+        scorer = loaded.scorer
+        self._weights = None
+        if isinstance(scorer, FusedLinearScorer):
+            self._weights = scorer.weights.tolist()
+            self.logit = scorer.bias
+        if values:
+            self.update(values, record_unknown=False)
+
+    def update(
+        self,
+        changes: Mapping[str, str | None],
+        record_unknown: bool = True,
+    ) -> float:
+        """
+        Applies the changed fields and returns the new positive-class
+        probability. Raises ValueError for unknown fields and TypeError
+        for non-text values, before changing anything.
+        """
+        for field, value in changes.items():
+            if field not in self.values:
+                raise ValueError(f"Unknown field: {field}")
+            if value is not None and not isinstance(value, str):
+                raise TypeError(f"{field}: value must be a string or null")
+
+        encoder = self.loaded.encoder
+        weights = self._weights
+        for field, value in changes.items():
+            column = None
+            if value is not None:
+                column = encoder.vocabulary[field].get(value)
+                if column is None and record_unknown:
+                    encoder.record_unknown(field)
+
+            previous = self.columns[field]
+            if weights is not None and column != previous:
+                if previous is not None:
+                    self.logit -= weights[previous]
+                if column is not None:
+                    self.logit += weights[column]
+            self.values[field] = value
+            self.columns[field] = column
+        return self.probability()
+
+    def active_indices(self) -> list[int]:
+        """Active columns, in field order like ``encoder.active_indices``."""
+        return [
+            column for column in self.columns.values() if column is not None
+        ]
+
+    def probability(self) -> float:
+        """Positive-class probability of the current values."""
+        loaded = self.loaded
+        if self._weights is not None:
+            return loaded.scorer.probability(self.logit)
+        if loaded.scorer is not None:
+            return loaded.scorer.score_indices(self.active_indices())
+
+        encoded = np.zeros((1, loaded.encoder.n_columns))
+        encoded[0, self.active_indices()] = 1.0
+        if loaded.scaler is not None:
+            encoded = scale_encoded(loaded.scaler, encoded)
+        return float(loaded.model.predict_proba(encoded)[0, 1])
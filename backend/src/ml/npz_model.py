@@ -0,0 +1,170 @@
+# src/ml/npz_model.py
+import math
+import os
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+# Bumped whenever the set or meaning of the arrays below changes
+NPZ_FORMAT_VERSION = 1
+NPZ_ARRAYS = (
+    "format_version",
+    "model_version",
+    "columns",
+    "classes",
+    "coef",
+    "intercept",
+    "mean",
+    "scale",
+)
+
+
+class NpzStandardScaler:
+    """
+    The part of a fitted ``StandardScaler`` used at inference time.
+
+    ``transform`` repeats sklearn's operations (in-place subtraction of
+    the mean, then division by the scale) so the output is bit-identical.
+    """
+
+    with_mean = True
+    with_std = True
+
+    def __init__(
+        self, mean: np.ndarray, scale: np.ndarray, columns: Sequence[str]
+    ):
+        self.mean_ = mean
+        self.scale_ = scale
+        self.feature_names_in_ = np.asarray(columns, dtype=object)
+        self.n_features_in_ = mean.shape[0]
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Expected {self.n_features_in_} features, got {X.shape}"
+            )
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+
+class NpzLogisticRegression:
+    """
+    The part of a fitted binary ``LogisticRegression`` used at inference
+    time, with the same ``decision_function`` and ``predict_proba``.
+    """
+
+    def __init__(
+        self, coef: np.ndarray, intercept: np.ndarray, classes: np.ndarray
+    ):
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.classes_ = classes
+        self.n_features_in_ = coef.shape[1]
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        scores = X @ self.coef_.T + self.intercept_
+        return scores.reshape(-1)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        decision = self.decision_function(X)
+        # scipy's expit (used by sklearn) is 1 / (1 + exp(-x)) with the
+        # C library exp. NumPy's vectorized exp may differ from it in the
+        # last bit, so math.exp is used to stay bit-identical.
+        positive = np.fromiter(
+            (_expit(value) for value in decision.tolist()),
+            dtype=np.float64,
+            count=decision.shape[0],
+        )
+        return np.stack([1 - positive, positive], axis=1)
+
+
+def _expit(value: float) -> float:
+    try:
+        return 1.0 / (1.0 + math.exp(-value))
+    except OverflowError:
+        return 0.0
+
+
+def export_npz(
+    path: Path,
+    model,
+    scaler,
+    training_columns: Sequence[str],
+    model_version: str,
+) -> None:
+    """
+    Writes a fitted binary LogisticRegression + StandardScaler pair and
+    its column order into a single uncompressed ``.npz`` file, replaced
+    atomically so a worker never loads a partial export.
+    """
+    # Imported here: both modules import this one
+    from src.ml.linear_scorer import scaler_moments
+    from src.ml.registry import write_atomic
+
+    if model.coef_.shape[0] != 1 or len(model.classes_) != 2:
+        raise ValueError("Only binary linear models can be exported")
+    n_features = model.coef_.shape[1]
+    if len(training_columns) != n_features:
+        raise ValueError("Training columns do not match the coefficients")
+
+    # A scaler fitted without mean/std leaves the data as is, which is
+    # exactly what subtracting 0 and dividing by 1 do.
+    mean, scale = scaler_moments(scaler, n_features)
+
+    def write(temp_path: str) -> None:
+        # A file object, since np.savez appends .npz to a bare name
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                format_version=np.array(NPZ_FORMAT_VERSION),
+                model_version=np.array(model_version),
+                columns=np.array([str(c) for c in training_columns]),
+                classes=np.asarray(model.classes_),
+                coef=np.ascontiguousarray(model.coef_, dtype=np.float64),
+                intercept=np.asarray(model.intercept_, dtype=np.float64),
+                mean=np.asarray(mean, dtype=np.float64),
+                scale=np.asarray(scale, dtype=np.float64),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+
+    write_atomic(path, write)
+
+
+def load_npz(
+    path: Path,
+) -> tuple[NpzLogisticRegression, NpzStandardScaler, list[str]]:
+    """
+    Reads a file written by ``export_npz``. Only NumPy is needed: no
+    pickle, sklearn, scipy or pandas.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        missing = [name for name in NPZ_ARRAYS if name not in data.files]
+        if missing:
+            raise ValueError(f"{path.name} is missing {', '.join(missing)}")
+        format_version = int(data["format_version"])
+        if format_version != NPZ_FORMAT_VERSION:
+            raise ValueError(
+                f"{path.name} has format version {format_version}, "
+                f"expected {NPZ_FORMAT_VERSION}"
+            )
+        arrays = {name: data[name] for name in NPZ_ARRAYS}
+
+    columns = arrays["columns"].tolist()
+    model = NpzLogisticRegression(
+        arrays["coef"], arrays["intercept"], arrays["classes"]
+    )
+    scaler = NpzStandardScaler(arrays["mean"], arrays["scale"], columns)
+    if model.coef_.shape[0] != 1 or len(model.classes_) != 2:
+        raise ValueError(f"{path.name} is not a binary linear model")
+    if not (
+        model.n_features_in_
+        == scaler.n_features_in_
+        == arrays["scale"].shape[0]
+        == len(columns)
+    ):
+        raise ValueError(f"{path.name} arrays have inconsistent shapes")
+    return model, scaler, columns
@@ -1,59 +1,515 @@
 # src/ml/prediction_service.py
-import joblib
-import pandas as pd
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from src.core import metrics
+from src.core.config import settings
+from src.ml.cache import PredictionCache
+from src.ml.encoder import OneHotEncoder, scale_encoded
+from src.ml.linear_scorer import FusedLinearScorer
+from src.ml.live_session import LiveSession
+from src.ml.registry import MODEL_PATH, LoadedModel, ModelRegistry
+from src.ml.tree_scorer import TreeEnsembleScorer
 from src.schemas.prediction import PredictionInput
 
+logger = logging.getLogger(__name__)
+
 # --- LIMIAR DE DECISÃO ---
 # Esta é a linha que faltava e causou o NameError.
 # Estamos usando 0.5 como padrão para o novo modelo LR (V2).
-OPTIMAL_THRESHOLD = 0.5 
+OPTIMAL_THRESHOLD = 0.5
 # --- FIM ---
 
+
 class PredictionService:
-    def __init__(self):
+    def __init__(self, model_path: Path = MODEL_PATH):
+        """
+        Prepares the service. The artifacts are loaded by ``load()``,
+        called from the application lifespan, or lazily on first use.
+        """
+        self.registry = ModelRegistry(
+            model_path,
+            mmap_mode=settings.MODEL_MMAP_MODE,
+            tree_workers=settings.PREDICTION_TREE_WORKERS,
+        )
+        self._load_lock = threading.Lock()
+        self._last_check = 0.0
+        # Reloads run off the request path, one at a time
+        self._reload_lock = threading.Lock()
+        self._reload_executor: ThreadPoolExecutor | None = None
+        self._reload_future: Future | None = None
+        self.cache = PredictionCache(settings.PREDICTION_CACHE_SIZE)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.registry.active is not None
+
+    def load(self) -> LoadedModel:
+        """
+        Carrega a versão ativa do manifest (apenas uma vez).
+        """
+        with self._load_lock:
+            loaded = self.registry.active
+            if loaded is None:
+                loaded = self.registry.reload()
+                self._last_check = time.monotonic()
+            return loaded
+
+    def warm_up(self, inputs: Sequence[PredictionInput]) -> None:
+        """
+        Runs the given inputs through the single-row and batch paths, so
+        the first real request does not pay for cold code paths and the
+        cache already holds the common presentations.
+        """
+        self.load()
+        for input_data in inputs:
+            self.predict(input_data)
+        self.predict_many(inputs)
+
+    def _current(self) -> LoadedModel:
+        loaded = self.registry.active
+        if loaded is None:
+            loaded = self.load()
+        return loaded
+
+    @property
+    def model_version(self) -> str:
+        return self._current().version
+
+    @property
+    def model(self):
+        return self._current().model
+
+    @property
+    def scaler(self):
+        return self._current().scaler
+
+    @property
+    def training_columns(self) -> list[str]:
+        return self._current().training_columns
+
+    @property
+    def encoder(self) -> OneHotEncoder:
+        return self._current().encoder
+
+    @property
+    def scorer(self) -> FusedLinearScorer | TreeEnsembleScorer | None:
+        return self._current().scorer
+
+    def reload_if_changed(
+        self, force: bool = False, wait: bool = False
+    ) -> bool:
+        """
+        Reloads the artifacts when the manifest or the files in
+        ``ml_models`` changed. Checks are throttled by
+        PREDICTION_ARTIFACT_CHECK_SECONDS unless ``force`` is set.
+
+        The reload runs on a background thread and the current version
+        keeps serving until it is swapped in, so the request that
+        notices the change does not pay for loading the new artifacts.
+        With ``wait`` the call blocks until the reload finishes and
+        returns True when a different artifact set is now active.
+        """
+        if not self.is_loaded:
+            return False
+
+        now = time.monotonic()
+        if (
+            not force
+            and now - self._last_check
+            < settings.PREDICTION_ARTIFACT_CHECK_SECONDS
+        ):
+            return False
+        self._last_check = now
+
+        if not self.registry.has_changed():
+            return False
+        with self._reload_lock:
+            future = self._reload_future
+            if future is None or future.done():
+                if self._reload_executor is None:
+                    self._reload_executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="model-reload"
+                    )
+                future = self._reload_executor.submit(self._reload_quietly)
+                self._reload_future = future
+        return future.result() if wait else False
+
+    def _reload_quietly(self) -> bool:
+        try:
+            return self.reload()
+        except Exception:
+            # A half-copied file must not take the service down
+            logger.exception("Could not reload the model artifacts")
+            return False
+
+    def reload(self) -> bool:
+        """
+        Re-reads the manifest and switches to its active version.
+        Returns True when a different artifact set is now active.
         """
-        Carrega o modelo, o scaler e as colunas na inicialização.
+        previous = self.registry.active
+        return self._switched(previous, self.registry.reload())
+
+    def activate(self, version: str) -> bool:
         """
-        # 1. O caminho agora aponta para 'ml_models' (para bater com seu comando cp)
-        model_path = Path(__file__).parent.parent.parent / "ml_models" 
-        
-        # 2. Carrega os 3 novos artefatos da V2
-        self.model = joblib.load(model_path / "leish_model_v2.joblib")
-        self.scaler = joblib.load(model_path / "data_scaler_v2.joblib") 
-        self.training_columns = joblib.load(model_path / "training_columns_v2.joblib")
+        Switches to another version listed in the manifest and persists
+        it as the active one (``ml_models/active.json``).
+        """
+        previous = self.registry.active
+        return self._switched(previous, self.registry.activate(version))
+
+    def _switched(
+        self, previous: LoadedModel | None, loaded: LoadedModel
+    ) -> bool:
+        if previous is not None and previous.checksum == loaded.checksum:
+            return False
+        # Keys carry the checksum, so old entries are only dead weight
+        self.cache.clear()
+        return True
 
-    def predict(self, input_data: PredictionInput) -> dict:
+    def predict(
+        self, input_data: PredictionInput, explain: bool = False
+    ) -> dict:
         """
         Prevê o diagnóstico usando o modelo LR + Scaler.
+        With ``explain`` the result also lists the fields that
+        contributed most to the prediction.
+        """
+        self.reload_if_changed()
+        loaded = self._current()
+        self._check_explainable(loaded, explain)
+        loaded.encoder.count_unknown([input_data])
+
+        start = time.perf_counter()
+        key = (loaded.checksum, self._canonical_key(loaded, input_data))
+        cached = self.cache.get(key)
+        metrics.record("predict.cache_lookup", time.perf_counter() - start)
+        if cached is not None:
+            return self._with_explanation(
+                loaded, input_data, dict(cached), explain
+            )
+
+        if loaded.scorer is None:
+            result = self._predict_many(loaded, [input_data])[0]
+        else:
+            # Fast path: only the active one-hot columns move the logit
+            start = time.perf_counter()
+            active_indices = loaded.encoder.active_indices(input_data)
+            encoded = time.perf_counter()
+            prob_positivo = loaded.scorer.score_indices(active_indices)
+            scored = time.perf_counter()
+            metrics.record("predict.encode", encoded - start)
+            metrics.record("predict.fused_score", scored - encoded)
+
+            result = self._decide(1.0 - prob_positivo, prob_positivo)
+            result["model_version"] = loaded.version
+
+        self.cache.put(key, result)
+        return self._with_explanation(
+            loaded, input_data, dict(result), explain
+        )
+
+    def predict_many(
+        self, inputs: Sequence[PredictionInput], explain: bool = False
+    ) -> list[dict]:
+        """
+        Scores several inputs at once, returning one result per input in
+        the same order. Inputs already in the cache are answered from it;
+        the rest are encoded into a single matrix so the scaler and the
+        model are called only once, and then cached.
+        """
+        self.reload_if_changed()
+        loaded = self._current()
+        self._check_explainable(loaded, explain)
+        loaded.encoder.count_unknown(inputs)
+        results = self._predict_cached(loaded, inputs)
+        return [
+            self._with_explanation(loaded, input_data, result, explain)
+            for input_data, result in zip(inputs, results)
+        ]
+
+    def _predict_cached(
+        self, loaded: LoadedModel, inputs: Sequence[PredictionInput]
+    ) -> list[dict]:
+        start = time.perf_counter()
+        keys = [
+            (loaded.checksum, self._canonical_key(loaded, input_data))
+            for input_data in inputs
+        ]
+        results = [self.cache.get(key) for key in keys]
+        metrics.record("predict.cache_lookup", time.perf_counter() - start)
+
+        missing = [
+            index for index, result in enumerate(results) if result is None
+        ]
+        scored = self._predict_many(loaded, [inputs[i] for i in missing])
+        for index, result in zip(missing, scored):
+            self.cache.put(keys[index], result)
+            results[index] = result
+        return [dict(result) for result in results]
+
+    @staticmethod
+    def _check_explainable(loaded: LoadedModel, explain: bool) -> None:
+        if explain and loaded.explainer is None:
+            raise ValueError(
+                f"Model version {loaded.version} does not support explanations"
+            )
+
+    @staticmethod
+    def _with_explanation(
+        loaded: LoadedModel,
+        input_data: PredictionInput,
+        result: dict,
+        explain: bool,
+    ) -> dict:
+        # One lookup per field, so it is not worth keeping in the cache
+        if explain:
+            with metrics.timed("predict.explain"):
+                result["explanation"] = loaded.explainer.explain(
+                    input_data, top_k=settings.PREDICTION_EXPLAIN_TOP_K
+                )
+        return result
+
+    def predict_proba_sklearn(self, encoded: np.ndarray) -> np.ndarray:
+        """
+        Reference path: scales the encoded matrix and calls the model.
+        """
+        loaded = self._current()
+        if loaded.model is None:
+            raise ValueError(
+                f"Model version {loaded.version} is served from its "
+                "compiled tree arrays only"
+            )
+        if loaded.scaler is not None:
+            encoded = scale_encoded(loaded.scaler, encoded)
+        return loaded.model.predict_proba(encoded)
+
+    def _predict_many(
+        self, loaded: LoadedModel, inputs: Sequence[PredictionInput]
+    ) -> list[dict]:
+        if not inputs:
+            return []
+
+        # 1. One-hot encode direto na matriz alinhada às colunas de treino
+        with metrics.timed("predict.encode"):
+            encoded = loaded.encoder.encode(inputs)
+
+        # 2. Obter as probabilidades de todas as linhas de uma só vez
+        probabilities = self._score_encoded(loaded, encoded)
+
+        results = []
+        for neg, pos in probabilities:
+            result = self._decide(neg, pos)
+            result["model_version"] = loaded.version
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _score_encoded(loaded: LoadedModel, encoded: np.ndarray) -> np.ndarray:
+        """``[neg, pos]`` probabilities of every row of an encoded matrix."""
+        if loaded.scorer is not None:
+            with metrics.timed("predict.fused_score"):
+                return loaded.scorer.predict_proba(encoded)
+        if loaded.scaler is not None:
+            with metrics.timed("predict.scaler_transform"):
+                encoded = scale_encoded(loaded.scaler, encoded)
+        with metrics.timed("predict.predict_proba"):
+            return loaded.model.predict_proba(encoded)
+
+    def what_if(
+        self,
+        input_data: PredictionInput,
+        fields: Sequence[str] | None = None,
+    ) -> dict:
         """
-        # 1. Converte os dados brutos (JSON) para um DataFrame
-        input_df = pd.DataFrame([input_data.model_dump()])
+        Scores every one-field counterfactual of ``input_data``: for each
+        field in ``fields`` (all by default), each category the model
+        knows plus the field left empty. All the rows go through a single
+        model call.
+        """
+        self.reload_if_changed()
+        loaded = self._current()
+        encoder = loaded.encoder
+        encoder.count_unknown([input_data])
+        fields = list(
+            dict.fromkeys(encoder.fields if fields is None else fields)
+        )
+        unknown = [field for field in fields if field not in encoder.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        base, by_field = self._sweep(loaded, input_data, fields)
+        return {
+            "model_version": loaded.version,
+            "prediction": self._decide(1.0 - base, base)["prediction"],
+            "probability": base,
+            "fields": [
+                {
+                    "field": field,
+                    "alternatives": [
+                        {
+                            "value": value,
+                            "probability": probability,
+                            "prediction": self._decide(
+                                1.0 - probability, probability
+                            )["prediction"],
+                            "current": getattr(input_data, field) == value,
+                        }
+                        for value, probability in by_field[field]
+                    ],
+                }
+                for field in fields
+            ],
+        }
+
+    def next_questions(
+        self, input_data: PredictionInput, top_k: int | None = None
+    ) -> dict:
+        """
+        Ranks the unanswered fields of a partial input by how much their
+        answer is expected to move the positive-class probability.
+
+        Each possible answer is weighted by how often that category
+        appeared in training; the remaining mass (answers the model has
+        no column for) leaves the probability unchanged. All completions
+        are scored in a single model call.
+        """
+        self.reload_if_changed()
+        loaded = self._current()
+        loaded.encoder.count_unknown([input_data])
+        unanswered = [
+            field
+            for field in loaded.encoder.fields
+            if getattr(input_data, field) is None
+        ]
+        base, by_field = self._sweep(loaded, input_data, unanswered)
+        base_positive = base > OPTIMAL_THRESHOLD
+
+        questions = []
+        for field in unanswered:
+            frequencies = loaded.category_frequencies[field]
+            changes = {
+                value: abs(probability - base)
+                for value, probability in by_field[field]
+                if value is not None
+            }
+            flips = any(
+                (probability > OPTIMAL_THRESHOLD) != base_positive
+                for _, probability in by_field[field]
+            )
+            questions.append({
+                "field": field,
+                "expected_change": sum(
+                    frequencies[value] * change
+                    for value, change in changes.items()
+                ),
+                "max_change": max(changes.values(), default=0.0),
+                "could_change_prediction": flips,
+            })
+        questions.sort(key=lambda q: q["expected_change"], reverse=True)
+
+        return {
+            "model_version": loaded.version,
+            "prediction": self._decide(1.0 - base, base)["prediction"],
+            "probability": base,
+            "questions": (
+                questions[:top_k] if top_k is not None else questions
+            ),
+        }
+
+    def _sweep(
+        self,
+        loaded: LoadedModel,
+        input_data: PredictionInput,
+        fields: Sequence[str],
+    ) -> tuple[float, dict[str, list[tuple[str | None, float]]]]:
+        """
+        Positive-class probability of the input and of every one-field
+        alternative (each known category, then the field left empty),
+        computed with a single model call.
+        """
+        encoder = loaded.encoder
+        with metrics.timed("predict.encode"):
+            base = encoder.encode([input_data])
+            n_rows = 1 + sum(
+                len(encoder.vocabulary[field]) + 1 for field in fields
+            )
+            # Row 0 is the input as given; then, per field, one row per
+            # category followed by a row with the field left empty
+            encoded = np.repeat(base, n_rows, axis=0)
+            alternatives: list[tuple[str, str | None]] = []
+            row = 1
+            for field in fields:
+                categories = list(encoder.vocabulary[field])
+                columns = list(encoder.vocabulary[field].values())
+                block = encoded[row : row + len(columns) + 1]
+                block[:, columns] = 0.0
+                block[np.arange(len(columns)), columns] = 1.0
+                alternatives.extend((field, value) for value in categories)
+                alternatives.append((field, None))
+                row += len(columns) + 1
+
+        positive = self._score_encoded(loaded, encoded)[:, 1].tolist()
+        by_field: dict[str, list] = {field: [] for field in fields}
+        for (field, value), probability in zip(alternatives, positive[1:]):
+            by_field[field].append((value, probability))
+        return positive[0], by_field
 
-        # 2. One-Hot Encode o DataFrame (CORRIGIDO: drop_first=False)
-        input_encoded = pd.get_dummies(input_df, drop_first=False)
+    def start_live_session(self) -> LiveSession:
+        """Empty live session bound to the active model version."""
+        return LiveSession(self._current())
 
-        # 3. Alinha as colunas com os dados de treino
-        final_df = input_encoded.reindex(columns=self.training_columns, fill_value=0)
+    def update_live_session(
+        self, session: LiveSession, changes: dict[str, str | None]
+    ) -> tuple[LiveSession, dict]:
+        """
+        Applies the changed fields to a live session and returns it with
+        the new prediction. After a model switch the values are carried
+        over to a new session on the active version.
+        """
+        self.reload_if_changed()
+        loaded = self._current()
+        if session.loaded is not loaded:
+            session = LiveSession(loaded, session.values)
 
-        # 4. [NOVO PASSO CRÍTICO] Escala os dados
-        final_df_scaled = self.scaler.transform(final_df)
+        with metrics.timed("predict.live_update"):
+            probability = session.update(changes)
+        result = self._decide(1.0 - probability, probability)
+        result["probability"] = probability
+        result["model_version"] = loaded.version
+        return session, result
 
-        # 5. Obter as probabilidades (usando os dados escalados)
-        probabilities = self.model.predict_proba(final_df_scaled)[0]
-        prob_negativo = probabilities[0]
-        prob_positivo = probabilities[1]
-        
-        # 6. Aplicar o limiar (ex: 0.5)
-        # Esta linha agora funcionará, pois OPTIMAL_THRESHOLD está definido
+    @staticmethod
+    def _canonical_key(
+        loaded: LoadedModel, input_data: PredictionInput
+    ) -> tuple:
+        """Field values in the encoder's fixed field order."""
+        return tuple(
+            getattr(input_data, field) for field in loaded.encoder.fields
+        )
+
+    @staticmethod
+    def _decide(prob_negativo: float, prob_positivo: float) -> dict:
+        """
+        Applies the decision threshold (ex: 0.5) to one row of
+        probabilities.
+        """
         if prob_positivo > OPTIMAL_THRESHOLD:
             prediction_label = "Positivo"
             confidence = float(prob_positivo)
         else:
             prediction_label = "Negativo"
-            confidence = float(prob_negativo) 
+            confidence = float(prob_negativo)
 
         return {"prediction": prediction_label, "confidence": confidence}
 
+
 # Singleton instance of the service
-prediction_service = PredictionService()
\ No newline at end of file
+prediction_service = PredictionService()
@@ -0,0 +1,492 @@
+# src/ml/registry.py
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import joblib
+
+from src.ml.encoder import OneHotEncoder
+from src.ml.explainer import LinearExplainer
+from src.ml.linear_scorer import FusedLinearScorer
+from src.ml.npz_model import load_npz
+from src.ml.tree_scorer import TreeEnsembleScorer
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = Path(__file__).parent.parent.parent / "ml_models"
+MANIFEST_FILE = "manifest.json"
+# Version chosen at runtime; not tracked, the manifest ships read-only
+ACTIVE_FILE = "active.json"
+
+# Artifact set used when ml_models has no manifest (original layout)
+LEGACY_VERSION = "v2"
+LEGACY_FILES = {
+    "model": "leish_model_v2.joblib",
+    "scaler": "data_scaler_v2.joblib",
+    "training_columns": "training_columns_v2.joblib",
+}
+LEGACY_ROLES = ("model", "scaler", "training_columns")
+# Tree models can be trained on the raw one-hot columns
+OPTIONAL_ROLES = ("scaler",)
+
+
+class ArtifactError(Exception):
+    """Raised when an artifact set is missing, unknown or corrupted."""
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """
+    Everything needed to score one version of the artifacts. It is
+    replaced as a whole, so a request never mixes two versions.
+    """
+
+    version: str
+    checksum: str
+    # None for tree ensembles scored from their saved compiled arrays
+    model: Any
+    scaler: Any
+    training_columns: list[str]
+    encoder: OneHotEncoder
+    scorer: FusedLinearScorer | TreeEnsembleScorer | None
+    explainer: LinearExplainer | None = None
+    # Training frequency of each category, per field
+    category_frequencies: dict[str, dict[str, float]] | None = None
+
+
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def write_atomic(path: Path, write: Callable[[str], None]) -> None:
+    """
+    Writes ``path`` through ``write(temp_path)`` and a rename, so readers
+    (the other workers included) see either the old file or the new
+    one, never a partial write.
+    """
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, temp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        write(temp_path)
+        # mkstemp creates the file as 0600
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Writes ``data`` as indented JSON through ``write_atomic``."""
+
+    def write(temp_path: str) -> None:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    write_atomic(path, write)
+
+
+def category_frequencies(
+    encoder: OneHotEncoder, scaler
+) -> dict[str, dict[str, float]]:
+    """
+    Fraction of the training rows with each category, per field. The
+    mean a StandardScaler learned for a one-hot column is exactly that
+    fraction; without one, the categories of a field are taken as
+    equally likely.
+    """
+    means = getattr(scaler, "mean_", None)
+    frequencies = {}
+    for field in encoder.fields:
+        columns = encoder.vocabulary[field]
+        frequencies[field] = {
+            category: (
+                float(means[index])
+                if means is not None
+                else 1.0 / (len(columns) + 1)
+            )
+            for category, index in columns.items()
+        }
+    return frequencies
+
+
+def load_artifacts(
+    model_path: Path,
+    files: dict[str, str],
+    version: str,
+    checksums: dict[str, str] | None = None,
+    mmap_mode: str | None = None,
+    tree_workers: int = 1,
+) -> LoadedModel:
+    """
+    Carrega o modelo, o scaler e as colunas, verifica os checksums do
+    manifest e prepara o encoder e o scorer.
+
+    ``files`` either names the three joblib artifacts or a single
+    NumPy-only ``npz`` file (see ``src.ml.npz_model``), which loads
+    without sklearn, scipy or pandas.
+
+    With ``mmap_mode="r"`` the arrays inside the (uncompressed) joblib
+    files are memory-mapped read-only instead of copied into the process.
+    It does not apply to ``.npz`` files, whose arrays are always read.
+
+    The scaler is optional for tree ensembles, which are compiled into
+    flat node arrays (see ``src.ml.tree_scorer``); ``tree_workers``
+    threads then score their members in parallel. With ``mmap_mode`` the
+    compiled arrays are saved next to the model on the first load and
+    memory-mapped from there, and the sklearn ensemble is not kept (nor
+    unpickled, once the arrays exist): sklearn copies the nodes of its
+    ``Tree`` objects when unpickling, so it cannot be shared.
+    """
+    roles = ("npz",) if "npz" in files else LEGACY_ROLES
+
+    # 1. Verifica a integridade dos arquivos
+    digest = hashlib.sha256()
+    for role in roles:
+        if role not in files:
+            if role in OPTIONAL_ROLES:
+                continue
+            raise ArtifactError(f"Manifest does not name the {role} file")
+        path = model_path / files[role]
+        if not path.is_file():
+            raise ArtifactError(f"Missing artifact file: {path.name}")
+        file_digest = file_sha256(path)
+        expected = (checksums or {}).get(role)
+        if expected is not None and expected != file_digest:
+            raise ArtifactError(f"Checksum mismatch for {path.name}")
+        digest.update(file_digest.encode())
+    checksum = digest.hexdigest()[:12]
+
+    # 2. Carrega os artefatos (3 arquivos joblib ou um único .npz)
+    if "npz" in files:
+        try:
+            model, scaler, training_columns = load_npz(
+                model_path / files["npz"]
+            )
+        except ValueError as e:
+            raise ArtifactError(str(e)) from e
+    else:
+        model_file = model_path / files["model"]
+        trees_path = tree_arrays_path(model_file, checksum)
+        model = None
+        if mmap_mode is None or not trees_path.is_file():
+            model = joblib.load(model_file, mmap_mode=mmap_mode)
+            if (
+                mmap_mode is not None
+                and TreeEnsembleScorer.supports(model)
+                and save_tree_arrays(trees_path, model)
+            ):
+                model = None
+        scaler = (
+            joblib.load(model_path / files["scaler"], mmap_mode=mmap_mode)
+            if "scaler" in files
+            else None
+        )
+        training_columns = list(
+            joblib.load(model_path / files["training_columns"])
+        )
+
+    scaler_columns = getattr(scaler, "feature_names_in_", None)
+    if scaler_columns is not None and (
+        list(scaler_columns) != training_columns
+    ):
+        raise ArtifactError(
+            "Scaler feature names do not match the training columns"
+        )
+
+    # 3. Compila o encoder one-hot uma única vez
+    encoder = OneHotEncoder(training_columns)
+
+    # 4. Para o LR + StandardScaler, funde o scaler nos coeficientes.
+    # As contribuições por campo também são pré-calculadas aqui.
+    # Ensembles de árvores são compilados em arrays de nós.
+    # Outros modelos continuam usando scaler.transform + predict_proba.
+    scorer = None
+    explainer = None
+    if model is None:
+        scorer = TreeEnsembleScorer.from_arrays(
+            joblib.load(trees_path, mmap_mode=mmap_mode),
+            scaler,
+            workers=tree_workers,
+        )
+    elif FusedLinearScorer.supports(model, scaler):
+        scorer = FusedLinearScorer.from_sklearn(model, scaler)
+        explainer = LinearExplainer(encoder, model, scaler)
+    elif TreeEnsembleScorer.supports(model):
+        scorer = TreeEnsembleScorer.from_sklearn(
+            model, scaler, workers=tree_workers
+        )
+
+    return LoadedModel(
+        version=version,
+        checksum=checksum,
+        model=model,
+        scaler=scaler,
+        training_columns=training_columns,
+        encoder=encoder,
+        scorer=scorer,
+        explainer=explainer,
+        category_frequencies=category_frequencies(encoder, scaler),
+    )
+
+
+def tree_arrays_path(model_file: Path, checksum: str) -> Path:
+    """Where the compiled arrays of a tree ensemble model are saved."""
+    return model_file.with_name(f"{model_file.stem}.{checksum}.trees.joblib")
+
+
+def save_tree_arrays(path: Path, model) -> bool:
+    """
+    Compiles a tree ensemble and saves its arrays for memory-mapping.
+    Returns False when they could not be written (read-only directory).
+    """
+    arrays = TreeEnsembleScorer.from_sklearn(model).to_arrays()
+    try:
+        write_atomic(path, lambda temp_path: joblib.dump(arrays, temp_path))
+    except OSError:
+        logger.warning(
+            "Could not save %s, the tree arrays are not shared",
+            path.name,
+            exc_info=True,
+        )
+        return False
+    return True
+
+
+class ModelRegistry:
+    """
+    Versioned artifact sets described by ``ml_models/manifest.json``::
+
+        {
+          "active": "v2",
+          "versions": {
+            "v2": {
+              "files": {"model": "...", "scaler": "...",
+                        "training_columns": "..."},
+              "sha256": {"model": "...", "scaler": "...",
+                         "training_columns": "..."}
+            },
+            "v2-npz": {
+              "files": {"npz": "..."},
+              "sha256": {"npz": "..."}
+            }
+          }
+        }
+
+    The manifest is shipped with the code and only read at runtime; a
+    version chosen through ``activate()`` is kept in ``ml_models/
+    active.json`` (not tracked) and takes precedence over the manifest's
+    ``active`` while it is still listed.
+
+    Loading and checksum verification happen outside the request path;
+    switching versions is a single reference assignment, so in-flight
+    predictions keep the object they already hold and are never blocked.
+    """
+
+    def __init__(
+        self,
+        model_path: Path = MODEL_PATH,
+        mmap_mode: str | None = None,
+        tree_workers: int = 1,
+    ):
+        self.model_path = model_path
+        self.mmap_mode = mmap_mode
+        self.tree_workers = tree_workers
+        self._models: dict[str, LoadedModel] = {}
+        self._active: LoadedModel | None = None
+        self._stamps: tuple | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> LoadedModel | None:
+        return self._active
+
+    def read_manifest(self, resolve_active: bool = True) -> dict:
+        """
+        The manifest, with ``active`` resolved from ``active.json`` when
+        that file names a listed version. Scripts that write the manifest
+        back read it with ``resolve_active=False``, so the runtime choice
+        is not baked into the shipped file.
+        """
+        manifest_path = self.model_path / MANIFEST_FILE
+        if not manifest_path.is_file():
+            manifest = {
+                "active": LEGACY_VERSION,
+                "versions": {LEGACY_VERSION: {"files": LEGACY_FILES}},
+            }
+        else:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("active") not in manifest.get("versions", {}):
+                raise ArtifactError(
+                    "Manifest 'active' is not a listed version"
+                )
+
+        chosen = self.read_active() if resolve_active else None
+        if chosen is not None:
+            if chosen in manifest["versions"]:
+                manifest["active"] = chosen
+            else:
+                logger.warning(
+                    "Ignoring %s: version %s is no longer in the manifest",
+                    ACTIVE_FILE,
+                    chosen,
+                )
+        return manifest
+
+    def read_active(self) -> str | None:
+        """Version persisted by ``activate()``, if any."""
+        try:
+            with open(self.model_path / ACTIVE_FILE, encoding="utf-8") as f:
+                return json.load(f).get("active")
+        except FileNotFoundError:
+            return None
+
+    def write_manifest(self, manifest: dict) -> None:
+        """
+        Atomically replaces the manifest: readers (the other workers
+        included) see either the old file or the new one, never a
+        partial write. Meant for the release scripts; the API never
+        rewrites the manifest.
+        """
+        write_json_atomic(self.model_path / MANIFEST_FILE, manifest)
+
+    def write_active(self, version: str) -> None:
+        """Atomically persists ``version`` as the active one."""
+        write_json_atomic(self.model_path / ACTIVE_FILE, {"active": version})
+
+    def versions(self) -> list[dict]:
+        """Versions listed in the manifest and whether they are loaded."""
+        manifest = self.read_manifest()
+        active = self._active
+        return [
+            {
+                "version": version,
+                "loaded": version in self._models,
+                "active": active is not None and active.version == version,
+            }
+            for version in manifest["versions"]
+        ]
+
+    def _stamp(self) -> tuple:
+        """
+        Cheap fingerprint (mtime and size) of the manifest, the active
+        version pointer and the files.
+        """
+        paths = [
+            self.model_path / MANIFEST_FILE,
+            self.model_path / ACTIVE_FILE,
+        ]
+        try:
+            manifest = self.read_manifest()
+        except (ArtifactError, ValueError):
+            manifest = {"versions": {}}
+        for entry in manifest["versions"].values():
+            paths.extend(self.model_path / f for f in entry["files"].values())
+
+        stamps = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                stamps.append((path.name, None, None))
+                continue
+            stamps.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    def has_changed(self) -> bool:
+        return self._stamp() != self._stamps
+
+    def _load_version(self, manifest: dict, version: str) -> LoadedModel:
+        entry = manifest["versions"].get(version)
+        if entry is None:
+            raise ArtifactError(f"Unknown model version: {version}")
+        return load_artifacts(
+            self.model_path,
+            entry["files"],
+            version=version,
+            checksums=entry.get("sha256"),
+            mmap_mode=self.mmap_mode,
+            tree_workers=self.tree_workers,
+        )
+
+    def reload(self) -> LoadedModel:
+        """
+        Re-reads the manifest, (re)loads the active version and switches
+        to it. Versions whose files did not change are reused.
+        """
+        with self._lock:
+            stamps = self._stamp()
+            manifest = self.read_manifest()
+            version = manifest["active"]
+            loaded = self._load_version(manifest, version)
+
+            previous = self._models.get(version)
+            if previous is not None and previous.checksum == loaded.checksum:
+                loaded = previous
+
+            # Forget versions that are no longer listed
+            models = {
+                name: model
+                for name, model in self._models.items()
+                if name in manifest["versions"]
+            }
+            models[version] = loaded
+            self._models = models
+            self._active = loaded
+            self._stamps = stamps
+            logger.info(
+                "Serving model version %s (%s)",
+                loaded.version,
+                loaded.checksum,
+            )
+            return loaded
+
+    def get(self, version: str) -> LoadedModel:
+        """
+        Loads and verifies a version listed in the manifest without
+        switching to it.
+        """
+        with self._lock:
+            return self._get(self.read_manifest(), version)
+
+    def _get(self, manifest: dict, version: str) -> LoadedModel:
+        loaded = self._models.get(version)
+        if loaded is None:
+            loaded = self._load_version(manifest, version)
+            self._models = {**self._models, version: loaded}
+        return loaded
+
+    def activate(self, version: str) -> LoadedModel:
+        """
+        Switches to another version listed in the manifest, loading and
+        verifying it first if needed.
+
+        The choice is persisted in ``active.json``, so a later
+        ``reload()`` keeps it and the other workers switch too when their
+        stamp check sees the new file.
+        """
+        with self._lock:
+            manifest = self.read_manifest()
+            loaded = self._get(manifest, version)
+            if manifest["active"] != version:
+                self.write_active(version)
+            self._active = loaded
+            self._stamps = self._stamp()
+            logger.info("Switched to model version %s", version)
+            return loaded
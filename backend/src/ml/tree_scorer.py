@@ -0,0 +1,400 @@
+# src/ml/tree_scorer.py
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+import numpy as np
+
+from src.ml.encoder import scale_encoded
+
+# Ways the trees of one ensemble member are combined
+MEMBER_MEAN = 0  # average of the tree probabilities (trees, forests)
+MEMBER_SAMME = 1  # AdaBoost (SAMME) weighted vote, then softmax
+# Approximate size of the per-block (rows x trees) node index arrays
+BLOCK_NODES = 1 << 18
+# Compiled arrays, as returned by to_arrays() (plus depth and n_features)
+ARRAY_NAMES = (
+    "feature",
+    "threshold",
+    "left",
+    "right",
+    "value",
+    "roots",
+    "member_starts",
+    "member_kinds",
+    "member_scales",
+)
+
+# Thread pools shared by every scorer (one per thread count), so that
+# replacing the model on reload() or activate() leaves no pool behind
+_executors: dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _shared_executor(workers: int) -> ThreadPoolExecutor | None:
+    if workers <= 1:
+        return None
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = _executors[workers] = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="tree-scorer"
+            )
+        return executor
+
+
+class TreeEnsembleScorer:
+    """
+    Tree ensembles compiled into flat NumPy node arrays.
+
+    Every tree of every member is appended to the same ``feature``,
+    ``threshold``, ``left``, ``right`` and ``value`` arrays (leaves point
+    to themselves), so a batch is scored by walking all the trees at
+    once: one gather per depth level over a ``(rows, trees)`` matrix of
+    node indices, instead of one Python call per tree and per member.
+
+    Supported models (binary or multiclass, single output):
+
+    * ``DecisionTreeClassifier`` / ``ExtraTreeClassifier``
+    * ``RandomForestClassifier`` / ``ExtraTreesClassifier`` and imblearn's
+      ``BalancedRandomForestClassifier``
+    * ``AdaBoostClassifier`` of trees (SAMME)
+    * ``BaggingClassifier`` of any of the above, including imblearn's
+      ``EasyEnsembleClassifier`` and ``BalancedBaggingClassifier``, whose
+      members are pipelines of a sampler and a classifier
+
+    The inputs are compared as float32 against the float64 thresholds and
+    the leaves are summed in tree order, like sklearn does, so the
+    probabilities are identical to the model's own ``predict_proba``.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        member_starts: np.ndarray,
+        member_kinds: np.ndarray,
+        member_scales: np.ndarray,
+        depth: int,
+        n_features: int,
+        scaler=None,
+        workers: int = 1,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        # Index of the first tree of each member (trees are grouped)
+        self.member_starts = member_starts
+        self.member_kinds = member_kinds
+        # Number of trees (mean) or sum of the estimator weights (SAMME)
+        self.member_scales = member_scales
+        self.depth = depth
+        self.n_features = n_features
+        self.n_classes = value.shape[1]
+        self.scaler = scaler
+        self.workers = workers
+        self._executor = _shared_executor(workers)
+
+    @staticmethod
+    def supports(model) -> bool:
+        """Checks whether the model can be compiled."""
+        try:
+            _members(model)
+        except TypeError:
+            return False
+        return True
+
+    @classmethod
+    def from_sklearn(
+        cls, model, scaler=None, workers: int = 1
+    ) -> "TreeEnsembleScorer":
+        """
+        Compiles a fitted ensemble. ``scaler`` (optional) is applied to
+        the encoded rows first, as in the reference path.
+        """
+        members = _members(model)
+        n_classes = len(model.classes_)
+
+        feature, threshold, left, right, value = [], [], [], [], []
+        roots, member_starts, member_kinds, member_scales = [], [], [], []
+        offset, n_trees, depth = 0, 0, 0
+        for kind, scale, trees in members:
+            member_starts.append(n_trees)
+            member_kinds.append(kind)
+            member_scales.append(scale)
+            for tree, features, weight in trees:
+                node_value = _leaf_values(tree, kind, weight, n_classes)
+                n_nodes = tree.node_count
+                is_leaf = tree.children_left == -1
+                nodes = np.arange(offset, offset + n_nodes)
+
+                # Folhas apontam para si mesmas: a descida pode seguir
+                # até a profundidade máxima sem testar se já terminou
+                feature.append(
+                    np.where(is_leaf, 0, features[np.maximum(tree.feature, 0)])
+                )
+                threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+                left.append(
+                    np.where(is_leaf, nodes, tree.children_left + offset)
+                )
+                right.append(
+                    np.where(is_leaf, nodes, tree.children_right + offset)
+                )
+                value.append(node_value)
+                roots.append(offset)
+
+                offset += n_nodes
+                n_trees += 1
+                depth = max(depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            left=np.concatenate(left).astype(np.intp),
+            right=np.concatenate(right).astype(np.intp),
+            value=np.concatenate(value),
+            roots=np.asarray(roots, dtype=np.intp),
+            member_starts=np.asarray(member_starts, dtype=np.intp),
+            member_kinds=np.asarray(member_kinds, dtype=np.int8),
+            member_scales=np.asarray(member_scales, dtype=np.float64),
+            depth=depth,
+            n_features=model.n_features_in_,
+            scaler=scaler,
+            workers=workers,
+        )
+
+    @classmethod
+    def from_arrays(
+        cls, arrays: dict, scaler=None, workers: int = 1
+    ) -> "TreeEnsembleScorer":
+        """
+        Scorer over arrays saved from ``to_arrays``, used as they are:
+        memory-mapped arrays are not copied.
+        """
+        return cls(**arrays, scaler=scaler, workers=workers)
+
+    def to_arrays(self) -> dict:
+        """The compiled model, without the scaler."""
+        arrays = {name: getattr(self, name) for name in ARRAY_NAMES}
+        arrays["depth"] = self.depth
+        arrays["n_features"] = self.n_features
+        return arrays
+
+    @property
+    def n_trees(self) -> int:
+        return self.roots.shape[0]
+
+    @property
+    def n_members(self) -> int:
+        return self.member_starts.shape[0]
+
+    def score_indices(self, active_indices: Sequence[int]) -> float:
+        """
+        Positive-class probability for a single one-hot row, given only
+        the indices of its active columns.
+        """
+        row = np.zeros((1, self.n_features), dtype=np.float64)
+        row[0, list(active_indices)] = 1.0
+        return float(self.predict_proba(row)[0, -1])
+
+    def predict_proba(self, encoded: np.ndarray) -> np.ndarray:
+        """
+        Same contract as the model's ``predict_proba`` for an already
+        encoded (unscaled) matrix: one row of class probabilities per
+        input.
+        """
+        X = (
+            encoded
+            if self.scaler is None
+            else scale_encoded(self.scaler, encoded)
+        )
+        X = np.ascontiguousarray(X, dtype=np.float32)
+
+        # Large batches are walked in blocks of rows, so the (rows, trees)
+        # work arrays stay around BLOCK_NODES entries
+        block = max(1, BLOCK_NODES // self.n_trees)
+        return np.concatenate([
+            self._score_block(X[start : start + block])
+            for start in range(0, max(X.shape[0], 1), block)
+        ])
+
+    def _score_block(self, X: np.ndarray) -> np.ndarray:
+        if self._executor is None or self.n_members < 2:
+            members = self._score_members(X, 0, self.n_members)
+        else:
+            # Members are independent: each thread walks a slice of them
+            bounds = np.linspace(
+                0, self.n_members, min(self.workers, self.n_members) + 1
+            ).astype(int)
+            members = np.concatenate(
+                list(
+                    self._executor.map(
+                        lambda lo_hi: self._score_members(X, *lo_hi),
+                        itertools.pairwise(bounds),
+                    )
+                ),
+                axis=1,
+            )
+        # Bagging averages its members (a forest is a single member)
+        return members.sum(axis=1) / self.n_members
+
+    def _score_members(self, X: np.ndarray, first: int, last: int):
+        """``(rows, members, classes)`` outputs of members [first, last)."""
+        starts = self.member_starts
+        tree_lo = starts[first]
+        tree_hi = starts[last] if last < self.n_members else self.n_trees
+
+        n_rows, n_trees = X.shape[0], tree_hi - tree_lo
+
+        # 1. Desce todas as árvores ao mesmo tempo, um nível por iteração
+        nodes = np.tile(self.roots[tree_lo:tree_hi], n_rows)
+        offsets = np.repeat(np.arange(n_rows) * X.shape[1], n_trees)
+        flat_X = X.ravel()
+        for _ in range(self.depth):
+            go_left = (
+                flat_X[offsets + self.feature[nodes]] <= self.threshold[nodes]
+            )
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        # 2. Soma as folhas de cada membro na ordem das árvores, como o
+        # sklearn (soma sequencial: o resultado é idêntico bit a bit)
+        leaves = self.value[nodes].reshape(n_rows, n_trees, self.n_classes)
+        sizes = np.diff(np.append(starts[first:last], tree_hi))
+        if (sizes == sizes[0]).all():
+            sums = leaves.reshape(
+                n_rows, last - first, sizes[0], self.n_classes
+            ).sum(axis=2)
+        else:
+            sums = np.stack(
+                [
+                    leaves[:, lo - tree_lo : lo - tree_lo + size].sum(axis=1)
+                    for lo, size in zip(starts[first:last], sizes)
+                ],
+                axis=1,
+            )
+        sums /= self.member_scales[first:last, np.newaxis]
+
+        # 3. Membros AdaBoost: voto ponderado -> probabilidades (softmax)
+        samme = self.member_kinds[first:last] == MEMBER_SAMME
+        if samme.any():
+            sums[:, samme] = _samme_proba(sums[:, samme], self.n_classes)
+        return sums
+
+
+def _samme_proba(votes: np.ndarray, n_classes: int) -> np.ndarray:
+    """AdaBoostClassifier.predict_proba from the normalized votes."""
+    if n_classes == 2:
+        decision = votes[..., 1] - votes[..., 0]
+        decision = np.stack([-decision, decision], axis=-1) / 2
+    else:
+        decision = votes / (n_classes - 1)
+    decision = decision - decision.max(axis=-1, keepdims=True)
+    np.exp(decision, out=decision)
+    decision /= decision.sum(axis=-1, keepdims=True)
+    return decision
+
+
+def _leaf_values(tree, kind: int, weight: float, n_classes: int):
+    """
+    Output of every node of a fitted ``tree_``: its class probabilities
+    for averaged members, or the weighted SAMME vote of its majority
+    class for AdaBoost members.
+    """
+    value = np.asarray(tree.value[:, 0, :n_classes], dtype=np.float64)
+    normalizer = value.sum(axis=1, keepdims=True)
+    # Leaf values are class fractions, so a sum is either ~1 or empty
+    normalizer[np.isclose(normalizer, 0.0)] = 1.0
+    proba = value / normalizer
+    if kind == MEMBER_MEAN:
+        return proba
+    votes = np.full_like(proba, -weight / (n_classes - 1))
+    votes[np.arange(proba.shape[0]), proba.argmax(axis=1)] = weight
+    return votes
+
+
+def _members(model) -> list[tuple[int, float, list]]:
+    """
+    Splits a fitted model into members, each a ``(kind, scale, trees)``
+    tuple where ``trees`` lists ``(tree_, feature indices, weight)``.
+    Raises TypeError for anything that cannot be compiled.
+    """
+    n_features = getattr(model, "n_features_in_", None)
+    classes = getattr(model, "classes_", None)
+    if n_features is None or classes is None:
+        raise TypeError(f"{type(model).__name__} is not a fitted classifier")
+    all_features = np.arange(n_features)
+
+    estimators_features = getattr(model, "estimators_features_", None)
+    if estimators_features is not None:
+        # Bagging: each member sees a subset of the columns
+        members = []
+        for estimator, features in zip(model.estimators_, estimators_features):
+            estimator = _final_classifier(estimator)
+            if len(getattr(estimator, "classes_", ())) != len(classes):
+                raise TypeError("Bagging member without every class")
+            members.append(
+                _member(estimator, np.asarray(features, dtype=np.intp))
+            )
+        return members
+    return [_member(_final_classifier(model), all_features)]
+
+
+def _member(model, features: np.ndarray) -> tuple[int, float, list]:
+    if hasattr(model, "tree_"):
+        _check_tree(model.tree_)
+        return MEMBER_MEAN, 1.0, [(model.tree_, features, 1.0)]
+
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None or getattr(model, "estimators_features_", None):
+        raise TypeError(f"Unsupported model: {type(model).__name__}")
+    if not all(hasattr(estimator, "tree_") for estimator in estimators):
+        raise TypeError(f"{type(model).__name__} is not made of trees")
+    for estimator in estimators:
+        _check_tree(estimator.tree_)
+
+    weights = getattr(model, "estimator_weights_", None)
+    if weights is not None:
+        # AdaBoost: only the fitted estimators vote, but the decision is
+        # normalized by the sum of every weight
+        return (
+            MEMBER_SAMME,
+            float(np.sum(weights)),
+            [
+                (estimator.tree_, features, float(weight))
+                for estimator, weight in zip(estimators, weights)
+            ],
+        )
+    return (
+        MEMBER_MEAN,
+        float(len(estimators)),
+        [(estimator.tree_, features, 1.0) for estimator in estimators],
+    )
+
+
+def _final_classifier(model):
+    """
+    The classifier of a pipeline whose other steps are samplers, which
+    only act while fitting.
+    """
+    steps = getattr(model, "steps", None)
+    if steps is None:
+        return model
+    for _, step in steps[:-1]:
+        if step not in (None, "passthrough") and not hasattr(
+            step, "fit_resample"
+        ):
+            raise TypeError("Pipeline with a transformer step")
+    return steps[-1][1]
+
+
+def _check_tree(tree) -> None:
+    if tree.n_outputs != 1:
+        raise TypeError("Multi-output trees are not supported")
@@ -40,4 +40,8 @@ class AssessmentPublic(AssessmentBase):
     id: uuid.UUID
     animal: AnimalPublic
     user: UserPublic
+    # Stored model prediction; empty until the assessment is scored
+    predicted_diagnosis: enums.DiagnosisResult | None = None
+    prediction_confidence: float | None = None
+    model_version: str | None = None
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+
+
+# Summary of one timing histogram. Percentiles are the upper bound of the
+# log-scale bucket that holds them, so they are accurate to a factor of 2.
+class StageTiming(BaseModel):
+    count: int
+    sum_ms: float
+    mean_ms: float | None = None
+    p50_ms: float | None = None
+    p90_ms: float | None = None
+    p99_ms: float | None = None
+
+
+# State of the database connection pool
+class PoolStats(BaseModel):
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    # checked_out / (size + max_overflow)
+    saturation: float
+    peak_checked_out: int
+    # Checkouts that failed after waiting DB_POOL_TIMEOUT
+    timeouts: int
+    # Time spent waiting for a connection
+    wait: StageTiming
@@ -1,5 +1,6 @@
 # src/schemas/prediction.py
 
+from typing import Any
 from pydantic import BaseModel
 
 
@@ -23,9 +24,138 @@ class PredictionInput(BaseModel):
     breed_name: str | None = None
 
 
+# Contribution of one field to the model logit (log-odds): positive values
+# push towards "Positivo", negative ones towards "Negativo"
+class FeatureContribution(BaseModel):
+    field: str
+    value: str | None
+    contribution: float
+
+
 # Schema for the output data returned by the API
 class PredictionOutput(BaseModel):
     diagnosis_prediction: str
     # --- NEW FIELD ---
     # The model's confidence in the prediction, as a value between 0.0 and 1.0
     confidence_score: float
+    # Version of the model artifacts that produced this prediction
+    model_version: str
+    # Top contributing fields, only with explain=true
+    explanation: list[FeatureContribution] | None = None
+
+
+# Schema for scoring several inputs in a single request. Items are kept as
+# raw objects so that an invalid row is reported individually instead of
+# rejecting the whole batch.
+class BatchPredictionInput(BaseModel):
+    items: list[Any]
+
+
+# One result per submitted item, in the same order as the request
+class BatchPredictionItem(BaseModel):
+    index: int
+    diagnosis_prediction: str | None = None
+    confidence_score: float | None = None
+    explanation: list[FeatureContribution] | None = None
+    error: str | None = None
+
+
+class BatchPredictionOutput(BaseModel):
+    results: list[BatchPredictionItem]
+    model_version: str
+
+
+# What-if sweep: the base input plus the fields whose alternatives should
+# be scored (all fields when omitted)
+class WhatIfInput(BaseModel):
+    input: PredictionInput
+    fields: list[str] | None = None
+
+
+# One alternative value of a field; value None means "not informed"
+class WhatIfAlternative(BaseModel):
+    value: str | None
+    probability: float
+    diagnosis_prediction: str
+    current: bool
+
+
+class WhatIfField(BaseModel):
+    field: str
+    alternatives: list[WhatIfAlternative]
+
+
+class WhatIfOutput(BaseModel):
+    model_version: str
+    # Positive-class probability and prediction of the input as given
+    probability: float
+    diagnosis_prediction: str
+    fields: list[WhatIfField]
+
+
+# Message sent on /predict/live after every change of the form
+class LivePredictionOutput(BaseModel):
+    diagnosis_prediction: str
+    confidence_score: float
+    # Positive-class probability
+    probability: float
+    model_version: str
+
+
+# How much answering a still empty field could move the probability
+class NextQuestion(BaseModel):
+    field: str
+    # Change expected from the training frequencies of its categories
+    expected_change: float
+    # Largest change any single answer would cause
+    max_change: float
+    could_change_prediction: bool
+
+
+class NextQuestionsOutput(BaseModel):
+    model_version: str
+    probability: float
+    diagnosis_prediction: str
+    questions: list[NextQuestion]
+
+
+class PredictionCacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class PredictionAuditStats(BaseModel):
+    queued: int
+    written: int
+    batches: int
+    dropped: int
+    failed: int
+
+
+# Operational counters of the prediction service
+class PredictionStats(BaseModel):
+    model_version: str
+    cache: PredictionCacheStats
+    # Values that matched no training column, per field
+    unknown_categories: dict[str, int]
+    audit: PredictionAuditStats
+
+
+class ModelVersion(BaseModel):
+    version: str
+    loaded: bool
+    active: bool
+
+
+class ModelRegistryOutput(BaseModel):
+    active_version: str
+    versions: list[ModelVersion]
+
+
+# Optional body of the reload endpoint: switch to a specific version
+# instead of the one marked as active in the manifest
+class ModelReloadInput(BaseModel):
+    version: str | None = None
@@ -1,6 +1,9 @@
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
-from .test_utils import get_authenticated_headers
+from .test_utils import (
+    assert_queries_independent_of_page_size,
+    get_authenticated_headers,
+)
 
 
 def test_create_animal(client: TestClient, db_session: Session):
@@ -272,3 +275,36 @@ def test_delete_animal(client: TestClient, db_session: Session):
         f"/animals/{created_animal_id}", headers=vet_headers
     )
     assert response_get.status_code == 404
+
+
+def test_read_animals_query_count(client: TestClient, db_session: Session):
+    """
+    Listing animals loads owners and breeds with the page, not one query
+    per animal.
+    """
+    headers = get_authenticated_headers(
+        client, db_session, "vet_nplus1@example.com"
+    )
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_nplus1@example.com", role_name="admin"
+    )
+    # Each animal has its own owner and breed
+    for i in range(5):
+        owner_id = client.post(
+            "/owners/", headers=headers, json={"name": f"Owner {i}"}
+        ).json()["id"]
+        breed_id = client.post(
+            "/breeds/", headers=admin_headers, json={"name": f"Breed {i}"}
+        ).json()["id"]
+        response = client.post(
+            "/animals/",
+            headers=headers,
+            json={
+                "name": f"Animal {i}",
+                "owner_id": owner_id,
+                "breed_id": breed_id,
+            },
+        )
+        assert response.status_code == 201, response.text
+
+    assert_queries_independent_of_page_size(client, "/animals/", headers)
@@ -1,8 +1,13 @@
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from .test_utils import get_authenticated_headers
+from .test_utils import (
+    assert_queries_independent_of_page_size,
+    get_authenticated_headers,
+)
 from src.db.models import enums  # Precisamos dos nossos Enums
+from src.ml.prediction_service import prediction_service
+from src.schemas.prediction import PredictionInput
 
 
 def test_create_assessment(client: TestClient, db_session: Session):
@@ -321,3 +326,232 @@ def test_delete_assessment(client: TestClient, db_session: Session):
         f"/assessments/{created_assessment_id}", headers=vet_headers
     )
     assert response_get.status_code == 404
+
+
+def test_create_and_update_assessment_with_score(
+    client: TestClient, db_session: Session
+):
+    """
+    Tests that ?score=true stores the model prediction on the assessment,
+    that reads return it, and that editing a clinical field without
+    scoring drops it.
+    """
+    # 1. Create all prerequisites
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_score_assessment@example.com"
+    )
+    admin_headers = get_authenticated_headers(
+        client,
+        db_session,
+        "admin_score_assessment@example.com",
+        role_name="admin",
+    )
+    owner_id = client.post(
+        "/owners/", headers=vet_headers, json={"name": "Paula Souza"}
+    ).json()["id"]
+    breed_id = client.post(
+        "/breeds/", headers=admin_headers, json={"name": "Labrador"}
+    ).json()["id"]
+    animal_id = client.post(
+        "/animals/",
+        headers=vet_headers,
+        json={
+            "name": "Thor",
+            "sex": "M",
+            "owner_id": owner_id,
+            "breed_id": breed_id,
+        },
+    ).json()["id"]
+
+    # 2. Create the assessment scoring it in the same request
+    assessment_data = {
+        "animal_id": animal_id,
+        "general_state": enums.GeneralState.ruim,
+        "coat": enums.LesionSeverity.graves,
+        "lymph_nodes": enums.LesionSeverity.leves_moderadas,
+        "skin_lesion": "Grave/Generalizada",
+    }
+    response_create = client.post(
+        "/assessments/?score=true", headers=vet_headers, json=assessment_data
+    )
+
+    # 3. The stored prediction matches the model on the same features
+    assert response_create.status_code == 201, response_create.text
+    created = response_create.json()
+    expected = prediction_service.predict(
+        PredictionInput(
+            general_state="ruim",
+            coat="graves",
+            lymph_nodes="leves_moderadas",
+            skin_lesion="Grave/Generalizada",
+            animal_sex="M",
+            breed_name="Labrador",
+        )
+    )
+    assert created["predicted_diagnosis"] == expected["prediction"]
+    assert created["prediction_confidence"] == expected["confidence"]
+    assert created["model_version"] == expected["model_version"]
+
+    # 4. Detail reads return the stored prediction
+    response_read = client.get(
+        f"/assessments/{created['id']}", headers=vet_headers
+    )
+    assert (
+        response_read.json()["predicted_diagnosis"] == (expected["prediction"])
+    )
+
+    # 5. Changing a clinical field without scoring drops the prediction
+    response_update = client.put(
+        f"/assessments/{created['id']}",
+        headers=vet_headers,
+        json={"general_state": enums.GeneralState.bom},
+    )
+    assert response_update.status_code == 200, response_update.text
+    assert response_update.json()["predicted_diagnosis"] is None
+    assert response_update.json()["model_version"] is None
+
+    # 6. ...and scoring on update stores a fresh one
+    response_rescore = client.put(
+        f"/assessments/{created['id']}?score=true",
+        headers=vet_headers,
+        json={},
+    )
+    assert response_rescore.status_code == 200, response_rescore.text
+    assert response_rescore.json()["predicted_diagnosis"] is not None
+    assert (
+        response_rescore.json()["model_version"] == (expected["model_version"])
+    )
+
+
+def test_create_assessment_without_score_has_no_prediction(
+    client: TestClient, db_session: Session
+):
+    """
+    Tests that assessments are not scored unless asked to.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_no_score@example.com"
+    )
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_no_score@example.com", role_name="admin"
+    )
+    owner_id = client.post(
+        "/owners/", headers=vet_headers, json={"name": "Bruno Alves"}
+    ).json()["id"]
+    breed_id = client.post(
+        "/breeds/", headers=admin_headers, json={"name": "Poodle"}
+    ).json()["id"]
+    animal_id = client.post(
+        "/animals/",
+        headers=vet_headers,
+        json={"name": "Mel", "owner_id": owner_id, "breed_id": breed_id},
+    ).json()["id"]
+
+    response = client.post(
+        "/assessments/",
+        headers=vet_headers,
+        json={"animal_id": animal_id, "general_state": "Bom"},
+    )
+
+    assert response.status_code == 201, response.text
+    assert response.json()["predicted_diagnosis"] is None
+    assert response.json()["prediction_confidence"] is None
+
+
+def test_read_assessments_query_count(client: TestClient, db_session: Session):
+    """
+    Listing assessments loads animal (with owner and breed) and user
+    (with role) with the page, not one query per assessment.
+    """
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_nplus1@example.com", role_name="admin"
+    )
+    # Each assessment has its own animal, owner, breed, user and role
+    for i in range(5):
+        vet_headers = get_authenticated_headers(
+            client,
+            db_session,
+            f"vet_nplus1_{i}@example.com",
+            role_name=f"role_{i}",
+        )
+        owner_id = client.post(
+            "/owners/", headers=vet_headers, json={"name": f"Owner {i}"}
+        ).json()["id"]
+        breed_id = client.post(
+            "/breeds/", headers=admin_headers, json={"name": f"Breed {i}"}
+        ).json()["id"]
+        animal_id = client.post(
+            "/animals/",
+            headers=vet_headers,
+            json={
+                "name": f"Animal {i}",
+                "owner_id": owner_id,
+                "breed_id": breed_id,
+            },
+        ).json()["id"]
+        response = client.post(
+            "/assessments/",
+            headers=vet_headers,
+            json={
+                "animal_id": animal_id,
+                "diagnosis": enums.DiagnosisResult.negativo,
+            },
+        )
+        assert response.status_code == 201, response.text
+
+    assert_queries_independent_of_page_size(
+        client, "/assessments/", admin_headers
+    )
+
+
+def test_read_assessments_cursor_pagination(
+    client: TestClient, db_session: Session
+):
+    """
+    Walks the assessment list one row at a time with X-Next-Cursor and
+    checks it matches the offset listing.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_pages@example.com"
+    )
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_pages@example.com", role_name="admin"
+    )
+    owner_id = client.post(
+        "/owners/", headers=vet_headers, json={"name": "Paula Reis"}
+    ).json()["id"]
+    breed_id = client.post(
+        "/breeds/", headers=admin_headers, json={"name": "Pinscher"}
+    ).json()["id"]
+    animal_id = client.post(
+        "/animals/",
+        headers=vet_headers,
+        json={"name": "Fred", "owner_id": owner_id, "breed_id": breed_id},
+    ).json()["id"]
+    for _ in range(3):
+        response = client.post(
+            "/assessments/",
+            headers=vet_headers,
+            json={
+                "animal_id": animal_id,
+                "diagnosis": enums.DiagnosisResult.negativo,
+            },
+        )
+        assert response.status_code == 201, response.text
+
+    expected = client.get("/assessments/", headers=vet_headers).json()
+    assert len(expected) == 3
+
+    ids, params = [], {"limit": 1}
+    while True:
+        response = client.get(
+            "/assessments/", headers=vet_headers, params=params
+        )
+        assert response.status_code == 200, response.text
+        ids += [assessment["id"] for assessment in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+        params = {"limit": 1, "cursor": cursor}
+
+    assert ids == [assessment["id"] for assessment in expected]
@@ -110,3 +110,56 @@ def test_delete_breed(client: TestClient, db_session: Session):
         f"/breeds/{created_breed_id}", headers=admin_headers
     )
     assert response_get.status_code == 404
+
+
+def test_read_breeds_cursor_pagination(
+    client: TestClient, db_session: Session
+):
+    """
+    Follows the next-page links of the breed list and checks the pages
+    match the offset listing, in name order.
+    """
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_breed_pages@example.com", role_name="admin"
+    )
+    for name in ["Pug", "Akita", "Boxer", "Poodle", "Dálmata"]:
+        response = client.post(
+            "/breeds/", headers=admin_headers, json={"name": name}
+        )
+        assert response.status_code == 201, response.text
+
+    expected = client.get("/breeds/", headers=admin_headers).json()
+    assert [breed["name"] for breed in expected] == sorted(
+        breed["name"] for breed in expected
+    )
+    # The last page is not full, so it has no next link
+    assert "link" not in client.get("/breeds/", headers=admin_headers).headers
+
+    pages, url = [], "/breeds/?limit=2"
+    while url:
+        response = client.get(url, headers=admin_headers)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        link = response.headers.get("link")
+        url = link[1 : link.index(">")] if link else None
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [breed for page in pages for breed in page] == expected
+
+
+def test_read_breeds_invalid_page(client: TestClient, db_session: Session):
+    """
+    Tests that malformed cursors and out-of-range limits are rejected.
+    """
+    headers = get_authenticated_headers(
+        client, db_session, "user_breed_pages@example.com"
+    )
+
+    response = client.get("/breeds/?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+    response = client.get("/breeds/?limit=0", headers=headers)
+    assert response.status_code == 422
+    response = client.get("/breeds/?limit=100000", headers=headers)
+    assert response.status_code == 422
@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from src.api.v1 import router_health
+
+
+def test_liveness(client: TestClient):
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_readiness_after_startup(client: TestClient):
+    """
+    The lifespan has loaded and warmed up the model, the database pool and
+    the prediction cache, so the worker reports itself as ready.
+    """
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200, response.text
+    assert response.json()["checks"] == {
+        "model": True,
+        "database": True,
+        "cache": True,
+    }
+
+
+def test_readiness_while_warming_up(client: TestClient, monkeypatch):
+    monkeypatch.setitem(client.app.state.readiness, "cache", False)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["detail"]["checks"]["cache"] is False
+
+
+def test_readiness_reports_database_error(client: TestClient, monkeypatch):
+    def refuse():
+        raise OperationalError("SELECT 1", {}, Exception("refused"))
+
+    monkeypatch.setitem(client.app.state.readiness, "database", False)
+    monkeypatch.setattr(router_health, "warm_up_database", refuse)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    detail = response.json()["detail"]
+    assert detail["checks"]["database"] is False
+    assert detail["error"].startswith("OperationalError:")
+    assert "refused" in detail["error"]
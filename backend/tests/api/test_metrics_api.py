@@ -0,0 +1,109 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.metrics import Histogram
+from .test_utils import get_authenticated_headers
+
+
+def test_histogram_quantiles():
+    histogram = Histogram()
+    for _ in range(99):
+        histogram.observe(0.0001)
+    histogram.observe(0.5)
+
+    summary = histogram.summary()
+
+    assert summary["count"] == 100
+    # Bucket upper bounds: within a factor of 2 of the observed values
+    assert 0.1 <= summary["p50_ms"] < 0.2
+    assert 0.1 <= summary["p99_ms"] < 0.2
+    assert 0.5 <= histogram.quantile(1.0) < 1.0
+
+
+def test_server_timing_header(
+    client: TestClient, db_session: Session, monkeypatch
+):
+    """
+    Tests that the per-stage durations are sent back when enabled.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_server_timing@example.com"
+    )
+    monkeypatch.setattr(settings, "METRICS_SERVER_TIMING", True)
+
+    response = client.post(
+        "/predict/", headers=vet_headers, json={"general_state": "regular"}
+    )
+
+    assert response.status_code == 200, response.text
+    server_timing = response.headers["server-timing"]
+    assert "auth.user_lookup;dur=" in server_timing
+    assert "request.before_handler;dur=" in server_timing
+    assert "total;dur=" in server_timing
+
+    monkeypatch.setattr(settings, "METRICS_SERVER_TIMING", False)
+    response = client.post("/predict/", headers=vet_headers, json={})
+    assert "server-timing" not in response.headers
+
+
+def test_read_timings(client: TestClient, db_session: Session):
+    """
+    Tests that admins can read the stage and route histograms.
+    """
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_for_timings@example.com", role_name="admin"
+    )
+    client.post(
+        "/predict/batch",
+        headers=admin_headers,
+        json={"items": [{"coat": "normal"}, {"coat": "graves"}]},
+    )
+
+    response = client.get("/metrics/timings", headers=admin_headers)
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["http POST /predict/batch"]["count"] >= 1
+    assert data["predict.encode"]["count"] >= 1
+    assert data["batch.validate"]["p99_ms"] is not None
+
+
+def test_read_pool(client: TestClient, db_session: Session):
+    """
+    Tests that admins can read the connection pool usage.
+    """
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_for_pool@example.com", role_name="admin"
+    )
+
+    response = client.get("/metrics/pool", headers=admin_headers)
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["size"] == settings.DB_POOL_SIZE
+    assert data["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert 0.0 <= data["saturation"] <= 1.0
+    assert data["peak_checked_out"] >= 1
+    # Every request above checked out a connection
+    assert data["wait"]["count"] > 0
+
+
+def test_read_async_pool(client: TestClient, db_session: Session):
+    """
+    Tests that the asyncpg pool (used by authentication) is reported.
+    """
+    admin_headers = get_authenticated_headers(
+        client,
+        db_session,
+        "admin_for_async_pool@example.com",
+        role_name="admin",
+    )
+
+    response = client.get("/metrics/pool/async", headers=admin_headers)
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["size"] == settings.DB_ASYNC_POOL_SIZE
+    assert data["max_overflow"] == settings.DB_ASYNC_MAX_OVERFLOW
+    assert data["wait"]["count"] > 0
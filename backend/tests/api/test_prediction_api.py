@@ -1,7 +1,18 @@
 # tests/api/test_prediction_api.py
 
+import asyncio
+
+import pytest
 from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from src.core.audit import input_hash, prediction_audit_log
+from src.core.config import settings
+from src.db import models
+from src.db.crud import crud_user
+from src.ml.prediction_service import prediction_service
+from src.schemas.prediction import PredictionInput
 from .test_utils import get_authenticated_headers
 
 
@@ -44,3 +55,383 @@ def test_make_prediction(client: TestClient, db_session: Session):
     assert "confidence_score" in data
     assert data["diagnosis_prediction"] in ["Positivo", "Negativo"]
     assert 0.0 <= data["confidence_score"] <= 1.0
+
+
+def test_make_batch_prediction(client: TestClient, db_session: Session):
+    """
+    Tests scoring several inputs at once: results keep the request order,
+    match the single-item endpoint and report invalid rows individually.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_batch_prediction@example.com"
+    )
+
+    items = [
+        {"general_state": "Bom", "animal_sex": "M", "breed_name": "SRD"},
+        {"skin_lesion": ["not", "a", "string"]},
+        {"conjunctivitis": "Conjuntivite Leve", "animal_sex": "F"},
+        {},
+    ]
+
+    response = client.post(
+        "/predict/batch", headers=vet_headers, json={"items": items}
+    )
+
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+
+    assert results[1]["error"] is not None
+    assert results[1]["diagnosis_prediction"] is None
+
+    for index in (0, 2, 3):
+        assert results[index]["error"] is None
+        single = client.post(
+            "/predict/", headers=vet_headers, json=items[index]
+        ).json()
+        assert (
+            results[index]["diagnosis_prediction"]
+            == single["diagnosis_prediction"]
+        )
+        assert results[index]["confidence_score"] == pytest.approx(
+            single["confidence_score"]
+        )
+
+
+def test_make_batch_prediction_too_large(
+    client: TestClient, db_session: Session, monkeypatch
+):
+    """
+    Tests that batches above the configured limit are rejected.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_big_batch@example.com"
+    )
+    monkeypatch.setattr(settings, "PREDICTION_BATCH_MAX_ITEMS", 2)
+
+    response = client.post(
+        "/predict/batch", headers=vet_headers, json={"items": [{}, {}, {}]}
+    )
+
+    assert response.status_code == 413
+
+
+def test_read_prediction_stats(client: TestClient, db_session: Session):
+    """
+    Tests that admins can read the cache counters and model version.
+    """
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_for_stats@example.com", role_name="admin"
+    )
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_stats@example.com"
+    )
+
+    client.post("/predict/", headers=vet_headers, json={"animal_sex": "F"})
+    client.post("/predict/", headers=vet_headers, json={"animal_sex": "F"})
+
+    response = client.get("/predict/stats", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["model_version"]
+    assert data["cache"]["hits"] >= 1
+
+    response = client.get("/predict/stats", headers=vet_headers)
+    assert response.status_code == 403
+
+
+def test_make_prediction_with_micro_batching(
+    client: TestClient, db_session: Session, monkeypatch
+):
+    """
+    Tests that the micro-batching path returns the same result as the
+    direct path.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_microbatch@example.com"
+    )
+    prediction_data = {"general_state": "ruim", "animal_sex": "F"}
+    direct = client.post(
+        "/predict/", headers=vet_headers, json=prediction_data
+    ).json()
+
+    monkeypatch.setattr(settings, "PREDICTION_MICROBATCH_ENABLED", True)
+    response = client.post(
+        "/predict/", headers=vet_headers, json=prediction_data
+    )
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["diagnosis_prediction"] == direct["diagnosis_prediction"]
+    assert data["confidence_score"] == pytest.approx(
+        direct["confidence_score"]
+    )
+
+
+def test_reload_model_versions(client: TestClient, db_session: Session):
+    """
+    Tests the admin endpoints that list and reload the model versions.
+    """
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_for_models@example.com", role_name="admin"
+    )
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_models@example.com"
+    )
+
+    response = client.get("/predict/models", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["active_version"] == "v2"
+
+    response = client.post("/predict/models/reload", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["active_version"] == "v2"
+
+    response = client.post(
+        "/predict/models/reload",
+        headers=admin_headers,
+        json={"version": "does-not-exist"},
+    )
+    assert response.status_code == 400
+
+    response = client.post("/predict/models/reload", headers=vet_headers)
+    assert response.status_code == 403
+
+    response = client.post("/predict/", headers=vet_headers, json={})
+    assert response.json()["model_version"] == "v2"
+
+
+def test_make_prediction_with_explanation(
+    client: TestClient, db_session: Session
+):
+    """
+    Tests that explain=true returns the top contributing fields, on the
+    single and on the batch endpoint.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_explanation@example.com"
+    )
+    prediction_data = {
+        "general_state": "ruim",
+        "coat": "graves",
+        "lymph_nodes": "leves_moderadas",
+        "animal_sex": "M",
+        "breed_name": "Labrador",
+    }
+
+    response = client.post(
+        "/predict/?explain=true", headers=vet_headers, json=prediction_data
+    )
+
+    assert response.status_code == 200, response.text
+    explanation = response.json()["explanation"]
+    assert len(explanation) == settings.PREDICTION_EXPLAIN_TOP_K
+    sizes = [abs(item["contribution"]) for item in explanation]
+    assert sizes == sorted(sizes, reverse=True)
+    for item in explanation:
+        assert item["value"] == prediction_data.get(item["field"])
+
+    # Without the flag nothing is computed
+    response = client.post(
+        "/predict/", headers=vet_headers, json=prediction_data
+    )
+    assert response.json()["explanation"] is None
+
+    response = client.post(
+        "/predict/batch?explain=true",
+        headers=vet_headers,
+        json={"items": [prediction_data, {"coat": 1}]},
+    )
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert results[0]["explanation"] == explanation
+    assert results[1]["explanation"] is None
+
+
+def test_what_if_sweep(client: TestClient, db_session: Session):
+    """
+    Tests the what-if endpoint: every alternative of the requested fields
+    is scored, and unknown fields are rejected.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_what_if@example.com"
+    )
+    base = {"general_state": "ruim", "lymph_nodes": "normal"}
+
+    response = client.post(
+        "/predict/what-if",
+        headers=vet_headers,
+        json={"input": base, "fields": ["lymph_nodes"]},
+    )
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert [item["field"] for item in data["fields"]] == ["lymph_nodes"]
+    alternatives = data["fields"][0]["alternatives"]
+    assert [alt["value"] for alt in alternatives if alt["current"]] == [
+        "normal"
+    ]
+    current = next(alt for alt in alternatives if alt["current"])
+    assert current["probability"] == pytest.approx(data["probability"])
+
+    # All fields by default
+    response = client.post(
+        "/predict/what-if", headers=vet_headers, json={"input": base}
+    )
+    assert len(response.json()["fields"]) == 16
+
+    response = client.post(
+        "/predict/what-if",
+        headers=vet_headers,
+        json={"input": base, "fields": ["weight"]},
+    )
+    assert response.status_code == 400
+
+
+def test_next_questions_ranking(client: TestClient, db_session: Session):
+    """
+    Tests the next-questions endpoint: only the fields left empty are
+    ranked, most informative first, and a positive top_k limits the list.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_next_questions@example.com"
+    )
+    partial = {"general_state": "ruim", "lymph_nodes": "normal"}
+
+    response = client.post(
+        "/predict/next-questions", headers=vet_headers, json=partial
+    )
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    fields = [question["field"] for question in data["questions"]]
+    assert len(fields) == 14
+    assert not set(fields) & set(partial)
+    changes = [question["expected_change"] for question in data["questions"]]
+    assert changes == sorted(changes, reverse=True)
+
+    response = client.post(
+        "/predict/next-questions?top_k=2", headers=vet_headers, json=partial
+    )
+    assert [q["field"] for q in response.json()["questions"]] == fields[:2]
+
+    for top_k in (0, -1):
+        response = client.post(
+            f"/predict/next-questions?top_k={top_k}",
+            headers=vet_headers,
+            json=partial,
+        )
+        assert response.status_code == 422
+
+
+def test_live_prediction_websocket(
+    client: TestClient, db_session: Session, monkeypatch
+):
+    """
+    Tests the live prediction WebSocket: each partial change is answered
+    with the prediction for the whole form, off the event loop, and a
+    missing token is refused.
+    """
+    on_event_loop = []
+    update_live_session = prediction_service.update_live_session
+
+    def update_off_the_loop(*args):
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+        return update_live_session(*args)
+
+    monkeypatch.setattr(
+        prediction_service, "update_live_session", update_off_the_loop
+    )
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_live@example.com"
+    )
+    token = vet_headers["Authorization"].split()[1]
+    form = {"general_state": "ruim", "lymph_nodes": "normal"}
+
+    with client.websocket_connect(f"/predict/live?token={token}") as ws:
+        ws.send_json({"general_state": "ruim"})
+        first = ws.receive_json()
+        ws.send_json({"lymph_nodes": "normal"})
+        live = ws.receive_json()
+        ws.send_json({"weight": "10"})
+        error = ws.receive_json()
+        ws.send_json(["weight"])
+        not_an_object = ws.receive_json()
+
+    full = client.post("/predict/", headers=vet_headers, json=form).json()
+    assert set(first) == {
+        "diagnosis_prediction",
+        "confidence_score",
+        "probability",
+        "model_version",
+    }
+    assert live["diagnosis_prediction"] == full["diagnosis_prediction"]
+    assert live["confidence_score"] == pytest.approx(full["confidence_score"])
+    assert "weight" in error["error"]
+    assert not_an_object == {"error": "Expected an object of field changes"}
+    assert on_event_loop == [False, False, False]
+
+    with (
+        pytest.raises(WebSocketDisconnect),
+        client.websocket_connect("/predict/live") as ws,
+    ):
+        ws.receive_json()
+
+
+def test_prediction_is_audited(client: TestClient, db_session: Session):
+    """
+    Tests that every /predict call ends up in the predictions table,
+    with the input hash, the result, the model version and the user.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_audit@example.com"
+    )
+    form = {"general_state": "ruim", "animal_sex": "F"}
+
+    response = client.post("/predict/", headers=vet_headers, json=form)
+    assert response.status_code == 200, response.text
+    prediction_audit_log.flush()
+
+    data = response.json()
+    user = crud_user.get_user_by_email(db_session, "vet_for_audit@example.com")
+    record = db_session.scalars(
+        select(models.Prediction).where(models.Prediction.user_id == user.id)
+    ).one()
+    assert record.input_hash == input_hash(PredictionInput(**form))
+    assert record.diagnosis_prediction.value == data["diagnosis_prediction"]
+    assert record.confidence == pytest.approx(data["confidence_score"])
+    assert record.model_version == data["model_version"]
+    assert record.latency_ms > 0
+
+
+def test_batch_prediction_is_audited(client: TestClient, db_session: Session):
+    """
+    Tests that /predict/batch writes one audit record per scored item;
+    items that failed validation are not audited.
+    """
+    vet_headers = get_authenticated_headers(
+        client, db_session, "vet_for_batch_audit@example.com"
+    )
+    items = [{"animal_sex": "F"}, {"coat": 1}, {"coat": "normal"}]
+
+    response = client.post(
+        "/predict/batch", headers=vet_headers, json={"items": items}
+    )
+    assert response.status_code == 200, response.text
+    prediction_audit_log.flush()
+
+    user = crud_user.get_user_by_email(
+        db_session, "vet_for_batch_audit@example.com"
+    )
+    hashes = db_session.scalars(
+        select(models.Prediction.input_hash).where(
+            models.Prediction.user_id == user.id
+        )
+    ).all()
+    assert sorted(hashes) == sorted(
+        input_hash(PredictionInput(**items[i])) for i in (0, 2)
+    )
@@ -1,11 +1,16 @@
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from .test_utils import get_authenticated_headers
+from .test_utils import (
+    assert_queries_independent_of_page_size,
+    get_authenticated_headers,
+)
 from src.schemas import user as user_schema
 from src.db.crud import crud_user, crud_role
 from src.schemas.role import RoleCreate
 from src.core import security
 from src.core.config import settings
+from src.db.database import async_engine, engine
 from src.services import email as email_service
 
 
@@ -221,3 +226,81 @@ def test_activate_user_with_token(client: TestClient, db_session: Session):
     assert response.status_code == 200
     db_session.refresh(user)
     assert user.is_active is True
+
+
+def test_read_users_query_count(client: TestClient, db_session: Session):
+    """
+    Listing users loads their roles with the page, not one query per user.
+    """
+    # Each user has its own role
+    for i in range(4):
+        get_authenticated_headers(
+            client,
+            db_session,
+            f"user_nplus1_{i}@example.com",
+            role_name=f"role_{i}",
+        )
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_nplus1@example.com", role_name="admin"
+    )
+
+    assert_queries_independent_of_page_size(client, "/users/", admin_headers)
+
+
+def test_auth_and_reads_do_not_block(client: TestClient, db_session: Session):
+    """
+    Authentication and the read routes query through the asyncpg engine:
+    nothing runs on the blocking psycopg2 engine.
+    """
+    admin_headers = get_authenticated_headers(
+        client, db_session, "admin_async@example.com", role_name="admin"
+    )
+    blocking = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        blocking.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        for url in ["/users/me", "/users/", "/assessments/", "/breeds/"]:
+            response = client.get(url, headers=admin_headers)
+            assert response.status_code == 200, response.text
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert blocking == []
+
+
+def test_sync_routes_hold_one_connection(
+    client: TestClient, db_session: Session
+):
+    """
+    get_current_user gives its asyncpg connection back before a sync
+    route runs, so the route only holds its own psycopg2 connection.
+    """
+    admin_headers = get_authenticated_headers(
+        client,
+        db_session,
+        "admin_one_connection@example.com",
+        role_name="admin",
+    )
+    async_checked_out = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        async_checked_out.append(async_engine.pool.checkedout())
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.post(
+            "/breeds/", headers=admin_headers, json={"name": "Poodle"}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert response.status_code == 201, response.text
+    assert async_checked_out
+    assert set(async_checked_out) == {0}
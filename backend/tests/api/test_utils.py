@@ -1,6 +1,10 @@
+from contextlib import contextmanager
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from fastapi.testclient import TestClient
-from typing import Optional
+from typing import Iterator, Optional
+
+from src.db.database import async_engine, engine
 
 from src.schemas.user import UserCreate
 from src.schemas.role import RoleCreate
@@ -53,3 +57,57 @@ def get_authenticated_headers(
 
     headers = {"Authorization": f"Bearer {token}"}
     return headers
+
+
+@contextmanager
+def count_queries() -> Iterator[list[str]]:
+    """
+    Collects the SELECT statements the app runs on its engines (psycopg2
+    and asyncpg) inside the block. Writes, e.g. from the audit log
+    thread, are not counted.
+    """
+    statements: list[str] = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    engines = (engine, async_engine.sync_engine)
+    for target in engines:
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(
+                target, "before_cursor_execute", before_cursor_execute
+            )
+
+
+def assert_queries_independent_of_page_size(
+    client: TestClient,
+    url: str,
+    headers: dict[str, str],
+    page_sizes: tuple[int, int] = (1, 5),
+) -> None:
+    """
+    Requests a list endpoint with two page sizes and fails if the larger
+    page runs more queries (N+1 loading of related objects). The data
+    must have at least ``max(page_sizes)`` rows, each with its own
+    related objects.
+    """
+    counts = []
+    for limit in page_sizes:
+        with count_queries() as statements:
+            response = client.get(
+                url, headers=headers, params={"limit": limit}
+            )
+        assert response.status_code == 200, response.text
+        assert len(response.json()) == limit
+        counts.append(len(statements))
+    assert counts[0] == counts[1], (
+        f"{url}: {counts[0]} queries for {page_sizes[0]} rows, "
+        f"{counts[1]} for {page_sizes[1]}"
+    )
@@ -44,7 +44,7 @@ def db_session():
             # Clears all tables before each test to ensure isolation
             connection.execute(
                 text(
-                    "TRUNCATE TABLE users, roles, owners, breeds, animals, assessments RESTART IDENTITY CASCADE;"
+                    "TRUNCATE TABLE users, roles, owners, breeds, animals, assessments, predictions RESTART IDENTITY CASCADE;"
                 )
             )
 
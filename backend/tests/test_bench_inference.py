@@ -0,0 +1,47 @@
+from scripts.bench_inference import compare, run_benchmarks
+
+BASELINE = {
+    "predict.single": {"p50_ms": 1.0, "p99_ms": 2.0},
+    "predict_many.100": {"p50_ms": 10.0, "p99_ms": 20.0},
+}
+
+
+def test_compare_within_tolerance_passes():
+    results = {
+        "predict.single": {"p50_ms": 1.2, "p99_ms": 3.5},
+        "predict_many.100": {"p50_ms": 9.0, "p99_ms": 19.0},
+        "route.predict": {"p50_ms": 100.0, "p99_ms": 100.0},  # no baseline
+    }
+
+    assert compare(results, BASELINE, tolerance=0.3, p99_tolerance=1.0) == []
+
+
+def test_compare_reports_p50_and_p99_regressions():
+    results = {
+        "predict.single": {"p50_ms": 1.5, "p99_ms": 2.1},
+        "predict_many.100": {"p50_ms": 10.0, "p99_ms": 45.0},
+    }
+
+    regressions = compare(results, BASELINE, tolerance=0.3, p99_tolerance=1.0)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("predict.single p50_ms")
+    assert regressions[1].startswith("predict_many.100 p99_ms")
+
+
+def test_compare_ignores_jitter_below_min_delta():
+    baseline = {"encoder.active_indices": {"p50_ms": 0.005, "p99_ms": 0.01}}
+    results = {"encoder.active_indices": {"p50_ms": 0.01, "p99_ms": 0.04}}
+
+    assert compare(results, baseline, tolerance=0.3) == []
+    assert compare(results, baseline, tolerance=0.3, min_delta_ms=0) != []
+
+
+def test_benchmark_case_reports_percentiles():
+    results = run_benchmarks(
+        only="predict.single_cached", scale=0.01, routes=False
+    )
+
+    result = results["predict.single_cached"]
+    assert result["iterations"] == 50
+    assert 0 < result["p50_ms"] <= result["p99_ms"]
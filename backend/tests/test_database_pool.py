@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import exc, text
+
+from src.core import metrics
+from src.core.config import settings
+from src.db.database import engine, make_engine
+
+
+def test_app_engine_uses_pool_settings():
+    pool = engine.pool
+
+    assert pool.size() == settings.DB_POOL_SIZE
+    assert pool.timeout() == settings.DB_POOL_TIMEOUT
+    with engine.connect() as connection:
+        timeout = connection.execute(
+            text(
+                "SELECT setting FROM pg_settings "
+                "WHERE name = 'statement_timeout'"
+            )
+        ).scalar()
+    # In milliseconds
+    assert int(timeout) == settings.DB_STATEMENT_TIMEOUT_MS
+
+
+def test_pool_saturation_and_timeouts():
+    small = make_engine(
+        pool_size=1, max_overflow=0, pool_timeout=0.05, statement_timeout_ms=0
+    )
+    waits = metrics.get_histogram("db.pool_wait").count
+    try:
+        with small.connect():
+            stats = small.pool.stats()
+            assert stats["checked_out"] == 1
+            assert stats["saturation"] == pytest.approx(1.0)
+
+            # The only connection is taken: the checkout gives up
+            with pytest.raises(exc.TimeoutError):
+                small.connect()
+
+        stats = small.pool.stats()
+        assert stats["checked_out"] == 0
+        assert stats["peak_checked_out"] == 1
+        assert stats["timeouts"] == 1
+        assert metrics.get_histogram("db.pool_wait").count == waits + 2
+    finally:
+        small.dispose()
+
+
+def test_statement_timeout():
+    small = make_engine(pool_size=1, statement_timeout_ms=50)
+    try:
+        with (
+            small.connect() as connection,
+            pytest.raises(exc.OperationalError, match="statement timeout"),
+        ):
+            connection.execute(text("SELECT pg_sleep(1)"))
+    finally:
+        small.dispose()
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from src.core.audit import PredictionAuditLog, input_hash
+from src.db import models
+from src.db.models import enums
+from src.schemas.prediction import PredictionInput
+
+
+def _record(i: int) -> dict:
+    return {
+        "input": PredictionInput(breed_name=f"breed {i}"),
+        "diagnosis_prediction": enums.DiagnosisResult.negativo,
+        "confidence": 0.9,
+        "probability": 0.1,
+        "model_version": "v2",
+        "user_id": None,
+        "latency_ms": 1.0,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def _submit_all(audit_log: PredictionAuditLog, records: list[dict]) -> None:
+    async def submit():
+        for record in records:
+            await audit_log.submit(record)
+
+    asyncio.run(submit())
+
+
+def test_audit_log_writes_in_batches(db_session):
+    audit_log = PredictionAuditLog(batch_size=10, flush_ms=50)
+    records = [_record(i) for i in range(25)]
+
+    _submit_all(audit_log, records)
+    audit_log.close()
+
+    assert audit_log.stats() == {
+        "queued": 0,
+        "written": 25,
+        "batches": 3,
+        "dropped": 0,
+        "failed": 0,
+    }
+    hashes = db_session.scalars(select(models.Prediction.input_hash)).all()
+    assert sorted(hashes) == sorted(input_hash(r["input"]) for r in records)
+
+
+class _StalledEngine:
+    """Engine whose transactions wait until released."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.released = threading.Event()
+
+    @contextmanager
+    def begin(self):
+        self.released.wait()
+        with self.engine.begin() as connection:
+            yield connection
+
+
+def test_audit_log_drops_records_when_the_queue_stays_full(db_session):
+    stalled = _StalledEngine(db_session.get_bind())
+    audit_log = PredictionAuditLog(
+        bind=stalled, batch_size=1, queue_size=2, block_ms=10
+    )
+
+    # One record held by the stalled writer, two queued, the rest wait
+    # block_ms for room and are dropped
+    _submit_all(audit_log, [_record(i) for i in range(5)])
+    assert audit_log.stats()["dropped"] == 2
+
+    stalled.released.set()
+    audit_log.close()
+    assert audit_log.stats()["written"] == 3
+    assert db_session.scalar(select(func.count(models.Prediction.id))) == 3
+
+
+def test_audit_log_submit_many_shares_the_wait(db_session):
+    stalled = _StalledEngine(db_session.get_bind())
+    audit_log = PredictionAuditLog(
+        bind=stalled, batch_size=1, queue_size=2, block_ms=10
+    )
+
+    audit_log.submit_many([_record(i) for i in range(10)])
+    # At most one record was taken by the writer, two queued
+    assert audit_log.stats()["dropped"] >= 7
+
+    stalled.released.set()
+    audit_log.close()
+    written = audit_log.stats()["written"]
+    assert written + audit_log.stats()["dropped"] == 10
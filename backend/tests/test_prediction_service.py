@@ -0,0 +1,797 @@
+import asyncio
+import json
+import shutil
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from imblearn.ensemble import EasyEnsembleClassifier
+from sklearn.ensemble import AdaBoostClassifier, RandomForestClassifier
+
+from src.ml.batcher import MicroBatcher
+from src.ml.cache import PredictionCache
+from src.ml.encoder import OneHotEncoder, scale_encoded
+from src.ml.explainer import LinearExplainer
+from src.ml.npz_model import NpzLogisticRegression, export_npz, load_npz
+from src.ml.prediction_service import PredictionService, prediction_service
+from src.ml.registry import (
+    MANIFEST_FILE,
+    MODEL_PATH,
+    ArtifactError,
+    ModelRegistry,
+    file_sha256,
+)
+from src.ml.tree_scorer import ARRAY_NAMES, TreeEnsembleScorer
+from src.schemas.prediction import PredictionInput
+
+SAMPLE_INPUTS = [
+    PredictionInput(),
+    PredictionInput(
+        general_state="Bom",
+        ectoparasites="Leve",
+        nutritional_state="Leve a Moderado",
+        coat="Leves/Moderadas",
+        nails="Normal",
+        mucosa_color="Normal (Rosa-claro)",
+        muzzle_ear_lesion="Presente",
+        lymph_nodes="Leves/Moderadas",
+        blepharitis="Ausente",
+        conjunctivitis="Ausente",
+        alopecia="Presente",
+        bleeding="Ausente",
+        skin_lesion="Ausente",
+        muzzle_lip_depigmentation="Ausente",
+        animal_sex="M",
+        breed_name="SRD",
+    ),
+    PredictionInput(
+        general_state="ruim",
+        coat="graves",
+        lymph_nodes="leves_moderadas",
+        conjunctivitis="Ceratoconjuntivite Grave",
+        skin_lesion="Grave/Generalizada",
+        animal_sex="F",
+        breed_name="Labrador",
+    ),
+    PredictionInput(breed_name="Vira-lata", animal_sex="M"),
+]
+
+
+def _encode_with_pandas(inputs):
+    """The original get_dummies + reindex encoding, used as reference."""
+    input_df = pd.DataFrame([item.model_dump() for item in inputs])
+    input_encoded = pd.get_dummies(input_df, drop_first=False)
+    return input_encoded.reindex(
+        columns=prediction_service.training_columns, fill_value=0
+    ).to_numpy(dtype=np.float64)
+
+
+def test_encoder_matches_get_dummies():
+    encoder = OneHotEncoder(prediction_service.training_columns)
+
+    for item in SAMPLE_INPUTS:
+        np.testing.assert_array_equal(
+            encoder.encode([item]), _encode_with_pandas([item])
+        )
+    np.testing.assert_array_equal(
+        encoder.encode(SAMPLE_INPUTS), _encode_with_pandas(SAMPLE_INPUTS)
+    )
+
+
+def test_encoder_counts_unknown_categories():
+    encoder = OneHotEncoder(prediction_service.training_columns)
+
+    encoder.count_unknown([
+        PredictionInput(breed_name="Vira-lata", animal_sex="M")
+    ])
+
+    assert encoder.unknown_counts() == {"breed_name": 1}
+
+
+def test_encoder_counts_unknown_categories_from_many_threads():
+    encoder = OneHotEncoder(prediction_service.training_columns)
+    inputs = [PredictionInput(breed_name="Vira-lata")] * 100
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(20):
+            executor.submit(encoder.count_unknown, inputs)
+
+    assert encoder.unknown_counts() == {"breed_name": 2000}
+
+
+def test_fused_scorer_matches_sklearn():
+    assert prediction_service.scorer is not None
+
+    encoded = prediction_service.encoder.encode(SAMPLE_INPUTS)
+    # Random one-hot rows also exercise columns the samples never hit
+    rng = np.random.default_rng(42)
+    random_rows = rng.integers(0, 2, size=(200, encoded.shape[1]))
+    encoded = np.vstack([encoded, random_rows.astype(np.float64)])
+
+    np.testing.assert_allclose(
+        prediction_service.scorer.predict_proba(encoded),
+        prediction_service.predict_proba_sklearn(encoded),
+        rtol=1e-12,
+        atol=1e-15,
+    )
+
+
+def test_fused_single_prediction_matches_sklearn():
+    for item in SAMPLE_INPUTS:
+        negative, positive = prediction_service.predict_proba_sklearn(
+            prediction_service.encoder.encode([item])
+        )[0]
+        expected = prediction_service._decide(negative, positive)
+
+        result = prediction_service.predict(item)
+
+        assert result["prediction"] == expected["prediction"]
+        assert result["confidence"] == pytest.approx(
+            expected["confidence"], rel=1e-12
+        )
+
+
+def test_explanation_adds_up_to_the_logit():
+    explainer = prediction_service.registry.active.explainer
+    assert isinstance(explainer, LinearExplainer)
+
+    encoded = prediction_service.encoder.encode(SAMPLE_INPUTS)
+    logits = prediction_service.model.decision_function(
+        scale_encoded(prediction_service.scaler, encoded)
+    )
+    for item, logit in zip(SAMPLE_INPUTS, logits):
+        explanation = explainer.explain(item)
+        assert len(explanation) == len(prediction_service.encoder.fields)
+        total = explainer.intercept + sum(
+            entry["contribution"] for entry in explanation
+        )
+        assert total == pytest.approx(logit, abs=1e-9)
+
+
+def test_predict_with_explanation_keeps_cache_small():
+    service = PredictionService()
+    item = SAMPLE_INPUTS[1]
+
+    explained = service.predict(item, explain=True)
+    plain = service.predict(item)
+
+    assert len(explained["explanation"]) == 5
+    assert "explanation" not in plain
+    assert service.cache.hits == 1
+    assert service.predict(item, explain=True) == explained
+
+
+def test_what_if_matches_scoring_each_counterfactual():
+    item = SAMPLE_INPUTS[2]
+
+    sweep = prediction_service.what_if(item, ["lymph_nodes", "mucosa_color"])
+
+    assert [entry["field"] for entry in sweep["fields"]] == [
+        "lymph_nodes",
+        "mucosa_color",
+    ]
+    assert sweep["probability"] == pytest.approx(
+        prediction_service.predict_proba_sklearn(
+            prediction_service.encoder.encode([item])
+        )[0][1],
+        rel=1e-12,
+    )
+    for entry in sweep["fields"]:
+        values = [alt["value"] for alt in entry["alternatives"]]
+        assert values[-1] is None
+        assert set(values[:-1]) == set(
+            prediction_service.encoder.vocabulary[entry["field"]]
+        )
+        counterfactuals = [
+            item.model_copy(update={entry["field"]: value}) for value in values
+        ]
+        expected = prediction_service.predict_proba_sklearn(
+            prediction_service.encoder.encode(counterfactuals)
+        )[:, 1]
+        np.testing.assert_allclose(
+            [alt["probability"] for alt in entry["alternatives"]],
+            expected,
+            rtol=1e-12,
+        )
+        assert [alt["current"] for alt in entry["alternatives"]] == [
+            value == getattr(item, entry["field"]) for value in values
+        ]
+
+
+def test_what_if_rejects_unknown_fields():
+    with pytest.raises(ValueError, match="weight"):
+        prediction_service.what_if(PredictionInput(), ["weight"])
+
+
+def test_next_questions_ranks_unanswered_fields():
+    loaded = prediction_service.registry.active
+    item = PredictionInput(general_state="general_state_bom", lymph_nodes=None)
+
+    ranking = prediction_service.next_questions(item)
+
+    questions = ranking["questions"]
+    assert "general_state" not in [q["field"] for q in questions]
+    assert {q["field"] for q in questions} == {
+        field
+        for field in prediction_service.encoder.fields
+        if getattr(item, field) is None
+    }
+    changes = [q["expected_change"] for q in questions]
+    assert changes == sorted(changes, reverse=True)
+
+    # Expected change of one field, from its category frequencies
+    field = questions[0]["field"]
+    values = list(prediction_service.encoder.vocabulary[field])
+    probabilities = prediction_service.predict_proba_sklearn(
+        prediction_service.encoder.encode([
+            item.model_copy(update={field: value}) for value in values
+        ])
+    )[:, 1]
+    deltas = np.abs(probabilities - ranking["probability"])
+    frequencies = loaded.category_frequencies[field]
+    assert questions[0]["expected_change"] == pytest.approx(
+        sum(frequencies[value] * d for value, d in zip(values, deltas))
+    )
+    assert questions[0]["max_change"] == pytest.approx(deltas.max())
+    assert frequencies == pytest.approx({
+        value: loaded.scaler.mean_[index]
+        for value, index in prediction_service.encoder.vocabulary[
+            field
+        ].items()
+    })
+
+    assert len(prediction_service.next_questions(item, 3)["questions"]) == 3
+
+
+def test_live_session_updates_the_logit_incrementally():
+    session = prediction_service.start_live_session()
+    item = SAMPLE_INPUTS[1]
+    result = None
+    # Fill the form one field at a time, then change and clear some
+    for field, value in item.model_dump().items():
+        session, result = prediction_service.update_live_session(
+            session, {field: value}
+        )
+    session, result = prediction_service.update_live_session(
+        session, {"general_state": "Ruim", "coat": None}
+    )
+
+    final = item.model_copy(update={"general_state": "Ruim", "coat": None})
+    expected = prediction_service.scorer.score_indices(
+        prediction_service.encoder.active_indices(final)
+    )
+    assert session.active_indices() == (
+        prediction_service.encoder.active_indices(final)
+    )
+    assert result["probability"] == pytest.approx(expected, rel=1e-12)
+    assert result["model_version"] == prediction_service.model_version
+
+    # Invalid changes are rejected as a whole
+    with pytest.raises(ValueError, match="weight"):
+        session.update({"coat": "Leves/Moderadas", "weight": "10"})
+    with pytest.raises(TypeError, match="nails"):
+        session.update({"coat": "Leves/Moderadas", "nails": 1})
+    assert session.values["coat"] is None
+
+
+def test_prediction_cache_lru_counters():
+    cache = PredictionCache(maxsize=2)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" becomes the least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats() == {
+        "size": 2,
+        "maxsize": 2,
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+def test_predict_uses_cache():
+    service = PredictionService()
+    item = SAMPLE_INPUTS[1]
+
+    first = service.predict(item)
+    second = service.predict(item.model_copy())
+
+    assert first == second
+    assert service.cache.hits == 1
+    assert service.cache.misses == 1
+
+
+def test_predict_many_uses_cache():
+    service = PredictionService()
+    first = service.predict_many(SAMPLE_INPUTS[:2])
+
+    second = service.predict_many([SAMPLE_INPUTS[1], SAMPLE_INPUTS[2]])
+
+    assert second[0] == first[1]
+    assert second[1] == service.predict(SAMPLE_INPUTS[2])
+    assert service.cache.hits == 2
+    assert service.cache.misses == 3
+
+
+def test_micro_batcher_goes_through_the_cache():
+    service = PredictionService()
+    batcher = MicroBatcher(
+        service.predict_many, max_batch_size=8, max_wait_ms=1
+    )
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.submit(item) for item in SAMPLE_INPUTS[:3])
+        )
+
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+
+    assert first == second
+    assert service.cache.stats()["size"] == 3
+    assert service.cache.hits == 3
+
+
+def test_cache_hits_still_count_unknown_categories():
+    service = PredictionService()
+    item = PredictionInput(breed_name="Vira-lata")
+
+    service.predict(item)
+    service.predict(item)
+
+    assert service.cache.hits == 1
+    assert service.encoder.unknown_counts()["breed_name"] == 2
+
+
+def _copy_models(tmp_path):
+    shutil.copytree(MODEL_PATH, tmp_path, dirs_exist_ok=True)
+    with open(tmp_path / MANIFEST_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _add_version(tmp_path, manifest, version, intercept_shift):
+    """Writes a copy of the v2 model with a shifted intercept."""
+    model = joblib.load(tmp_path / "leish_model_v2.joblib")
+    model.intercept_ = model.intercept_ + intercept_shift
+    model_file = f"leish_model_{version}.joblib"
+    joblib.dump(model, tmp_path / model_file)
+
+    entry = json.loads(json.dumps(manifest["versions"]["v2"]))
+    entry["files"]["model"] = model_file
+    entry["sha256"]["model"] = file_sha256(tmp_path / model_file)
+    manifest["versions"][version] = entry
+
+
+def _write_manifest(tmp_path, manifest):
+    with open(tmp_path / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def test_manifest_swap_invalidates_cache(tmp_path):
+    manifest = _copy_models(tmp_path)
+    service = PredictionService(model_path=tmp_path)
+    item = SAMPLE_INPUTS[1]
+    before = service.predict(item)
+    assert before["model_version"] == "v2"
+
+    _add_version(tmp_path, manifest, "v3", intercept_shift=5.0)
+    manifest["active"] = "v3"
+    _write_manifest(tmp_path, manifest)
+
+    assert service.reload_if_changed(force=True, wait=True)
+    assert service.model_version == "v3"
+    assert service.cache.stats()["size"] == 0
+    after = service.predict(item)
+    assert after["model_version"] == "v3"
+    assert after["confidence"] != before["confidence"]
+
+
+def test_reload_runs_off_the_request_path(tmp_path, monkeypatch):
+    manifest = _copy_models(tmp_path)
+    service = PredictionService(model_path=tmp_path)
+    service.load()
+
+    release, swapped = threading.Event(), threading.Event()
+    reloads = []
+    registry_reload = service.registry.reload
+
+    def slow_reload():
+        reloads.append(threading.current_thread().name)
+        release.wait(timeout=10)
+        loaded = registry_reload()
+        swapped.set()
+        return loaded
+
+    monkeypatch.setattr(service.registry, "reload", slow_reload)
+    _add_version(tmp_path, manifest, "v3", intercept_shift=5.0)
+    manifest["active"] = "v3"
+    _write_manifest(tmp_path, manifest)
+
+    # The request that notices the change is not blocked by the load,
+    # and a second check does not start another one
+    assert not service.reload_if_changed(force=True)
+    assert not service.reload_if_changed(force=True)
+    assert service.predict(SAMPLE_INPUTS[1])["model_version"] == "v2"
+
+    release.set()
+    assert swapped.wait(timeout=10)
+    assert service.model_version == "v3"
+    assert len(reloads) == 1
+    assert reloads[0].startswith("model-reload")
+
+
+def test_live_session_carries_unknown_counts_over_a_switch(tmp_path):
+    manifest = _copy_models(tmp_path)
+    _add_version(tmp_path, manifest, "v3", intercept_shift=-5.0)
+    _write_manifest(tmp_path, manifest)
+    service = PredictionService(model_path=tmp_path)
+    service.load()
+    session = service.start_live_session()
+    session, _ = service.update_live_session(
+        session, {"breed_name": "Vira-lata"}
+    )
+
+    service.activate("v3")
+    session, result = service.update_live_session(session, {"coat": None})
+
+    assert result["model_version"] == "v3"
+    assert session.values["breed_name"] == "Vira-lata"
+    # The value was counted when it was sent, not again on the replay
+    assert service.encoder.unknown_counts() == {}
+
+
+def test_checksum_mismatch_keeps_serving_current_version(tmp_path):
+    _copy_models(tmp_path)
+    service = PredictionService(model_path=tmp_path)
+    service.load()
+
+    # Files replaced without updating the manifest checksums
+    model = joblib.load(tmp_path / "leish_model_v2.joblib")
+    model.intercept_ = model.intercept_ + 5.0
+    joblib.dump(model, tmp_path / "leish_model_v2.joblib")
+
+    assert not service.reload_if_changed(force=True, wait=True)
+    assert service.model_version == "v2"
+    with pytest.raises(ArtifactError):
+        service.reload()
+
+
+def test_activate_other_version(tmp_path):
+    manifest = _copy_models(tmp_path)
+    _add_version(tmp_path, manifest, "v3", intercept_shift=-5.0)
+    _write_manifest(tmp_path, manifest)
+    service = PredictionService(model_path=tmp_path)
+    service.load()
+
+    active = service.registry.active
+    assert service.activate("v3")
+
+    assert service.model_version == "v3"
+    # Objects already handed out are untouched by the switch
+    assert active.version == "v2"
+    active_versions = [
+        v["version"] for v in service.registry.versions() if v["active"]
+    ]
+    assert active_versions == ["v3"]
+
+
+def test_activate_persists_outside_the_manifest(tmp_path):
+    manifest = _copy_models(tmp_path)
+    _add_version(tmp_path, manifest, "v3", intercept_shift=-5.0)
+    _write_manifest(tmp_path, manifest)
+    shipped = (tmp_path / "manifest.json").read_bytes()
+    service = PredictionService(model_path=tmp_path)
+    other_worker = PredictionService(model_path=tmp_path)
+    service.load()
+    other_worker.load()
+
+    service.activate("v3")
+
+    # The shipped manifest is left alone; the choice goes to active.json
+    assert (tmp_path / "manifest.json").read_bytes() == shipped
+    assert service.registry.read_active() == "v3"
+    assert service.registry.read_manifest()["active"] == "v3"
+    assert (
+        service.registry.read_manifest(resolve_active=False)["active"] == "v2"
+    )
+    assert list(tmp_path.glob("*.tmp")) == []
+    # Reloading keeps the switch instead of reverting to the old file
+    assert not service.reload_if_changed(force=True, wait=True)
+    service.reload()
+    assert service.model_version == "v3"
+    # Other workers follow on their next artifact check
+    assert other_worker.reload_if_changed(force=True, wait=True)
+    assert other_worker.model_version == "v3"
+
+
+def test_active_version_no_longer_listed_is_ignored(tmp_path):
+    manifest = _copy_models(tmp_path)
+    (tmp_path / "active.json").write_text('{"active": "v9"}')
+
+    service = PredictionService(model_path=tmp_path)
+    service.load()
+
+    assert service.model_version == manifest["active"]
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    calls = []
+
+    def score_many(items):
+        calls.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(score_many, max_batch_size=100, max_wait_ms=20)
+
+    async def submit_all():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    results = asyncio.run(submit_all())
+
+    assert results == [i * 10 for i in range(10)]
+    assert calls == [list(range(10))]
+
+
+def test_micro_batcher_flushes_on_max_size():
+    calls = []
+
+    def score_many(items):
+        calls.append(len(items))
+        return list(items)
+
+    batcher = MicroBatcher(score_many, max_batch_size=4, max_wait_ms=1000)
+
+    async def submit_all():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(8)))
+
+    assert asyncio.run(submit_all()) == list(range(8))
+    assert calls == [4, 4]
+
+
+@pytest.mark.parametrize(
+    ("error", "logged"),
+    [
+        (ValueError, "Batch of 3 items failed: boom"),
+        (RuntimeError, "Unexpected error in a batch of 3"),
+    ],
+)
+def test_micro_batcher_fails_every_caller(error, logged, caplog):
+    def score_many(items):
+        raise error("boom")
+
+    batcher = MicroBatcher(score_many, max_batch_size=3, max_wait_ms=1000)
+
+    async def submit_all():
+        return await asyncio.gather(
+            *(batcher.submit(i) for i in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(submit_all())
+
+    assert [type(result) for result in results] == [error] * 3
+    assert logged in caplog.text
+
+
+def test_memory_mapped_artifacts_match():
+    registry = ModelRegistry(MODEL_PATH, mmap_mode="r")
+    loaded = registry.reload()
+
+    assert isinstance(loaded.model.coef_, np.memmap)
+    encoded = loaded.encoder.encode(SAMPLE_INPUTS)
+    np.testing.assert_array_equal(
+        loaded.scorer.predict_proba(encoded),
+        prediction_service.scorer.predict_proba(encoded),
+    )
+
+
+def _parity_rows(n_features):
+    rng = np.random.default_rng(7)
+    return np.vstack([
+        np.eye(n_features),
+        rng.integers(0, 2, size=(500, n_features)).astype(np.float64),
+    ])
+
+
+def test_npz_artifact_is_bit_identical_to_sklearn():
+    registry = ModelRegistry(MODEL_PATH)
+    loaded = registry.get("v2-npz")
+
+    assert isinstance(loaded.model, NpzLogisticRegression)
+    assert loaded.training_columns == prediction_service.training_columns
+    encoded = _parity_rows(len(loaded.training_columns))
+    np.testing.assert_array_equal(
+        loaded.model.predict_proba(scale_encoded(loaded.scaler, encoded)),
+        prediction_service.predict_proba_sklearn(encoded),
+    )
+    # The fused scorer is built from the .npz arrays as well
+    np.testing.assert_array_equal(
+        loaded.scorer.predict_proba(encoded),
+        prediction_service.scorer.predict_proba(encoded),
+    )
+
+
+def test_npz_export_round_trip(tmp_path):
+    path = tmp_path / "model.npz"
+    export_npz(
+        path,
+        prediction_service.model,
+        prediction_service.scaler,
+        prediction_service.training_columns,
+        model_version="v2",
+    )
+
+    model, scaler, columns = load_npz(path)
+
+    # Written through a temporary file and a rename
+    assert [p.name for p in tmp_path.iterdir()] == ["model.npz"]
+    assert columns == prediction_service.training_columns
+    encoded = _parity_rows(len(columns))
+    np.testing.assert_array_equal(
+        model.predict_proba(scaler.transform(encoded)),
+        prediction_service.predict_proba_sklearn(encoded),
+    )
+
+
+def test_npz_rejects_unknown_format_version(tmp_path):
+    manifest = _copy_models(tmp_path)
+    with np.load(tmp_path / "leish_model_v2.npz") as data:
+        arrays = dict(data)
+    arrays["format_version"] = np.array(99)
+    np.savez(tmp_path / "leish_model_v2.npz", **arrays)
+    manifest["versions"]["v2-npz"]["sha256"] = {}
+    _write_manifest(tmp_path, manifest)
+
+    with pytest.raises(ArtifactError, match="format version 99"):
+        ModelRegistry(tmp_path).get("v2-npz")
+
+
+def test_npz_artifact_loads_without_sklearn():
+    code = (
+        "import sys\n"
+        "from src.ml.registry import MODEL_PATH, ModelRegistry\n"
+        "from src.schemas.prediction import PredictionInput\n"
+        "loaded = ModelRegistry(MODEL_PATH).get('v2-npz')\n"
+        "loaded.scorer.predict_proba(loaded.encoder.encode([PredictionInput()]))\n"
+        "heavy = {'sklearn', 'scipy', 'pandas'}\n"
+        "print(sorted(heavy & {m.split('.')[0] for m in sys.modules}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert output.strip() == "[]"
+
+
+def _tree_training_set():
+    """One-hot rows over the v2 columns, labelled by the v2 model."""
+    encoded = _parity_rows(len(prediction_service.training_columns))
+    labels = prediction_service.predict_proba_sklearn(encoded).argmax(axis=1)
+    return encoded, labels
+
+
+@pytest.mark.parametrize(
+    "model_factory",
+    [
+        lambda: RandomForestClassifier(n_estimators=10, random_state=0),
+        lambda: AdaBoostClassifier(n_estimators=10, random_state=0),
+        lambda: EasyEnsembleClassifier(n_estimators=5, random_state=0),
+    ],
+    ids=["random_forest", "adaboost", "easy_ensemble"],
+)
+def test_tree_scorer_is_bit_identical_to_sklearn(model_factory):
+    encoded, labels = _tree_training_set()
+    scaler = prediction_service.scaler
+    model = model_factory().fit(scale_encoded(scaler, encoded), labels)
+
+    scorer = TreeEnsembleScorer.from_sklearn(model, scaler)
+    expected = model.predict_proba(scale_encoded(scaler, encoded))
+    np.testing.assert_array_equal(scorer.predict_proba(encoded), expected)
+    # Members scored by several threads give the same result
+    threaded = TreeEnsembleScorer.from_sklearn(model, scaler, workers=2)
+    np.testing.assert_array_equal(threaded.predict_proba(encoded), expected)
+    assert scorer.score_indices(np.flatnonzero(encoded[3])) == expected[3, 1]
+
+
+def test_tree_scorers_share_their_threads():
+    encoded, labels = _tree_training_set()
+    model = EasyEnsembleClassifier(n_estimators=4, random_state=0)
+    model.fit(encoded, labels)
+
+    # As on every reload() or activate() of a tree ensemble version;
+    # the registry keeps the scorers of the listed versions around
+    scorers = [
+        TreeEnsembleScorer.from_sklearn(model, workers=2) for _ in range(5)
+    ]
+    for scorer in scorers:
+        scorer.predict_proba(encoded)
+
+    threads = [
+        thread
+        for thread in threading.enumerate()
+        if thread.name.startswith("tree-scorer")
+    ]
+    assert len(threads) <= 2
+
+
+def test_tree_scorer_rejects_other_models():
+    assert not TreeEnsembleScorer.supports(prediction_service.model)
+
+
+def _add_tree_version(tmp_path, manifest):
+    """Writes an EasyEnsemble version "ee" without a scaler."""
+    encoded, labels = _tree_training_set()
+    model = EasyEnsembleClassifier(n_estimators=5, random_state=0)
+    model.fit(encoded, labels)
+    joblib.dump(model, tmp_path / "leish_model_ee.joblib")
+    manifest["versions"]["ee"] = {
+        "files": {
+            "model": "leish_model_ee.joblib",
+            "training_columns": "training_columns_v2.joblib",
+        }
+    }
+    return model
+
+
+def test_tree_ensemble_version_without_scaler(tmp_path):
+    manifest = _copy_models(tmp_path)
+    model = _add_tree_version(tmp_path, manifest)
+    manifest["active"] = "ee"
+    _write_manifest(tmp_path, manifest)
+
+    service = PredictionService(model_path=tmp_path)
+
+    assert isinstance(service.scorer, TreeEnsembleScorer)
+    expected = model.predict_proba(service.encoder.encode(SAMPLE_INPUTS))
+    results = service.predict_many(SAMPLE_INPUTS)
+    single = [service.predict(item) for item in SAMPLE_INPUTS]
+    for result, one, (neg, pos) in zip(results, single, expected):
+        assert result == one
+        assert result["confidence"] == max(neg, pos)
+
+
+def test_tree_arrays_are_memory_mapped(tmp_path, monkeypatch):
+    manifest = _copy_models(tmp_path)
+    model = _add_tree_version(tmp_path, manifest)
+    _write_manifest(tmp_path, manifest)
+
+    first = ModelRegistry(tmp_path, mmap_mode="r").get("ee")
+
+    for name in ARRAY_NAMES:
+        array = getattr(first.scorer, name)
+        assert isinstance(array, np.memmap), name
+        assert not array.flags.writeable, name
+    # The sklearn ensemble is only needed to compile the arrays
+    assert first.model is None
+    (saved,) = tmp_path.glob("*.trees.joblib")
+
+    # Other workers map the saved arrays without unpickling the model
+    loaded_files = []
+    joblib_load = joblib.load
+
+    def recording_load(path, *args, **kwargs):
+        loaded_files.append(Path(path).name)
+        return joblib_load(path, *args, **kwargs)
+
+    monkeypatch.setattr(joblib, "load", recording_load)
+    other = ModelRegistry(tmp_path, mmap_mode="r").get("ee")
+
+    assert "leish_model_ee.joblib" not in loaded_files
+    assert other.model is None
+    assert Path(other.scorer.feature.filename) == saved
+    encoded = _tree_training_set()[0]
+    np.testing.assert_array_equal(
+        other.scorer.predict_proba(encoded), model.predict_proba(encoded)
+    )
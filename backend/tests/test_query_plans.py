@@ -0,0 +1,163 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from src.db import models
+from src.db.crud import (
+    crud_animal,
+    crud_assessment,
+    crud_breed,
+    crud_owner,
+    crud_user,
+)
+
+
+def _cursor(keyset, **values) -> str:
+    return keyset.cursor_for(SimpleNamespace(**values))
+
+
+NOW = datetime.now(timezone.utc)
+
+# (hot query, index it must use)
+HOT_QUERIES = {
+    "assessments_page": (
+        lambda db: crud_assessment.get_assessments(
+            db, limit=20, options=crud_assessment.PUBLIC_LOADERS
+        ),
+        "ix_assessments_created_at_id",
+    ),
+    "assessments_cursor_page": (
+        lambda db: crud_assessment.get_assessments(
+            db,
+            limit=20,
+            options=crud_assessment.PUBLIC_LOADERS,
+            cursor=_cursor(
+                crud_assessment.PAGE_ORDER, created_at=NOW, id=uuid.uuid4()
+            ),
+        ),
+        "ix_assessments_created_at_id",
+    ),
+    "animals_cursor_page": (
+        lambda db: crud_animal.get_animals(
+            db,
+            limit=20,
+            options=crud_animal.PUBLIC_LOADERS,
+            cursor=_cursor(
+                crud_animal.PAGE_ORDER, name="Rex", id=uuid.uuid4()
+            ),
+        ),
+        "ix_animals_name_id",
+    ),
+    "owners_cursor_page": (
+        lambda db: crud_owner.get_owners(
+            db,
+            limit=20,
+            cursor=_cursor(crud_owner.PAGE_ORDER, name="Ana", id=uuid.uuid4()),
+        ),
+        "ix_owners_name_id",
+    ),
+    "breeds_page": (
+        lambda db: crud_breed.get_breeds(db, limit=20),
+        "ix_breeds_name",
+    ),
+    "users_cursor_page": (
+        lambda db: crud_user.get_users(
+            db,
+            limit=20,
+            options=crud_user.PUBLIC_LOADERS,
+            cursor=_cursor(crud_user.PAGE_ORDER, email="a@example.com"),
+        ),
+        "ix_users_email",
+    ),
+    "owner_by_name": (
+        lambda db: crud_owner.get_owner_by_name(db, name="Ana Sousa"),
+        "ix_owners_lower_name",
+    ),
+    "breed_by_name": (
+        lambda db: crud_breed.get_breed_by_name(db, name="srd"),
+        "ix_breeds_lower_name",
+    ),
+    # Same filters as the Animal.assessments, User.assessments,
+    # Owner.animals and Breed.animals relationship loads
+    "assessments_of_animal": (
+        lambda db: (
+            db.query(models.Assessment)
+            .filter(models.Assessment.animal_id == uuid.uuid4())
+            .all()
+        ),
+        "ix_assessments_animal_id",
+    ),
+    "assessments_of_user": (
+        lambda db: (
+            db.query(models.Assessment)
+            .filter(models.Assessment.user_id == uuid.uuid4())
+            .all()
+        ),
+        "ix_assessments_user_id",
+    ),
+    "animals_of_owner": (
+        lambda db: (
+            db.query(models.Animal)
+            .filter(models.Animal.owner_id == uuid.uuid4())
+            .all()
+        ),
+        "ix_animals_owner_id",
+    ),
+    "animals_of_breed": (
+        lambda db: (
+            db.query(models.Animal)
+            .filter(models.Animal.breed_id == uuid.uuid4())
+            .all()
+        ),
+        "ix_animals_breed_id",
+    ),
+}
+
+
+def explain(db_session, run) -> list[str]:
+    """
+    Runs ``run(db_session)`` and returns the EXPLAIN output of each
+    SELECT it sent, planned with sequential scans disabled: on the small
+    test tables a sequential scan is always cheapest, so this shows
+    whether an index can serve the query at all.
+    """
+    engine = db_session.get_bind()
+    statements = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run(db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    plans = []
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SET enable_seqscan = off")
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql(
+                f"EXPLAIN {statement}", parameters
+            ).scalars()
+            plans.append("\n".join(rows))
+    return plans
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_index(db_session, name):
+    run, index = HOT_QUERIES[name]
+
+    plans = explain(db_session, run)
+
+    assert plans
+    assert any(index in plan for plan in plans), plans
+    for plan in plans:
+        assert "Seq Scan" not in plan, plan
+        # The index also returns the rows in ORDER BY order
+        assert "Sort" not in plan, plan
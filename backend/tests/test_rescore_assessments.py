@@ -0,0 +1,118 @@
+import json
+
+from src.db import models
+from src.db.crud import crud_user
+from src.db.models import enums
+from src.ml.features import prediction_input_from_assessment
+from src.ml.prediction_service import prediction_service
+from src.schemas.user import UserCreate
+from tests.conftest import TestingSessionLocal
+
+from scripts.rescore_assessments import rescore
+
+
+def _create_assessments(db, n):
+    user = crud_user.create_user(
+        db,
+        user=UserCreate(
+            email="rescore@example.com", password="pw", full_name="Rescore"
+        ),
+    )
+    owner = models.Owner(name="Owner")
+    breed = models.Breed(name="Labrador")
+    animal = models.Animal(name="Rex", sex="M", owner=owner, breed=breed)
+    states = list(enums.GeneralState)
+    assessments = [
+        models.Assessment(
+            animal=animal,
+            user_id=user.id,
+            general_state=states[i % len(states)],
+            coat=enums.LesionSeverity.graves if i % 2 else None,
+        )
+        for i in range(n)
+    ]
+    db.add_all(assessments)
+    db.commit()
+    return sorted(assessment.id for assessment in assessments)
+
+
+def _stored(db):
+    db.expire_all()
+    return {
+        assessment.id: assessment
+        for assessment in db.query(models.Assessment).all()
+    }
+
+
+def test_rescore_scores_every_stale_assessment(db_session, tmp_path):
+    ids = _create_assessments(db_session, 7)
+    stored = _stored(db_session)
+    stored[ids[0]].model_version = prediction_service.model_version
+    stored[ids[1]].model_version = "v1"
+    db_session.commit()
+
+    updated = rescore(
+        chunk_size=2,
+        checkpoint_path=tmp_path / "checkpoint.json",
+        session_factory=TestingSessionLocal,
+    )
+
+    # The one already scored with the active version is skipped
+    assert updated == 6
+    for assessment in _stored(db_session).values():
+        expected = prediction_service.predict(
+            prediction_input_from_assessment(assessment)
+        )
+        assert assessment.model_version == prediction_service.model_version
+        if assessment.id != ids[0]:
+            assert (
+                assessment.predicted_diagnosis.value
+                == (expected["prediction"])
+            )
+            assert assessment.prediction_confidence == expected["confidence"]
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+def test_rescore_resumes_from_checkpoint(db_session, tmp_path):
+    ids = _create_assessments(db_session, 5)
+    checkpoint = tmp_path / "checkpoint.json"
+    # An earlier --all run committed the first two assessments
+    checkpoint.write_text(
+        json.dumps({
+            "run": {
+                "model_version": prediction_service.model_version,
+                "all": True,
+            },
+            "last_id": str(ids[1]),
+            "processed": 2,
+        })
+    )
+
+    updated = rescore(
+        chunk_size=2,
+        rescore_all=True,
+        checkpoint_path=checkpoint,
+        session_factory=TestingSessionLocal,
+    )
+
+    assert updated == 3
+    stored = _stored(db_session)
+    assert [stored[i].model_version for i in ids[:2]] == [None, None]
+    assert all(stored[i].model_version is not None for i in ids[2:])
+
+
+def test_rescore_with_process_pool(db_session, tmp_path):
+    _create_assessments(db_session, 6)
+
+    updated = rescore(
+        chunk_size=2,
+        workers=2,
+        checkpoint_path=tmp_path / "checkpoint.json",
+        session_factory=TestingSessionLocal,
+    )
+
+    assert updated == 6
+    assert all(
+        assessment.predicted_diagnosis is not None
+        for assessment in _stored(db_session).values()
+    )
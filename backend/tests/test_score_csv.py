@@ -0,0 +1,80 @@
+import csv
+
+import pytest
+
+from scripts.score_csv import score_csv
+from src.ml.prediction_service import prediction_service
+from src.schemas.prediction import PredictionInput
+
+HEADER = [
+    "id_db_original",
+    "nome",
+    "sexo",
+    "raca",
+    "estado_geral",
+    "pelagem",
+    "linfonodos",
+    "lesao_de_pele",
+    "color_mucosa",
+]
+ROWS = [
+    ["10", "Rex", "M", "Labrador", "Grave", "Grave", "Aumentados", "", ""],
+    ["11", "Mel", "F", "", "Bom", "", "", "Leve/Moderada", "Pálida"],
+    ["12", "Thor", "M", "SRD", "Péssimo", "", "", "", ""],
+]
+
+
+def _write_campaign(path, repeat=1):
+    with open(path, "w", newline="", encoding="latin-1") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(HEADER)
+        for _ in range(repeat):
+            writer.writerows(ROWS)
+
+
+def _read_output(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f, delimiter=";"))
+
+
+def test_score_csv_matches_imported_assessment(tmp_path):
+    campaign = tmp_path / "campaign.csv"
+    output = tmp_path / "predictions.csv"
+    _write_campaign(campaign)
+
+    assert score_csv(campaign, output, chunk_size=2) == 3
+
+    rows = _read_output(output)
+    assert [row["row"] for row in rows] == ["1", "2", "3"]
+    # Mapped like the seed ("Grave" -> Ruim, "Aumentados" -> Leves/Moderadas)
+    # and encoded like the stored enums
+    expected = prediction_service.predict(
+        PredictionInput(
+            general_state="ruim",
+            coat="graves",
+            lymph_nodes="leves_moderadas",
+            animal_sex="M",
+            breed_name="Labrador",
+        )
+    )
+    assert rows[0]["diagnosis_prediction"] == expected["prediction"]
+    assert float(rows[0]["confidence_score"]) == pytest.approx(
+        expected["confidence"]
+    )
+    assert rows[0]["model_version"] == expected["model_version"]
+    assert rows[1]["diagnosis_prediction"] in ("Positivo", "Negativo")
+    # Unknown general state: reported, not scored
+    assert rows[2]["diagnosis_prediction"] == ""
+    assert "general_state" in rows[2]["error"]
+
+
+def test_score_csv_with_process_pool_keeps_order(tmp_path):
+    campaign = tmp_path / "campaign.csv"
+    _write_campaign(campaign, repeat=4)
+
+    serial = tmp_path / "serial.csv"
+    parallel = tmp_path / "parallel.csv"
+    score_csv(campaign, serial, chunk_size=5)
+    score_csv(campaign, parallel, chunk_size=5, workers=2)
+
+    assert _read_output(parallel) == _read_output(serial)